@@ -0,0 +1,58 @@
+"""list endpoint indexes
+
+Revision ID: 015d62a7a8de
+Revises: c50e6f2196a6
+Create Date: 2026-10-18 10:02:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '015d62a7a8de'
+down_revision: Union[str, None] = 'c50e6f2196a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partial indexes over live rows, matching the keyset pages of fetch_page:
+# equality filter first, then (creation_date, pk) for ORDER BY ... DESC LIMIT n.
+INDEXES = [
+    ('ix_requests_live_creation', 'requests', ['creation_date', 'request_id']),
+    ('ix_requests_live_client', 'requests', ['client_id', 'creation_date', 'request_id']),
+    ('ix_requests_live_sub_category', 'requests', ['sub_category_id', 'creation_date', 'request_id']),
+    ('ix_services_live_creation', 'services', ['creation_date', 'service_id']),
+    ('ix_services_live_sub_category', 'services', ['sub_category_id', 'creation_date', 'service_id']),
+    ('ix_services_live_freelancer', 'services', ['freelancer_id', 'creation_date', 'service_id']),
+    ('ix_services_live_status', 'services', ['service_status_id', 'creation_date', 'service_id']),
+    ('ix_milestones_live_client', 'milestones', ['client_id', 'creation_date', 'milestone_id']),
+    ('ix_milestones_live_freelancer', 'milestones', ['freelancer_id', 'creation_date', 'milestone_id']),
+    ('ix_orders_live_client', 'orders', ['client_id', 'creation_date', 'order_id']),
+    ('ix_orders_live_service', 'orders', ['service_id', 'creation_date', 'order_id']),
+    ('ix_reviews_live_reviewee', 'reviews', ['reviewee_id', 'creation_date', 'review_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while the indexes are built
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text('deleted = false'),
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,59 @@
+"""equality filter indexes
+
+Revision ID: 23dd92a90ba0
+Revises: df3d5a775565
+Create Date: 2026-10-18 18:20:07.412853
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '23dd92a90ba0'
+down_revision: Union[str, None] = 'df3d5a775565'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The equality filters of FILTER_COLUMNS without an index yet: the filtered column first, then
+# (creation_date, pk) for the keyset page, as in list_endpoint_indexes.
+# (name, table, columns, live rows only)
+INDEXES = [
+    ('ix_users_role', 'users', ['role_id', 'creation_date', 'user_id'], False),
+    ('ix_users_wallet_type', 'users', ['wallet_type_id', 'creation_date', 'user_id'], False),
+    ('ix_requests_live_status', 'requests', ['request_status_id', 'creation_date', 'request_id'], True),
+    ('ix_milestones_live_status', 'milestones', ['milestone_status_id', 'creation_date', 'milestone_id'], True),
+    ('ix_orders_live_status', 'orders', ['order_status_id', 'creation_date', 'order_id'], True),
+    ('ix_proposals_live_request', 'proposals', ['request_id', 'creation_date', 'proposal_id'], True),
+    ('ix_proposals_live_freelancer', 'proposals', ['freelancer_id', 'creation_date', 'proposal_id'], True),
+    ('ix_proposals_live_status', 'proposals', ['proposal_status_id', 'creation_date', 'proposal_id'], True),
+    ('ix_transactions_live_milestone', 'transactions', ['milestone_id', 'creation_date', 'transaction_id'], True),
+    ('ix_transactions_live_client', 'transactions', ['client_id', 'creation_date', 'transaction_id'], True),
+    ('ix_transactions_live_freelancer', 'transactions', ['freelancer_id', 'creation_date', 'transaction_id'], True),
+    ('ix_reviews_live_reviewer', 'reviews', ['reviewer_id', 'creation_date', 'review_id'], True),
+    ('ix_sub_categories_category', 'sub_categories', ['category_id', 'creation_date', 'sub_category_id'], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, live in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text('deleted = false') if live else None,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
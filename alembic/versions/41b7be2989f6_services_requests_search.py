@@ -0,0 +1,81 @@
+"""services and requests search
+
+Revision ID: 41b7be2989f6
+Revises: 015d62a7a8de
+Create Date: 2026-10-18 11:14:07.562931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '41b7be2989f6'
+down_revision: Union[str, None] = '015d62a7a8de'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['services', 'requests']
+
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(array_to_string(NEW.tags, ' '), '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute(SEARCH_VECTOR_FUNCTION)
+    for table in TABLES:
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        op.execute(
+            f'CREATE TRIGGER {table}_search_vector_trigger '
+            f'BEFORE INSERT OR UPDATE OF title, description, tags ON {table} '
+            f'FOR EACH ROW EXECUTE FUNCTION search_vector_update()'
+        )
+        # Fires the trigger on existing rows
+        op.execute(f'UPDATE {table} SET title = title')
+
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f'ix_{table}_search_vector',
+                table,
+                ['search_vector'],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+            op.create_index(
+                f'ix_{table}_title_trgm',
+                table,
+                ['title'],
+                postgresql_using='gin',
+                postgresql_ops={'title': 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(f'ix_{table}_title_trgm', table_name=table, postgresql_concurrently=True, if_exists=True)
+            op.drop_index(f'ix_{table}_search_vector', table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    for table in TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table}')
+        op.drop_column(table, 'search_vector')
+    op.execute('DROP FUNCTION IF EXISTS search_vector_update()')
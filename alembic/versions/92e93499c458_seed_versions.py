@@ -0,0 +1,35 @@
+"""seed versions
+
+Revision ID: 92e93499c458
+Revises: b937ae33d337
+Create Date: 2026-10-18 14:08:26.417093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '92e93499c458'
+down_revision: Union[str, None] = 'b937ae33d337'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Seeding itself runs through `python -m freelance_marketplace.db.sql.seed apply`
+    op.create_table(
+        'seed_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('snapshot_hash', sa.String(length=64), nullable=False),
+        sa.Column('applied_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('seed_versions')
@@ -0,0 +1,54 @@
+"""range and sort indexes
+
+Revision ID: b937ae33d337
+Revises: e40baf940fea
+Create Date: 2026-10-18 13:21:30.904518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b937ae33d337'
+down_revision: Union[str, None] = 'e40baf940fea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# B-tree indexes behind the range filters and sorts of the filter DSL, see FILTER_COLUMNS / SORT_COLUMNS.
+# (name, table, columns, live rows only)
+INDEXES = [
+    ('ix_services_live_price', 'services', ['total_price', 'service_id'], True),
+    ('ix_requests_live_price', 'requests', ['total_price', 'request_id'], True),
+    ('ix_milestones_live_reward', 'milestones', ['reward_amount', 'milestone_id'], True),
+    ('ix_milestones_live_creation', 'milestones', ['creation_date', 'milestone_id'], True),
+    ('ix_orders_live_creation', 'orders', ['creation_date', 'order_id'], True),
+    ('ix_reviews_live_creation', 'reviews', ['creation_date', 'review_id'], True),
+    ('ix_proposals_live_creation', 'proposals', ['creation_date', 'proposal_id'], True),
+    ('ix_transactions_live_creation', 'transactions', ['creation_date', 'transaction_id'], True),
+    ('ix_users_creation', 'users', ['creation_date', 'user_id'], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, live in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text('deleted = false') if live else None,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,42 @@
+"""chain follower
+
+Revision ID: df3d5a775565
+Revises: e9fba74184ef
+Create Date: 2026-10-18 16:48:12.562071
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'df3d5a775565'
+down_revision: Union[str, None] = 'e9fba74184ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Slots written by the chain follower, rollbacks undo everything after a slot
+    op.add_column('utxos', sa.Column('created_slot', sa.BigInteger(), nullable=True))
+    op.add_column('utxos', sa.Column('spent_slot', sa.BigInteger(), nullable=True))
+    op.add_column('pending_transactions', sa.Column('confirmation_slot', sa.BigInteger(), nullable=True))
+    op.create_table(
+        'chain_checkpoints',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('slot', sa.BigInteger(), nullable=False),
+        sa.Column('block_hash', sa.String(length=64), nullable=False),
+        sa.Column('creation_date', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name', 'slot')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('chain_checkpoints')
+    op.drop_column('pending_transactions', 'confirmation_slot')
+    op.drop_column('utxos', 'spent_slot')
+    op.drop_column('utxos', 'created_slot')
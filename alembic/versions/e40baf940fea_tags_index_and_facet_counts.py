@@ -0,0 +1,109 @@
+"""tags index and facet counts
+
+Revision ID: e40baf940fea
+Revises: 41b7be2989f6
+Create Date: 2026-10-18 12:03:52.117460
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e40baf940fea'
+down_revision: Union[str, None] = '41b7be2989f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> status column
+TABLES = {
+    'services': 'service_status_id',
+    'requests': 'request_status_id',
+}
+
+FACET_COUNTS_APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION facet_counts_apply(
+    p_entity text, p_sub_category_id integer, p_status_id integer, p_tags text[], p_delta integer
+) RETURNS void AS $$
+BEGIN
+    INSERT INTO facet_counts AS f (entity, sub_category_id, status_id, tag, count)
+    SELECT DISTINCT p_entity, p_sub_category_id, coalesce(p_status_id, -1), lower(t), p_delta
+    FROM unnest(array_append(coalesce(p_tags, '{}'), '')) AS t
+    ON CONFLICT (entity, sub_category_id, status_id, tag) DO UPDATE SET count = f.count + EXCLUDED.count;
+END
+$$ LANGUAGE plpgsql
+"""
+
+FACET_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION facet_counts_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND NOT OLD.deleted THEN
+        PERFORM facet_counts_apply(
+            TG_TABLE_NAME, OLD.sub_category_id, (to_jsonb(OLD) ->> TG_ARGV[0])::integer, OLD.tags, -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NOT NEW.deleted THEN
+        PERFORM facet_counts_apply(
+            TG_TABLE_NAME, NEW.sub_category_id, (to_jsonb(NEW) ->> TG_ARGV[0])::integer, NEW.tags, 1
+        );
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'facet_counts',
+        sa.Column('entity', sa.String(length=50), nullable=False),
+        sa.Column('sub_category_id', sa.Integer(), nullable=False),
+        sa.Column('status_id', sa.Integer(), nullable=False),
+        sa.Column('tag', sa.String(length=255), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('entity', 'sub_category_id', 'status_id', 'tag')
+    )
+    op.execute(FACET_COUNTS_APPLY_FUNCTION)
+    op.execute(FACET_COUNTS_FUNCTION)
+    for table, status_column in TABLES.items():
+        op.execute(
+            f"CREATE TRIGGER {table}_facet_counts_trigger "
+            f"AFTER INSERT OR UPDATE OF deleted, tags, sub_category_id, {status_column} OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION facet_counts_update('{status_column}')"
+        )
+        # Backfill from the live rows
+        op.execute(
+            f"INSERT INTO facet_counts (entity, sub_category_id, status_id, tag, count) "
+            f"SELECT '{table}', sub_category_id, coalesce({status_column}, -1), tag, count(*) "
+            f"FROM {table} "
+            f"CROSS JOIN LATERAL (SELECT DISTINCT lower(t) AS tag FROM unnest(array_append(tags, '')) AS t) AS row_tags "
+            f"WHERE NOT deleted "
+            f"GROUP BY sub_category_id, coalesce({status_column}, -1), tag"
+        )
+
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f'ix_{table}_tags',
+                table,
+                ['tags'],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(f'ix_{table}_tags', table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    for table in TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_facet_counts_trigger ON {table}')
+    op.execute('DROP FUNCTION IF EXISTS facet_counts_update()')
+    op.execute('DROP FUNCTION IF EXISTS facet_counts_apply(text, integer, integer, text[], integer)')
+    op.drop_table('facet_counts')
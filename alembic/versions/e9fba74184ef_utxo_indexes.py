@@ -0,0 +1,47 @@
+"""utxo indexes
+
+Revision ID: e9fba74184ef
+Revises: 92e93499c458
+Create Date: 2026-10-18 16:02:47.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9fba74184ef'
+down_revision: Union[str, None] = '92e93499c458'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Indexes of the chain indexer, see ChainIndexer.
+# (name, columns, unique, unspent rows only)
+INDEXES = [
+    ('ix_utxos_output', ['tx_hash', 'tx_index'], True, False),
+    ('ix_utxos_unspent_milestone', ['milestone_id'], False, True),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns, unique, unspent in INDEXES:
+            op.create_index(
+                name,
+                'utxos',
+                columns,
+                unique=unique,
+                postgresql_where=sa.text('spent = false') if unspent else None,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='utxos', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,73 @@
+"""
+Encode and decode time, and entry size, of cached list pages of 1k to 50k service rows with each CacheCodec
+codec and compression, against the previous jsonable_encoder + json.dumps entries.
+
+    poetry run python benchmarks/cache_codec.py
+"""
+import datetime
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from freelance_marketplace.api.utils.cache_codec import CacheCodec
+from freelance_marketplace.core.config import settings
+from freelance_marketplace.models.sql.sql_tables import Services
+
+SIZES = (1_000, 10_000, 50_000)
+ROUNDS = 3
+CODECS = ("json", "orjson", "msgpack")
+COMPRESSIONS = ("none", "zstd", "lz4")
+
+
+def build_page(size: int) -> dict:
+    created = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    items = [
+        Services(
+            service_id=index,
+            title=f"Smart contract audit {index}",
+            description="Review of Plutus validators and off-chain transaction building " * 2,
+            total_price=1250.5 + index,
+            freelancer_id=index % 500,
+            sub_category_id=index % 40,
+            service_status_id=2,
+            tags=["plutus", "audit", "cardano"],
+            deleted=False,
+            creation_date=created + datetime.timedelta(minutes=index),
+        )
+        for index in range(size)
+    ]
+    return {"items": items, "next_cursor": "WyIyMDI1LTAxLTAxVDAwOjAwOjAwKzAwOjAwIiwgMV0"}
+
+
+def best(function) -> tuple[float, object]:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    for size in SIZES:
+        page = build_page(size)
+        print(f"{size} rows")
+
+        encode, entry = best(lambda: json.dumps(jsonable_encoder(page)).encode())
+        decode, data = best(lambda: json.loads(entry))
+        expected = data
+        print(f"  {'jsonable_encoder':16} {'-':5} encode {encode * 1000:8.1f} ms  decode {decode * 1000:7.1f} ms  {len(entry) / 1024:8.0f} KB")
+
+        for codec in CODECS:
+            for compression in COMPRESSIONS:
+                settings.redis.cache_codec = codec
+                settings.redis.cache_compression = compression
+                encode, entry = best(lambda: CacheCodec.encode(page))
+                decode, data = best(lambda: CacheCodec.decode(entry))
+                assert data == expected
+                print(f"  {codec:16} {compression:5} encode {encode * 1000:8.1f} ms  decode {decode * 1000:7.1f} ms  {len(entry) / 1024:8.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
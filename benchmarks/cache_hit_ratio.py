@@ -0,0 +1,163 @@
+"""
+Hit ratio of the cached service lists under a replayable read/write mix: every write evicting the whole
+"services" namespace (what each write did before tag invalidation) against the tag invalidation of
+ServicesLogic, which only evicts the lists scoped to the written sub-category and freelancer or containing
+the written service.
+
+The mix is generated from --seed, or replayed from --trace (written there on the first run). Runs
+ServicesLogic against SQL_CONNECTION_STRING and REDIS_HOST, point them at throwaway servers: the
+benchmark creates its freelancers and services and deletes them afterwards.
+
+    poetry run python benchmarks/cache_hit_ratio.py [--seed 7] [--trace trace.jsonl]
+"""
+import argparse
+import asyncio
+import json
+import random
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, select
+
+from freelance_marketplace.api.routes.services.servicesLogic import ServicesLogic
+from freelance_marketplace.api.services.local_cache import cache_stats, local_cache
+from freelance_marketplace.api.services.redis import Redis
+from freelance_marketplace.db.sql.database import AsyncSessionLocal
+from freelance_marketplace.models.sql.request_model.ServiceRequest import ServiceRequest
+from freelance_marketplace.models.sql.sql_tables import User, Services, SubCategory
+
+FREELANCERS = 50
+SERVICES = 1_000
+OPERATIONS = 5_000
+WRITE_SHARE = 0.05
+
+
+def generate_trace(seed: int, sub_categories: int) -> list[dict]:
+    """
+    Reads of the first page of a sub-category (skewed towards the first ones), of a freelancer or of every
+    service, and price updates of random services.
+    """
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(sub_categories)]
+    trace = []
+    for _ in range(OPERATIONS):
+        if rng.random() < WRITE_SHARE:
+            trace.append({"op": "write", "service": rng.randrange(SERVICES), "total_price": rng.randrange(10, 1000)})
+            continue
+        scope = rng.random()
+        if scope < 0.5:
+            trace.append({"op": "read", "sub_category": rng.choices(range(sub_categories), weights)[0]})
+        elif scope < 0.9:
+            trace.append({"op": "read", "freelancer": rng.randrange(FREELANCERS)})
+        else:
+            trace.append({"op": "read"})
+    return trace
+
+
+async def create_rows(sub_category_ids: list[int]) -> tuple[list[int], list[Services]]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            insert(User)
+            .values([{"wallet_public_address": f"bench_freelancer_{index}"} for index in range(FREELANCERS)])
+            .returning(User.user_id)
+        )
+        freelancer_ids = list(result.scalars())
+        result = await db.execute(
+            insert(Services)
+            .values([
+                {
+                    "freelancer_id": freelancer_ids[index % FREELANCERS],
+                    "sub_category_id": sub_category_ids[index % len(sub_category_ids)],
+                    "title": f"Service {index}",
+                    "description": "A benchmark service",
+                    "total_price": 100,
+                    "tags": ["benchmark"],
+                }
+                for index in range(SERVICES)
+            ])
+            .returning(Services)
+        )
+        services = list(result.scalars())
+        await db.commit()
+        return freelancer_ids, services
+
+
+async def delete_rows(freelancer_ids: list[int]):
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Services).where(Services.freelancer_id.in_(freelancer_ids)))
+        await db.execute(delete(User).where(User.user_id.in_(freelancer_ids)))
+        await db.commit()
+
+
+async def replay(trace: list[dict], sub_category_ids: list[int], freelancer_ids: list[int], services: list[Services]) -> float:
+    await Redis.invalidate_cache("services")
+    local_cache.clear()
+    before = cache_stats.snapshot().get("redis", {"hits": 0, "misses": 0})
+
+    for operation in trace:
+        async with AsyncSessionLocal() as db:
+            if operation["op"] == "write":
+                service = services[operation["service"]]
+                data = ServiceRequest(
+                    title=service.title,
+                    description=service.description,
+                    sub_category_id=service.sub_category_id,
+                    total_price=operation["total_price"],
+                    tags=service.tags
+                )
+                await ServicesLogic.update(db=db, service_id=service.service_id, service_data=data)
+                continue
+
+            query_params = {"deleted": False}
+            if "sub_category" in operation:
+                query_params["sub_category_id"] = sub_category_ids[operation["sub_category"]]
+            if "freelancer" in operation:
+                query_params["freelancer_id"] = freelancer_ids[operation["freelancer"]]
+            try:
+                await ServicesLogic.get_services(db=db, query_params=query_params)
+            except HTTPException:
+                pass
+
+    after = cache_stats.snapshot()["redis"]
+    hits, misses = after["hits"] - before["hits"], after["misses"] - before["misses"]
+    return hits / (hits + misses)
+
+
+async def evict_namespace(prefix: str, *args, **kwargs):
+    return await Redis.invalidate_cache(prefix)
+
+
+async def main(seed: int, trace_path: Path | None):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(SubCategory.sub_category_id).order_by(SubCategory.sub_category_id))
+        sub_category_ids = list(result.scalars())
+
+    if trace_path and trace_path.exists():
+        trace = [json.loads(line) for line in trace_path.read_text().splitlines()]
+    else:
+        trace = generate_trace(seed=seed, sub_categories=len(sub_category_ids))
+        if trace_path:
+            trace_path.write_text("".join(json.dumps(operation) + "\n" for operation in trace))
+
+    reads = sum(operation["op"] == "read" for operation in trace)
+    print(f"{len(trace)} operations ({reads} reads), {SERVICES} services, {FREELANCERS} freelancers, {len(sub_category_ids)} sub-categories")
+
+    freelancer_ids, services = await create_rows(sub_category_ids)
+    try:
+        with patch.object(Redis, "invalidate_tags", evict_namespace), patch.object(Redis, "invalidate_batch_tags", evict_namespace):
+            namespace = await replay(trace, sub_category_ids, freelancer_ids, services)
+        print(f"namespace invalidation  hit ratio {namespace:.1%}")
+        tags = await replay(trace, sub_category_ids, freelancer_ids, services)
+        print(f"tag invalidation        hit ratio {tags:.1%}")
+    finally:
+        await delete_rows(freelancer_ids)
+        await Redis.invalidate_cache("services")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--trace", type=Path)
+    arguments = parser.parse_args()
+    asyncio.run(main(seed=arguments.seed, trace_path=arguments.trace))
@@ -0,0 +1,57 @@
+"""
+Event loop lag under concurrent transaction builds, chain calls made inline (what the Ogmios service did)
+against the same calls through the chain executor. A build is simulated by its blocking round trips to
+Ogmios (UTxO queries, evaluation, submission), so no node is needed.
+
+    poetry run python benchmarks/chain_loop_lag.py
+"""
+import asyncio
+import time
+
+from freelance_marketplace.api.services.chain_executor import ChainExecutor
+from freelance_marketplace.api.services.loop_lag import LoopLagMonitor
+
+BUILDS = 32
+CALLS_PER_BUILD = 5
+ROUND_TRIP = 0.02  # seconds per blocking chain call
+PROBE_INTERVAL = 0.005
+
+
+def chain_call():
+    time.sleep(ROUND_TRIP)
+
+
+async def build_inline():
+    for _ in range(CALLS_PER_BUILD):
+        chain_call()
+
+
+async def build_offloaded(executor: ChainExecutor):
+    for _ in range(CALLS_PER_BUILD):
+        await executor.run(chain_call)
+
+
+async def measure(name: str, builds) -> dict:
+    monitor = LoopLagMonitor(interval=PROBE_INTERVAL)
+    probe = asyncio.create_task(monitor.run())
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+    start = time.perf_counter()
+    await asyncio.gather(*builds())
+    elapsed = time.perf_counter() - start
+    # Lets the probe record the wake-up it was late for
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+    probe.cancel()
+    stats = monitor.snapshot()
+    print(f"{name:10} {elapsed * 1000:9.1f} ms total  lag avg {stats['avg_lag_ms']:8.3f} ms  max {stats['max_lag_ms']:9.3f} ms")
+    return stats
+
+
+async def main():
+    executor = ChainExecutor(max_workers=8, timeout=30)
+    print(f"{BUILDS} concurrent builds x {CALLS_PER_BUILD} chain calls of {ROUND_TRIP * 1000:.0f} ms")
+    await measure("inline", lambda: [build_inline() for _ in range(BUILDS)])
+    await measure("executor", lambda: [build_offloaded(executor) for _ in range(BUILDS)])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
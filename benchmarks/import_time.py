@@ -0,0 +1,80 @@
+"""
+Import-time budget of the application entry point, per router profile (WORKER_ROUTER_PROFILE).
+
+Imports freelance_marketplace.main in a fresh interpreter with -X importtime and fails when a profile
+exceeds its budget or imports a dependency it should defer to first use.
+
+    poetry run python benchmarks/import_time.py
+"""
+import os
+import subprocess
+import sys
+
+# Cumulative import time of freelance_marketplace.main, in ms
+BUDGETS_MS = {
+    "api": 1500,
+    "chain": 2500,
+    "all": 2500,
+}
+# Imported on first use only, never by the app import of these profiles
+DEFERRED = {
+    "api": ("pycardano", "pandas", "openpyxl", "boto3", "PIL"),
+    "chain": ("pandas", "openpyxl", "boto3", "PIL"),
+    "all": ("pandas", "openpyxl", "boto3", "PIL"),
+}
+
+
+def measure(profile: str) -> tuple[float, dict[str, float]]:
+    """
+    Returns the import time of the app in ms and the cumulative time of every package root it imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import freelance_marketplace.main"],
+        env={**os.environ, "WORKER_ROUTER_PROFILE": profile},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"{profile}: importing the app failed\n{result.stderr[-2000:]}")
+
+    total = 0.0
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        module = name.strip()
+        elapsed = int(cumulative) / 1000
+        # Nested imports are indented and already counted in their importer
+        if not name.startswith("   ") and module.startswith("freelance_marketplace"):
+            total += elapsed
+        if "." not in module:
+            packages[module] = elapsed
+    return total, packages
+
+
+def main():
+    failed = False
+    for profile, budget in BUDGETS_MS.items():
+        total, packages = measure(profile)
+        heaviest = sorted(
+            ((name, elapsed) for name, elapsed in packages.items() if name != "freelance_marketplace"),
+            key=lambda item: item[1],
+            reverse=True
+        )[:8]
+        print(f"{profile:6} {total:8.1f} ms (budget {budget} ms)")
+        for name, elapsed in heaviest:
+            print(f"       {name:30} {elapsed:8.1f} ms")
+
+        imported = [name for name in DEFERRED[profile] if name in packages]
+        if imported:
+            print(f"       imports deferred dependencies: {', '.join(imported)}")
+            failed = True
+        if total > budget:
+            print(f"       over budget by {total - budget:.1f} ms")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Write latency (the cache invalidation run after every write) as the Redis keyspace grows: the previous
+SCAN match=prefix* + DELETE against the versioned namespace INCR of Redis.invalidate_cache. While an
+invalidation runs, a concurrent reader times its GETs, Redis serving nobody else during a SCAN.
+
+Runs against the Redis of REDIS_HOST / REDIS_PORT, point it at a throwaway server: the keys are written
+under "bench*" and removed afterwards. Keyspace sizes can be given on the command line.
+
+    poetry run python benchmarks/invalidation_latency.py [1000000 5000000]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from freelance_marketplace.api.services.redis import Redis, redis_client
+
+SIZES = (10_000, 100_000, 1_000_000, 3_000_000)
+NAMESPACE = "bench_services"
+# Share of the keyspace cached under the invalidated namespace
+NAMESPACE_SHARE = 0.01
+ROUNDS = 5
+CHUNK = 100_000
+
+POPULATE = """
+for i = tonumber(ARGV[2]), tonumber(ARGV[3]) - 1 do
+    redis.call('SET', ARGV[1] .. i, 'x', 'EX', 3600)
+end
+"""
+REMOVE = """
+for i = tonumber(ARGV[2]), tonumber(ARGV[3]) - 1 do
+    redis.call('UNLINK', ARGV[1] .. i)
+end
+"""
+
+
+async def run_script(script: str, prefix: str, start: int, stop: int):
+    for chunk in range(start, stop, CHUNK):
+        await redis_client.eval(script, 0, prefix, chunk, min(chunk + CHUNK, stop))
+
+
+async def scan_invalidate(prefix: str):
+    """
+    The previous Redis.invalidate_cache.
+    """
+    cursor, keys = await redis_client.scan(match=f"{prefix}*", count=100_000_000)
+    if keys:
+        await redis_client.delete(*keys)
+
+
+async def measure(invalidate, repopulate) -> tuple[float, float]:
+    """
+    Median invalidation time and worst GET latency seen by a reader meanwhile, in ms.
+    """
+    timings, stalls = [], []
+    for _ in range(ROUNDS):
+        await repopulate()
+        done = asyncio.Event()
+        reads = []
+
+        async def reader():
+            while not done.is_set():
+                start = time.perf_counter()
+                await redis_client.get("bench:probe")
+                reads.append(time.perf_counter() - start)
+
+        task = asyncio.create_task(reader())
+        await asyncio.sleep(0.01)
+        start = time.perf_counter()
+        await invalidate()
+        timings.append(time.perf_counter() - start)
+        done.set()
+        await task
+        stalls.append(max(reads))
+    return statistics.median(timings) * 1000, max(stalls) * 1000
+
+
+async def main(sizes: tuple[int, ...]):
+    print(f"{'keys':>10} {'scan + delete':>14} {'max GET':>9} {'versioned':>10} {'max GET':>9}")
+    written = 0
+    namespace_keys = 0
+    try:
+        for size in sizes:
+            namespace_keys = int(size * NAMESPACE_SHARE)
+            await run_script(POPULATE, "bench:other:", written, size - namespace_keys)
+            written = max(written, size - namespace_keys)
+
+            async def repopulate():
+                await run_script(POPULATE, f"{NAMESPACE}:", 0, namespace_keys)
+
+            scan, scan_stall = await measure(lambda: scan_invalidate(NAMESPACE), repopulate)
+            versioned, versioned_stall = await measure(lambda: Redis.invalidate_cache(NAMESPACE), repopulate)
+            print(f"{size:>10} {scan:>11.1f} ms {scan_stall:>6.1f} ms {versioned:>7.2f} ms {versioned_stall:>6.2f} ms")
+    finally:
+        await run_script(REMOVE, "bench:other:", 0, written)
+        await run_script(REMOVE, f"{NAMESPACE}:", 0, namespace_keys)
+        await redis_client.delete(f"cache_version:{NAMESPACE}", f"cache_write_window:{NAMESPACE}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(tuple(int(size) for size in sys.argv[1:]) or SIZES))
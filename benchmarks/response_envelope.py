@@ -0,0 +1,117 @@
+"""
+Benchmarks the response envelope on ~10 MB JSON list responses.
+
+Compares the previous buffering implementation (json.loads + json.dumps of the whole body)
+with TransformResponseMiddleware, which splices the envelope around the body bytes.
+
+    poetry run python benchmarks/response_envelope.py
+"""
+import asyncio
+import datetime
+import json
+import time
+import tracemalloc
+
+from freelance_marketplace.middleware.response_wrapper import TransformResponseMiddleware
+
+ROUNDS = 5
+CHUNK_SIZE = 64 * 1024
+
+
+def build_body(size: int = 10 * 1024 * 1024) -> bytes:
+    row = {
+        "service_id": 1,
+        "title": "Smart contract audit",
+        "description": "Review of Plutus validators and off-chain transaction building " * 4,
+        "total_price": 1250.5,
+        "freelancer_id": 42,
+        "sub_category_id": 7,
+        "created_at": "2025-01-01T00:00:00",
+    }
+    row_size = len(json.dumps(row)) + 2
+    return json.dumps([{**row, "service_id": i} for i in range(size // row_size)]).encode("utf-8")
+
+
+def make_app(body: bytes, streaming: bool):
+    async def app(scope, receive, send):
+        headers = [(b"content-type", b"application/json")]
+        if not streaming:
+            headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        if not streaming:
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+            return
+        for offset in range(0, len(body), CHUNK_SIZE):
+            chunk = body[offset:offset + CHUNK_SIZE]
+            await send({"type": "http.response.body", "body": chunk, "more_body": offset + CHUNK_SIZE < len(body)})
+
+    return app
+
+
+def make_legacy(app):
+    """
+    The previous transform_response_middleware, reduced to its body handling.
+    """
+    async def legacy(scope, receive, send):
+        start_time = time.time()
+        messages = []
+
+        async def collect(message):
+            messages.append(message)
+
+        await app(scope, receive, collect)
+        response_body = b"".join(message.get("body", b"") for message in messages[1:])
+        content = response_body.decode() if response_body else None
+        data = json.loads(content) if content else None
+        formatted_response = {
+            "status": "success",
+            "code": messages[0]["status"],
+            "data": data,
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "processing_time": round(time.time() - start_time, 4),
+            "metadata": {"api_version": "v1", "path": scope["path"], "method": scope["method"]}
+        }
+        modified_response = json.dumps(formatted_response).encode("utf-8")
+        await send(messages[0])
+        await send({"type": "http.response.body", "body": modified_response, "more_body": False})
+
+    return legacy
+
+
+async def run(app) -> tuple[float, int, bytes]:
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/services"}
+    chunks = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            chunks.append(message["body"])
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, b"".join(chunks)
+
+
+async def main():
+    body = build_body()
+    print(f"body: {len(body) / 1024 / 1024:.1f} MB, {ROUNDS} rounds")
+
+    for streaming in (False, True):
+        app = make_app(body=body, streaming=streaming)
+        for name, wrapped in (("buffered", make_legacy(app)), ("spliced", TransformResponseMiddleware(app))):
+            results = [await run(wrapped) for _ in range(ROUNDS)]
+            best = min(elapsed for elapsed, _, _ in results)
+            peak = max(peak for _, peak, _ in results)
+            assert json.loads(results[0][2])["data"] == json.loads(body)
+            mode = "chunked" if streaming else "single"
+            print(f"{mode:8} {name:9} best {best * 1000:8.1f} ms  peak {peak / 1024 / 1024:6.1f} MB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
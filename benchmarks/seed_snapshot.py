@@ -0,0 +1,37 @@
+"""
+Benchmarks the skills seed input: parsing api_file_utilities/*.xlsx (what every worker did at startup)
+against loading the precompiled seed snapshot.
+
+    poetry run python benchmarks/seed_snapshot.py
+"""
+import asyncio
+import time
+
+from freelance_marketplace.api.utils.file_manipulation import FileTransformer
+from freelance_marketplace.db.sql.seed import SKILL_SOURCES, load_snapshot
+
+
+async def parse_xlsx() -> list[str]:
+    skills = set()
+    for file_path, columns in SKILL_SOURCES:
+        skills.update(await FileTransformer.get_file_content(file_path, columns=columns))
+    return sorted(skills)
+
+
+async def main():
+    start = time.perf_counter()
+    parsed = await parse_xlsx()
+    xlsx_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    snapshot, _ = load_snapshot()
+    snapshot_time = time.perf_counter() - start
+
+    assert parsed == snapshot["skills"], "seed snapshot is stale, recompile it"
+    print(f"{len(parsed)} skills")
+    print(f"xlsx      {xlsx_time * 1000:10.1f} ms")
+    print(f"snapshot  {snapshot_time * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
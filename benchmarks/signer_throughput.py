@@ -0,0 +1,89 @@
+"""
+Signing throughput: gpg decryption per signature (what sign_tx did) against the Signer service, in process
+and over its unix socket. Runs against a throwaway key encrypted to a throwaway GnuPG home, needs gpg.
+
+    poetry run python benchmarks/signer_throughput.py
+"""
+import asyncio
+import base64
+import hashlib
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from nacl.signing import VerifyKey
+from pycardano import PaymentSigningKey, PaymentVerificationKey
+
+from freelance_marketplace.api.services.signer import Signer, RemoteSigner, start_server
+from freelance_marketplace.api.utils.blockchain.key_utils import get_skey
+from freelance_marketplace.core.config import settings
+
+GPG_SIGNATURES = 20
+SIGNATURES = 20000
+
+
+def setup_key(home: Path) -> PaymentVerificationKey:
+    os.environ["GNUPGHOME"] = str(home)
+    home.mkdir(mode=0o700)
+    subprocess.run(
+        ["gpg", "--batch", "--passphrase", "", "--quick-gen-key", "signer-benchmark@localhost", "default", "default", "never"],
+        check=True,
+        capture_output=True
+    )
+    signing_key = PaymentSigningKey.generate()
+    encrypted = subprocess.run(
+        ["gpg", "--batch", "--trust-model", "always", "--encrypt", "--recipient", "signer-benchmark@localhost"],
+        input=signing_key.to_json().encode(),
+        check=True,
+        capture_output=True
+    ).stdout
+    settings.wallet_keys.skey_encrypted = base64.b64encode(encrypted).decode()
+    return PaymentVerificationKey.from_signing_key(signing_key)
+
+
+async def measure(name: str, count: int, sign) -> float:
+    messages = [hashlib.blake2b(str(index).encode(), digest_size=32).digest() for index in range(count)]
+    start = time.perf_counter()
+    for message in messages:
+        await sign(message)
+    elapsed = time.perf_counter() - start
+    print(f"{name:14} {count / elapsed:12.1f} signatures/s  ({elapsed / count * 1e6:10.1f} us each)")
+    return elapsed / count
+
+
+async def gpg_sign(message: bytes) -> bytes:
+    signing_key = await get_skey()
+    return signing_key.sign(message)
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        verification_key = setup_key(Path(directory) / "gnupg")
+
+        signer = Signer(ttl=0)
+        # Same signatures as pycardano's
+        message = hashlib.blake2b(b"check", digest_size=32).digest()
+        assert await signer.sign(message) == await gpg_sign(message)
+        VerifyKey(verification_key.payload).verify(message, await signer.sign(message))
+
+        gpg = await measure("gpg per call", GPG_SIGNATURES, gpg_sign)
+        in_process = await measure("in process", SIGNATURES, signer.sign)
+
+        socket_path = str(Path(directory) / "signer.sock")
+        server = await start_server(signer, socket_path)
+        remote = RemoteSigner(socket_path)
+        over_socket = await measure("unix socket", SIGNATURES, remote.sign)
+        remote.close()
+        # Lets the connection handler see the disconnect before the server goes away
+        await asyncio.sleep(0.1)
+        server.close()
+        await server.wait_closed()
+        signer.wipe()
+
+        print(f"in process is {gpg / in_process:,.0f}x, unix socket {gpg / over_socket:,.0f}x the gpg path")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+
+from freelance_marketplace.api.services.local_cache import cache_stats, local_cache
+
+router = APIRouter()
+
+@router.get("/cache/stats", tags=["cache"])
+async def get_cache_stats():
+    return {
+        "layers": cache_stats.snapshot(),
+        "local_entries": len(local_cache)
+    }
@@ -2,21 +2,21 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from freelance_marketplace.api.routes.categories.categoriesLogic import CategoriesLogic
-from freelance_marketplace.db.sql.database import get_sql_db
+from freelance_marketplace.db.sql.database import get_sql_db, get_read_sql_db
 from freelance_marketplace.models.sql.request_model.CategoryRequest import CategoryRequest
 
 router = APIRouter()
 
 @router.get("/category", tags=["categories"])
 async def get_category(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         category_id: int = Query(...)
 ):
     return await CategoriesLogic.get(db=db, category_id=category_id)
 
 @router.get("/categories", tags=["categories"])
 async def get_all_categories(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
 ):
     return await CategoriesLogic.get_all(db=db)
 
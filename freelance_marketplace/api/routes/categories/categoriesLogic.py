@@ -19,6 +19,7 @@ class CategoriesLogic:
     ) -> bool:
         try:
             await Category.create(db=db, **category.model_dump())
+            await db.commit()
             await Redis.invalidate_cache(prefix='categories')
             return True
         except Exception as e:
@@ -70,29 +71,24 @@ class CategoriesLogic:
             db: AsyncSession,
             category_id: int
     ) -> Category:
-        redis_cache, cache_key = await Redis.get_redis_data(match=f'categories:{category_id}')
-        if redis_cache:
-            return redis_cache
+        async def load_category(session: AsyncSession) -> Category:
+            result = await session.execute(select(Category).where(Category.category_id == category_id))
+            category = result.scalars().first()
+            if not category:
+                raise HTTPException(status_code=404, detail=f"Category not found")
+            return category
 
-        result = await db.execute(select(Category).where(Category.category_id == category_id))
-        category = result.scalars().first()
-        if not category:
-            raise HTTPException(status_code=404, detail=f"Category not found")
-        await Redis.set_redis_data(cache_key=cache_key, data=category)
-        return category
+        return await Redis.get_or_load(loader=load_category, db=db, match=f'categories:{category_id}', local=True)
 
     @staticmethod
     async def get_all(
             db: AsyncSession,
     ) -> Sequence[Category]:
-        redis_data, cache_key = await Redis.get_redis_data(match='categories:all')
-        if redis_data:
-            return redis_data
-
-        result = await db.execute(select(Category))
-        categories = result.scalars().all()
-        if not categories:
-            raise HTTPException(status_code=404, detail=f"categories not found")
+        async def load_categories(session: AsyncSession) -> Sequence[Category]:
+            result = await session.execute(select(Category))
+            categories = result.scalars().all()
+            if not categories:
+                raise HTTPException(status_code=404, detail=f"categories not found")
+            return categories
 
-        await Redis.set_redis_data(cache_key, data=categories)
-        return categories
\ No newline at end of file
+        return await Redis.get_or_load(loader=load_categories, db=db, match='categories:all', local=True)
\ No newline at end of file
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+
+from freelance_marketplace.db.sql.database import engine, replica_engine
+
+router = APIRouter()
+
+@router.get("/database/pool", tags=["database"])
+async def get_pool_stats():
+    stats = {"primary": engine.pool.metrics.snapshot(engine.pool)}
+    if replica_engine is not engine:
+        stats["replica"] = replica_engine.pool.metrics.snapshot(replica_engine.pool)
+    return stats
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from freelance_marketplace.api.routes.milestones.milestonesLogic import MilestonesLogic
-from freelance_marketplace.db.sql.database import get_sql_db
+from freelance_marketplace.db.sql.database import get_sql_db, get_read_sql_db
+from freelance_marketplace.models.sql.request_model.BatchRequest import BatchRequest
 from freelance_marketplace.models.sql.request_model.MilestoneApproveStatusRequest import MilestoneApproveStatusRequest
 from freelance_marketplace.models.sql.request_model.MilestoneRequest import MilestoneRequest
 
@@ -9,14 +10,14 @@ router = APIRouter()
 
 @router.get("/milestone", tags=["milestones"])
 async def get_milestone(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         milestone_id: int = Query(...)
 ):
     return await MilestonesLogic.get(db=db, milestone_id=milestone_id)
 
 @router.get("/milestones", tags=["milestones"])
 async def get_all(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         service_id: int | None = Query(None, description="Filter by service_id"),
         request_id: int | None = Query(None, description="Filter by client_id"),
         proposal_id: int | None = Query(None, description="Filter by proposal_id"),
@@ -27,7 +28,11 @@ async def get_all(
         freelancer_id: int | None = Query(None, description="Filter by freelancer_id"),
         client_approved: bool | None = Query(None, description="Filter by client_approved"),
         freelancer_approved: bool | None = Query(None, description="Filter by freelancer_approved"),
-        deleted: bool | None = Query(False, description="Filter by deleted")
+        deleted: bool | None = Query(False, description="Filter by deleted"),
+        filters: list[str] | None = Query(None, alias="filter", description="Filter as column:operator:value[,value], operators eq, gt, gte, lt, lte, between, in"),
+        sort: str | None = Query(None, description="Comma separated sort columns, prefixed with - for descending"),
+        cursor: str | None = Query(None, description="Cursor of the next page, as returned in next_cursor"),
+        limit: int | None = Query(None, ge=1, description="Page size, capped to the max page size")
 ):
     query_params: dict = {
         'milestone_status_id': milestone_status_id,
@@ -40,8 +45,13 @@ async def get_all(
         "client_approved": client_approved,
         "freelancer_approved": freelancer_approved,
         "deleted": deleted,
+        "filter": filters,
+        "sort": sort,
+        "cursor": cursor,
+        "limit": limit
     }
-    return await MilestonesLogic.get_all(db=db, query_params=query_params)
+    milestones = await MilestonesLogic.get_all(db=db, query_params=query_params)
+    return Response(content=milestones, media_type="application/json")
 
 @router.patch("/milestone", tags=["milestones"])
 async def update_milestone(
@@ -87,6 +97,31 @@ async def create(
     create_key, create_value = next(iter(populated_values.items()))
     return await MilestonesLogic.create(db=db, milestone_data=milestone_data, create_key=create_key, create_value=create_value)
 
+@router.post("/milestones:batch", tags=["milestones"])
+async def batch_milestones(
+        batch: BatchRequest,
+        proposal_id: int | None = Query(None),
+        order_id: int | None = Query(None),
+        service_id: int | None = Query(None),
+        request_id: int | None = Query(None),
+        db: AsyncSession = Depends(get_sql_db),
+):
+    ids_to_validate = {
+        "proposal_id": proposal_id,
+        "order_id": order_id,
+        "service_id": service_id,
+        "request_id": request_id,
+    }
+    populated_values = {key:value for key, value in ids_to_validate.items() if value is not None}
+    if batch.create and len(populated_values) != 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Exactly one of service_id, request_id, proposal_id, or order_id must be provided to create milestones."
+        )
+
+    create_key, create_value = next(iter(populated_values.items()), (None, None))
+    return await MilestonesLogic.batch(db=db, batch=batch, create_key=create_key, create_value=create_value)
+
 @router.delete("/milestone", tags=["milestones"])
 async def delete_milestone(
         milestone_id: int = Query(...),
@@ -1,14 +1,37 @@
-from typing import Sequence
 from fastapi import HTTPException
 from sqlalchemy import update, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from freelance_marketplace.api.services.redis import Redis
-from freelance_marketplace.api.utils.sql_util import soft_delete, build_transaction_query
+from freelance_marketplace.api.utils.loading_profiles import get_loading_options, get_embedded_tags
+from freelance_marketplace.api.utils.sql_util import soft_delete, apply_batch, fetch_page, parse_filters, \
+    build_update, get_tag_dimensions, get_written_tag_dimensions, RANGE_OPERATORS, SET_OPERATORS
+from freelance_marketplace.models.enums.milestoneStatus import MilestoneStatus as MilestoneStatusEnum
+from freelance_marketplace.models.sql.request_model.BatchRequest import BatchRequest
 from freelance_marketplace.models.sql.request_model.MilestoneApproveStatusRequest import MilestoneApproveStatusRequest
 from freelance_marketplace.models.sql.request_model.MilestoneRequest import MilestoneRequest
-from freelance_marketplace.models.sql.sql_tables import Milestones
-
+from freelance_marketplace.models.sql.sql_tables import Milestones, User, proposal_milestone_association, \
+    order_milestone_association, service_milestone_association, request_milestone_association
+
+CACHE_TAG_COLUMNS = (Milestones.client_id, Milestones.freelancer_id)
+
+# Filter DSL whitelists of get_all, backed by indexes
+FILTER_COLUMNS = {
+    Milestones.reward_amount: RANGE_OPERATORS,
+    Milestones.creation_date: RANGE_OPERATORS,
+    Milestones.milestone_status_id: SET_OPERATORS,
+    Milestones.client_id: SET_OPERATORS,
+    Milestones.freelancer_id: SET_OPERATORS,
+}
+SORT_COLUMNS = (Milestones.creation_date, Milestones.reward_amount)
+
+# Parent of created milestones -> association table
+MILESTONE_ASSOCIATIONS = {
+    "proposal_id": proposal_milestone_association,
+    "order_id": order_milestone_association,
+    "service_id": service_milestone_association,
+    "request_id": request_milestone_association,
+}
 
 class MilestonesLogic:
 
@@ -20,21 +43,77 @@ class MilestonesLogic:
             create_value: int,
     ) -> bool:
         try:
-            await Milestones.create(db=db, **{create_key: create_value}, **milestone_data.model_dump())
-            await Redis.invalidate_cache(prefix="milestones")
+            milestone = await Milestones.create(db=db, **{create_key: create_value}, **milestone_data.model_dump())
+            await db.commit()
+            await Redis.invalidate_tags(prefix="milestones", dimensions=get_tag_dimensions(milestone, CACHE_TAG_COLUMNS))
             return True
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"{str(e)}")
 
+    @staticmethod
+    async def batch(
+            db: AsyncSession,
+            batch: BatchRequest,
+            create_key: str | None = None,
+            create_value: int | None = None
+    ) -> dict:
+        try:
+            report, rows = await apply_batch(
+                object=Milestones,
+                batch=batch,
+                model=MilestoneRequest,
+                db=db,
+                returning=CACHE_TAG_COLUMNS,
+                defaults={"milestone_status_id": MilestoneStatusEnum.DRAFT.value},
+                references={"client_id": User.user_id, "freelancer_id": User.user_id},
+                # Not a milestones column
+                exclude={"milestone_tx_hash"}
+            )
+            if report["created"]:
+                await db.execute(
+                    MILESTONE_ASSOCIATIONS[create_key]
+                    .insert()
+                    .values([{create_key: create_value, "milestone_id": milestone_id} for milestone_id in report["created"]])
+                )
+            await db.commit()
+        except HTTPException:
+            raise
+        except IntegrityError as e:
+            await db.rollback()
+            print(f"IntegrityError: {e}")
+            raise HTTPException(status_code=500, detail="Database integrity error.")
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=f"{str(e)}")
+
+        if rows:
+            await Redis.invalidate_batch_tags(
+                prefix="milestones",
+                dimensions=[dimensions for row in rows for dimensions in get_written_tag_dimensions(row, CACHE_TAG_COLUMNS)],
+                ids=[row[0] for row in rows]
+            )
+        return report
+
     @staticmethod
     async def delete(
             db: AsyncSession,
             milestone_id: int
     )-> bool:
         try:
-            result = await soft_delete(db=db, object=Milestones, attribute="milestone_id", object_id=milestone_id)
-            if result.rowcount > 0:
-                await Redis.invalidate_cache(prefix="milestones")
+            result = await soft_delete(
+                db=db,
+                object=Milestones,
+                attribute="milestone_id",
+                object_id=milestone_id,
+                returning=CACHE_TAG_COLUMNS
+            )
+            milestone = result.first()
+            if milestone:
+                await Redis.invalidate_tags(
+                    prefix="milestones",
+                    dimensions=get_tag_dimensions(milestone, CACHE_TAG_COLUMNS),
+                    ids=[milestone_id]
+                )
                 return True
             else:
                 raise HTTPException(status_code=404, detail="Milestone not found or already deleted")
@@ -50,14 +129,20 @@ class MilestonesLogic:
     ) -> bool:
         try:
             stmt = (
-                update(Milestones)
-                .where(Milestones.milestone_id == milestone_id)
+                build_update(object=Milestones, condition=Milestones.milestone_id == milestone_id, columns=CACHE_TAG_COLUMNS)
                 .values(**milestone_data.model_dump())
                 .execution_options(synchronize_session="fetch")
             )
-            await db.execute(stmt)
+            result = await db.execute(stmt)
+            milestone = result.first()
             await db.commit()
-            await Redis.invalidate_cache(prefix="milestones")
+            if milestone:
+                # Both the previous and the new dimensions when the milestone moved
+                await Redis.invalidate_batch_tags(
+                    prefix="milestones",
+                    dimensions=get_written_tag_dimensions(milestone, CACHE_TAG_COLUMNS),
+                    ids=[milestone_id]
+                )
             return True
 
         except IntegrityError as e:
@@ -86,11 +171,18 @@ class MilestonesLogic:
                 update(Milestones)
                 .where(Milestones.milestone_id == milestone_id)
                 .values(**update_data)
+                .returning(*CACHE_TAG_COLUMNS)
                 .execution_options(synchronize_session="fetch")
             )
-            await db.execute(stmt)
+            result = await db.execute(stmt)
+            milestone = result.first()
             await db.commit()
-            await Redis.invalidate_cache(prefix="milestones")
+            if milestone:
+                await Redis.invalidate_tags(
+                    prefix="milestones",
+                    dimensions=get_tag_dimensions(milestone, CACHE_TAG_COLUMNS),
+                    ids=[milestone_id]
+                )
 
             return True
 
@@ -111,31 +203,49 @@ class MilestonesLogic:
         redis_data, cache_key = await Redis.get_redis_data(match=f"milestones:{milestone_id}")
         if redis_data:
             return redis_data
+        since = await Redis.get_eviction_sequence()
 
-        result = await db.execute(select(Milestones).where(Milestones.milestone_id == milestone_id))
+        result = await db.execute(
+            select(Milestones)
+            .where(Milestones.milestone_id == milestone_id)
+            .options(*get_loading_options("milestone_detail"))
+        )
         milestone = result.scalars().first()
         if not milestone:
             raise HTTPException(status_code=404, detail=f"milestone not found")
-        await Redis.set_redis_data(cache_key, milestone)
+        await Redis.set_redis_data(
+            cache_key,
+            milestone,
+            tags=[
+                *Redis.generate_entity_tags(prefix="milestones", ids=[milestone_id]),
+                *get_embedded_tags(profile="milestone_detail", rows=[milestone])
+            ],
+            since=since
+        )
         return milestone
 
     @staticmethod
     async def get_all(
             db: AsyncSession,
             query_params: dict
-    ) -> Sequence[Milestones]:
-        redis_data, cache_key = await Redis.get_redis_data(prefix="milestones", query_params=query_params)
-        if redis_data:
-            return redis_data
-
-        transaction = await build_transaction_query(
-            object=Milestones,
-            query_params=query_params
-        )
-        result = await db.execute(transaction)
-        milestones = result.scalars().all()
-        if not milestones:
-            raise HTTPException(status_code=404, detail=f"milestones not found")
-
-        await Redis.set_redis_data(cache_key, data=milestones)
-        return milestones
\ No newline at end of file
+    ) -> bytes:
+        query_params = parse_filters(query_params=query_params, filter_columns=FILTER_COLUMNS, sort_columns=SORT_COLUMNS)
+
+        async def load_milestones(session: AsyncSession) -> dict:
+            page = await fetch_page(object=Milestones, query_params=query_params, db=session, profile="milestone_card")
+            if not page["items"]:
+                raise HTTPException(status_code=404, detail=f"milestones not found")
+            return page
+
+        return await Redis.get_or_load(
+            loader=load_milestones,
+            db=db,
+            prefix="milestones",
+            query_params=query_params,
+            tags=lambda page: Redis.generate_tags(
+                prefix="milestones",
+                dimensions={column.key: query_params.get(column.key) for column in CACHE_TAG_COLUMNS},
+                ids=[milestone.milestone_id for milestone in page["items"]]
+            ) + get_embedded_tags(profile="milestone_card", rows=page["items"]),
+            raw=True
+        )
\ No newline at end of file
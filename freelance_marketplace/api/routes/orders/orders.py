@@ -2,31 +2,39 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from freelance_marketplace.api.routes.orders.ordersLogic import OrdersLogic
-from freelance_marketplace.db.sql.database import get_sql_db
+from freelance_marketplace.db.sql.database import get_sql_db, get_read_sql_db
 from freelance_marketplace.models.sql.request_model.OrderRequest import OrderRequest
 
 router = APIRouter()
 
 @router.get("/order", tags=["orders"])
 async def get_order(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         order_id: int = Query(...)
 ):
     return await OrdersLogic.get(db=db, order_id=order_id)
 
 @router.get("/orders", tags=["orders"])
 async def get_all_orders(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         order_status_id: int | None = Query(None, description="Filter by order_status_id (CANCELED = 0, DRAFT = 1, PENDING = 2, ACCEPTED = 3, IN_PROGRESS = 4, COMPLETED = 5, DENIED_BY_FREELANCER = 6)"),
         service_id: int | None = Query(None, description="Filter by service_id"),
         client_id: int | None = Query(None, description="Filter by client_id"),
-        deleted: bool | None = Query(False, description="Filter by deleted")
+        deleted: bool | None = Query(False, description="Filter by deleted"),
+        filters: list[str] | None = Query(None, alias="filter", description="Filter as column:operator:value[,value], operators eq, gt, gte, lt, lte, between, in"),
+        sort: str | None = Query(None, description="Comma separated sort columns, prefixed with - for descending"),
+        cursor: str | None = Query(None, description="Cursor of the next page, as returned in next_cursor"),
+        limit: int | None = Query(None, ge=1, description="Page size, capped to the max page size")
 ):
     query_params: dict = {
         'order_status_id': order_status_id,
         'service_id': service_id,
         "client_id": client_id,
-        "deleted": deleted
+        "deleted": deleted,
+        "filter": filters,
+        "sort": sort,
+        "cursor": cursor,
+        "limit": limit
     }
     return await OrdersLogic.get_all(db=db, query_params=query_params)
 
@@ -1,14 +1,25 @@
-from typing import Sequence
 from fastapi import HTTPException
 from sqlalchemy import update, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from freelance_marketplace.api.services.redis import Redis
-from freelance_marketplace.api.utils.sql_util import build_transaction_query, soft_delete
+from freelance_marketplace.api.utils.loading_profiles import get_embedded_tags
+from freelance_marketplace.api.utils.sql_util import fetch_page, parse_filters, soft_delete, get_tag_dimensions, \
+    get_written_tag_dimensions, build_update, RANGE_OPERATORS, SET_OPERATORS
 from freelance_marketplace.models.sql.request_model.OrderRequest import OrderRequest
 from freelance_marketplace.models.sql.sql_tables import Order
 
+CACHE_TAG_COLUMNS = (Order.service_id, Order.client_id)
+
+# Filter DSL whitelists of get_all, backed by indexes
+FILTER_COLUMNS = {
+    Order.creation_date: RANGE_OPERATORS,
+    Order.order_status_id: SET_OPERATORS,
+    Order.service_id: SET_OPERATORS,
+    Order.client_id: SET_OPERATORS,
+}
+SORT_COLUMNS = (Order.creation_date,)
 
 class OrdersLogic:
 
@@ -19,8 +30,9 @@ class OrdersLogic:
             service_id: int
     ) -> bool:
         try:
-            await Order.create(db=db, service_id=service_id, **order_data.model_dump())
-            await Redis.invalidate_cache("orders")
+            order = await Order.create(db=db, service_id=service_id, **order_data.model_dump())
+            await db.commit()
+            await Redis.invalidate_tags(prefix="orders", dimensions=get_tag_dimensions(order, CACHE_TAG_COLUMNS))
             return True
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"{str(e)}")
@@ -32,9 +44,20 @@ class OrdersLogic:
             order_id: int
     )-> bool:
         try:
-            result = await soft_delete(db=db, object=Order, attribute="order_id", object_id=order_id)
-            if result.rowcount > 0:
-                await Redis.invalidate_cache("orders")
+            result = await soft_delete(
+                db=db,
+                object=Order,
+                attribute="order_id",
+                object_id=order_id,
+                returning=CACHE_TAG_COLUMNS
+            )
+            order = result.first()
+            if order:
+                await Redis.invalidate_tags(
+                    prefix="orders",
+                    dimensions=get_tag_dimensions(order, CACHE_TAG_COLUMNS),
+                    ids=[order_id]
+                )
                 return True
             else:
                 raise HTTPException(status_code=404, detail="Order not found or already deleted")
@@ -50,14 +73,20 @@ class OrdersLogic:
     ) -> bool:
         try:
             stmt = (
-                update(Order)
-                .where(Order.order_id == order_id)
+                build_update(object=Order, condition=Order.order_id == order_id, columns=CACHE_TAG_COLUMNS)
                 .values(**order_data.model_dump())
                 .execution_options(synchronize_session="fetch")
             )
-            await db.execute(stmt)
+            result = await db.execute(stmt)
+            order = result.first()
             await db.commit()
-            await Redis.invalidate_cache("orders")
+            if order:
+                # Both the previous and the new dimensions when the order moved
+                await Redis.invalidate_batch_tags(
+                    prefix="orders",
+                    dimensions=get_written_tag_dimensions(order, CACHE_TAG_COLUMNS),
+                    ids=[order_id]
+                )
             return True
 
         except IntegrityError as e:
@@ -76,6 +105,7 @@ class OrdersLogic:
         redis_data, cache_key = await Redis.get_redis_data(match=f"orders:{order_id}")
         if redis_data:
             return redis_data
+        since = await Redis.get_eviction_sequence()
 
         result = await db.execute(
             select(Order)
@@ -85,28 +115,29 @@ class OrdersLogic:
         if not order:
             raise HTTPException(status_code=404, detail=f"Order not found")
 
-        await Redis.set_redis_data(cache_key, order)
+        await Redis.set_redis_data(cache_key, order, tags=Redis.generate_entity_tags(prefix="orders", ids=[order_id]), since=since)
         return order
 
     @staticmethod
     async def get_all(
             db: AsyncSession,
             query_params: dict
-    ) -> Sequence[Order]:
+    ) -> dict:
+        query_params = parse_filters(query_params=query_params, filter_columns=FILTER_COLUMNS, sort_columns=SORT_COLUMNS)
         redis_data, cache_key = await Redis.get_redis_data(prefix="orders", query_params=query_params)
         if redis_data:
             return redis_data
+        since = await Redis.get_eviction_sequence()
 
-        transaction = await build_transaction_query(
-            object=Order,
-            query_params=query_params
-        )
-
-        result = await db.execute(transaction)
-        orders = result.scalars().all()
-        if not orders:
+        page = await fetch_page(object=Order, query_params=query_params, db=db, profile="order_card")
+        if not page["items"]:
             raise HTTPException(status_code=404, detail=f"orders not found")
 
-        await Redis.set_redis_data(cache_key, data=orders)
-        return orders
+        tags = Redis.generate_tags(
+            prefix="orders",
+            dimensions={column.key: query_params.get(column.key) for column in CACHE_TAG_COLUMNS},
+            ids=[order.order_id for order in page["items"]]
+        ) + get_embedded_tags(profile="order_card", rows=page["items"])
+        await Redis.set_redis_data(cache_key, data=page, tags=tags, since=since)
+        return page
 
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Query, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from freelance_marketplace.api.routes.profiles.profilesLogic import ProfilesLogic
-from freelance_marketplace.db.sql.database import get_sql_db
+from freelance_marketplace.db.sql.database import get_sql_db, get_read_sql_db
 from freelance_marketplace.models.sql.request_model.ProfileRequests import ProfileRequest
 from freelance_marketplace.api.services.fileStorage import FileStorage 
 
@@ -9,7 +9,7 @@ router = APIRouter()
 
 @router.get("/user/profile", tags=["profile"])
 async def get_user_profile(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         user_id: int = Query(...)
 ):
     return await ProfilesLogic.get_profile(db=db, user_id=user_id)
@@ -25,7 +25,8 @@ class ProfilesLogic:
     ) -> bool:
         try:
             await Profiles.create(db=db, user_id=user_id, **profile.model_dump())
-            await Redis.invalidate_cache(f"profiles:{user_id}")
+            await db.commit()
+            await Redis.delete_cache(f"profiles:{user_id}")
             return True
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"{str(e)}")
@@ -39,7 +40,7 @@ class ProfilesLogic:
         try:
             result = await soft_delete(db=db, object=Profiles, attribute="profile_id", object_id=user_id)
             if result.rowcount > 0:
-                await Redis.invalidate_cache(f"profiles:{user_id}")
+                await Redis.delete_cache(f"profiles:{user_id}")
                 return True
             else:
                 return False
@@ -62,7 +63,7 @@ class ProfilesLogic:
             )
             await db.execute(stmt)
             await db.commit()
-            await Redis.invalidate_cache(f"profiles:{user_id}")
+            await Redis.delete_cache(f"profiles:{user_id}")
             return True
 
         except IntegrityError as e:
@@ -124,6 +125,7 @@ class ProfilesLogic:
             profile_id=user_id,
             data={"profile_picture_identifier": s3_key}
         )
+        await db.commit()
 
         presigned_url = file_storage.generate_presigned_url(s3_key)
         return {"s3_key": s3_key, "url": presigned_url}
\ No newline at end of file
@@ -1,31 +1,39 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from freelance_marketplace.api.routes.proposals.proposalsLogic import ProposalsLogic
-from freelance_marketplace.db.sql.database import get_sql_db
+from freelance_marketplace.db.sql.database import get_sql_db, get_read_sql_db
 from freelance_marketplace.models.sql.request_model.ProposalRequest import ProposalRequest
 
 router = APIRouter()
 
 @router.get("/proposal", tags=["proposals"])
 async def get_proposal(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         proposal_id: int = Query(...)
 ):
     return await ProposalsLogic.get(db=db, proposal_id=proposal_id)
 
 @router.get("/proposals", tags=["proposals"])
 async def get_all(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         proposal_status_id: int | None = Query(None, description="Filter by proposal_status_id (CANCELED = 0, DRAFT = 1, PENDING = 2, ACCEPTED = 3, IN_PROGRESS = 4, COMPLETED = 5, DENIED_BY_FREELANCER = 6)"),
         request_id: int | None = Query(None, description="Filter by request_id"),
         freelancer_id: int | None = Query(None, description="Filter by freelancer_id"),
-        deleted: bool | None = Query(False, description="Filter by deleted")
+        deleted: bool | None = Query(False, description="Filter by deleted"),
+        filters: list[str] | None = Query(None, alias="filter", description="Filter as column:operator:value[,value], operators eq, gt, gte, lt, lte, between, in"),
+        sort: str | None = Query(None, description="Comma separated sort columns, prefixed with - for descending"),
+        cursor: str | None = Query(None, description="Cursor of the next page, as returned in next_cursor"),
+        limit: int | None = Query(None, ge=1, description="Page size, capped to the max page size")
 ):
     query_params: dict = {
         'proposal_status_id': proposal_status_id,
         'request_id': request_id,
         "freelancer_id": freelancer_id,
-        "deleted": deleted
+        "deleted": deleted,
+        "filter": filters,
+        "sort": sort,
+        "cursor": cursor,
+        "limit": limit
     }
     return await ProposalsLogic.get_all(db=db, query_params=query_params)
 
@@ -1,13 +1,23 @@
-from typing import Sequence
 from fastapi import HTTPException
 from sqlalchemy import update, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from freelance_marketplace.api.services.redis import Redis
-from freelance_marketplace.api.utils.sql_util import build_transaction_query, soft_delete
+from freelance_marketplace.api.utils.loading_profiles import get_embedded_tags
+from freelance_marketplace.api.utils.sql_util import fetch_page, parse_filters, soft_delete, \
+    RANGE_OPERATORS, SET_OPERATORS
 from freelance_marketplace.models.sql.request_model.ProposalRequest import ProposalRequest
 from freelance_marketplace.models.sql.sql_tables import Proposal
 
+# Filter DSL whitelists of get_all, backed by indexes
+FILTER_COLUMNS = {
+    Proposal.creation_date: RANGE_OPERATORS,
+    Proposal.proposal_status_id: SET_OPERATORS,
+    Proposal.request_id: SET_OPERATORS,
+    Proposal.freelancer_id: SET_OPERATORS,
+}
+SORT_COLUMNS = (Proposal.creation_date,)
+
 
 class ProposalsLogic:
 
@@ -19,6 +29,7 @@ class ProposalsLogic:
     ) -> bool:
         try:
             await Proposal.create(db=db, request_id=request_id, **proposal_data.model_dump())
+            await db.commit()
             await Redis.invalidate_cache("proposals")
             return True
         except Exception as e:
@@ -95,24 +106,20 @@ class ProposalsLogic:
     async def get_all(
             db: AsyncSession,
             query_params: dict
-    ) -> Sequence[Proposal]:
+    ) -> dict:
+        query_params = parse_filters(query_params=query_params, filter_columns=FILTER_COLUMNS, sort_columns=SORT_COLUMNS)
         try:
             redis_data, cache_key = await Redis.get_redis_data(prefix="proposals", query_params=query_params)
             if redis_data:
                 return redis_data
-
-            transaction = await build_transaction_query(
-                object=Proposal,
-                query_params=query_params
-            )
+            since = await Redis.get_eviction_sequence()
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"{str(e)}")
 
-        result = await db.execute(transaction)
-        proposals = result.scalars().all()
-        if not proposals:
+        page = await fetch_page(object=Proposal, query_params=query_params, db=db, profile="proposal_card")
+        if not page["items"]:
             raise HTTPException(status_code=404, detail=f"proposals not found")
 
-        await Redis.set_redis_data(cache_key, data=proposals)
-        return proposals
+        await Redis.set_redis_data(cache_key, data=page, tags=get_embedded_tags(profile="proposal_card", rows=page["items"]), since=since)
+        return page
 
@@ -1,34 +1,90 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from freelance_marketplace.api.routes.requests.requestsLogic import RequestsLogic
-from freelance_marketplace.db.sql.database import get_sql_db
+from freelance_marketplace.api.utils.sql_util import normalize_tags
+from freelance_marketplace.db.sql.database import get_sql_db, get_read_sql_db
 from freelance_marketplace.models.enums.requestStatus import RequestStatus
+from freelance_marketplace.models.sql.request_model.BatchRequest import BatchRequest
 from freelance_marketplace.models.sql.request_model.RequestRequest import RequestRequest
 
 router = APIRouter()
 
 @router.get("/request", tags=["requests"])
 async def get_request(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         request_id: int = Query(...)
 ):
     return await RequestsLogic.get_request(db=db, request_id=request_id)
 
 @router.get("/requests", tags=["requests"])
 async def get_all(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         sub_category_id: int | None = Query(None, description="Filter by sub_category_id"),
         request_status_id: int | None = Query(None, description="Filter by request_status_id (CANCELED = 0, DRAFT = 1, REQUESTING_FREELANCER = 2, IN_PROGRESS = 3, COMPLETED = 4)"),
         client_id: int | None = Query(None, description="Filter by client_id"),
-        deleted: bool | None = Query(False, description="Filter by deleted")
+        tags: list[str] | None = Query(None, description="Filter by tags"),
+        tags_match: str = Query("any", pattern="^(any|all)$", description="Match any or all of the tags"),
+        deleted: bool | None = Query(False, description="Filter by deleted"),
+        filters: list[str] | None = Query(None, alias="filter", description="Filter as column:operator:value[,value], operators eq, gt, gte, lt, lte, between, in"),
+        sort: str | None = Query(None, description="Comma separated sort columns, prefixed with - for descending"),
+        cursor: str | None = Query(None, description="Cursor of the next page, as returned in next_cursor"),
+        limit: int | None = Query(None, ge=1, description="Page size, capped to the max page size")
 ):
     query_params: dict = {
         'request_status_id': request_status_id,
         "client_id": client_id,
         "deleted": deleted,
-        "sub_category_id": sub_category_id
+        "sub_category_id": sub_category_id,
+        "tags": normalize_tags(tags),
+        "tags_match": tags_match,
+        "filter": filters,
+        "sort": sort,
+        "cursor": cursor,
+        "limit": limit
     }
-    return await RequestsLogic.get_all(db=db, query_params=query_params)
+    requests = await RequestsLogic.get_all(db=db, query_params=query_params)
+    return Response(content=requests, media_type="application/json")
+
+@router.get("/requests/search", tags=["requests"])
+async def search_requests(
+        db: AsyncSession = Depends(get_read_sql_db),
+        q: str = Query(..., min_length=2, description="Search in title, description and tags"),
+        sub_category_id: int | None = Query(None, description="Filter by sub_category_id"),
+        request_status_id: int | None = Query(None, description="Filter by request_status_id (CANCELED = 0, DRAFT = 1, REQUESTING_FREELANCER = 2, IN_PROGRESS = 3, COMPLETED = 4)"),
+        total_price: float | None = Query(None, description="Filter by total_price"),
+        client_id: int | None = Query(None, description="Filter by client_id"),
+        tags: list[str] | None = Query(None, description="Filter by tags"),
+        tags_match: str = Query("any", pattern="^(any|all)$", description="Match any or all of the tags"),
+        limit: int | None = Query(None, ge=1, description="Number of results, capped to the max page size")
+):
+    query_params: dict = {
+        "sub_category_id": sub_category_id,
+        "request_status_id": request_status_id,
+        "total_price": total_price,
+        "client_id": client_id,
+        "tags": normalize_tags(tags),
+        "tags_match": tags_match,
+        "deleted": False,
+        "limit": limit
+    }
+    requests = await RequestsLogic.search(db=db, search=q, query_params=query_params)
+    return Response(content=requests, media_type="application/json")
+
+@router.get("/requests/facets", tags=["requests"])
+async def get_requests_facets(
+        db: AsyncSession = Depends(get_read_sql_db),
+        sub_category_id: int | None = Query(None, description="Filter by sub_category_id"),
+        request_status_id: int | None = Query(None, description="Filter by request_status_id (CANCELED = 0, DRAFT = 1, REQUESTING_FREELANCER = 2, IN_PROGRESS = 3, COMPLETED = 4)"),
+        tags: list[str] | None = Query(None, description="Filter by tags"),
+        tags_match: str = Query("any", pattern="^(any|all)$", description="Match any or all of the tags")
+):
+    query_params: dict = {
+        "sub_category_id": sub_category_id,
+        "request_status_id": request_status_id,
+        "tags": normalize_tags(tags),
+        "tags_match": tags_match
+    }
+    return await RequestsLogic.get_facets(db=db, query_params=query_params)
 
 @router.patch("/request", tags=["requests"])
 async def update_request(
@@ -59,6 +115,14 @@ async def create_request(
 ):
     return await RequestsLogic.create(db=db, request_data=request_data, client_id=client_id)
 
+@router.post("/requests:batch", tags=["requests"])
+async def batch_requests(
+        batch: BatchRequest,
+        client_id: int = Query(..., description="Owner of the created requests"),
+        db: AsyncSession = Depends(get_sql_db)
+):
+    return await RequestsLogic.batch(db=db, batch=batch, client_id=client_id)
+
 @router.delete("/request", tags=["requests"])
 async def delete_request(
         request_id: int = Query(...),
@@ -1,15 +1,29 @@
-from typing import Sequence
 from fastapi import HTTPException
 from sqlalchemy import update, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from freelance_marketplace.api.services.redis import Redis
-from freelance_marketplace.api.utils.sql_util import soft_delete, build_transaction_query
+from freelance_marketplace.api.utils.loading_profiles import get_loading_options, get_embedded_tags
+from freelance_marketplace.api.utils.sql_util import soft_delete, apply_batch, fetch_page, parse_filters, \
+    fetch_search_page, fetch_facets, normalize_search, build_update, get_tag_dimensions, get_written_tag_dimensions, \
+    RANGE_OPERATORS, SET_OPERATORS
 from freelance_marketplace.models.enums.requestStatus import RequestStatus
+from freelance_marketplace.models.sql.request_model.BatchRequest import BatchRequest
 from freelance_marketplace.models.sql.request_model.RequestRequest import RequestRequest
-from freelance_marketplace.models.sql.sql_tables import Requests
+from freelance_marketplace.models.sql.sql_tables import Requests, SubCategory
 
+CACHE_TAG_COLUMNS = (Requests.sub_category_id, Requests.client_id)
+
+# Filter DSL whitelists of get_all, backed by indexes
+FILTER_COLUMNS = {
+    Requests.total_price: RANGE_OPERATORS,
+    Requests.creation_date: RANGE_OPERATORS,
+    Requests.request_status_id: SET_OPERATORS,
+    Requests.sub_category_id: SET_OPERATORS,
+    Requests.client_id: SET_OPERATORS,
+}
+SORT_COLUMNS = (Requests.creation_date, Requests.total_price)
 
 class RequestsLogic:
 
@@ -20,22 +34,69 @@ class RequestsLogic:
             request_data: RequestRequest
     ) -> bool:
         try:
-            await Requests.create(db=db, client_id=client_id, **request_data.model_dump())
-            await Redis.invalidate_cache("requests")
+            request = await Requests.create(db=db, client_id=client_id, **request_data.model_dump())
+            await db.commit()
+            await Redis.invalidate_tags(prefix="requests", dimensions=get_tag_dimensions(request, CACHE_TAG_COLUMNS))
             return True
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"{str(e)}")
 
 
+    @staticmethod
+    async def batch(
+            db: AsyncSession,
+            client_id: int,
+            batch: BatchRequest
+    ) -> dict:
+        try:
+            report, rows = await apply_batch(
+                object=Requests,
+                batch=batch,
+                model=RequestRequest,
+                db=db,
+                returning=CACHE_TAG_COLUMNS,
+                defaults={"client_id": client_id},
+                references={"sub_category_id": SubCategory.sub_category_id}
+            )
+            await db.commit()
+        except HTTPException:
+            raise
+        except IntegrityError as e:
+            await db.rollback()
+            print(f"IntegrityError: {e}")
+            raise HTTPException(status_code=500, detail="Database integrity error.")
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=f"{str(e)}")
+
+        if rows:
+            await Redis.invalidate_batch_tags(
+                prefix="requests",
+                dimensions=[dimensions for row in rows for dimensions in get_written_tag_dimensions(row, CACHE_TAG_COLUMNS)],
+                ids=[row[0] for row in rows]
+            )
+        return report
+
     @staticmethod
     async def delete(
             db: AsyncSession,
             request_id: int
     )-> bool:
         try:
-            result = await soft_delete(db=db, object=Requests, attribute="request_id", object_id=request_id)
-            if result.rowcount > 0:
-                await Redis.invalidate_cache("requests")
+            result = await soft_delete(
+                db=db,
+                object=Requests,
+                attribute="request_id",
+                object_id=request_id,
+                returning=CACHE_TAG_COLUMNS
+            )
+            request = result.first()
+            if request:
+                await Redis.invalidate_tags(
+                    prefix="requests",
+                    dimensions=get_tag_dimensions(request, CACHE_TAG_COLUMNS),
+                    ids=[request_id]
+                )
                 return True
             else:
                 raise HTTPException(status_code=404, detail="Request not found or already deleted")
@@ -51,14 +112,20 @@ class RequestsLogic:
     ) -> bool:
         try:
             stmt = (
-                update(Requests)
-                .where(Requests.request_id == request_id)
+                build_update(object=Requests, condition=Requests.request_id == request_id, columns=CACHE_TAG_COLUMNS)
                 .values(**request_data.model_dump())
                 .execution_options(synchronize_session="fetch")
             )
-            await db.execute(stmt)
+            result = await db.execute(stmt)
+            request = result.first()
             await db.commit()
-            await Redis.invalidate_cache("requests")
+            if request:
+                # Both the previous and the new dimensions when the request moved
+                await Redis.invalidate_batch_tags(
+                    prefix="requests",
+                    dimensions=get_written_tag_dimensions(request, CACHE_TAG_COLUMNS),
+                    ids=[request_id]
+                )
             return True
 
         except IntegrityError as e:
@@ -81,11 +148,18 @@ class RequestsLogic:
                 update(Requests)
                 .where(Requests.request_id == request_id)
                 .values(request_status_id=request_status.value)
+                .returning(*CACHE_TAG_COLUMNS)
                 .execution_options(synchronize_session="fetch")
             )
-            await db.execute(stmt)
+            result = await db.execute(stmt)
+            request = result.first()
             await db.commit()
-            await Redis.invalidate_cache("requests")
+            if request:
+                await Redis.invalidate_tags(
+                    prefix="requests",
+                    dimensions=get_tag_dimensions(request, CACHE_TAG_COLUMNS),
+                    ids=[request_id]
+                )
             return True
 
         except IntegrityError as e:
@@ -103,7 +177,11 @@ class RequestsLogic:
             request_id: int
     ) -> Requests:
         try:
-            result = await db.execute(select(Requests).where(Requests.request_id == request_id))
+            result = await db.execute(
+                select(Requests)
+                .where(Requests.request_id == request_id)
+                .options(*get_loading_options("request_detail"))
+            )
             request = result.scalars().first()
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"{str(e)}")
@@ -117,23 +195,90 @@ class RequestsLogic:
     async def get_all(
             db: AsyncSession,
             query_params: dict
-    ) -> Sequence[Requests]:
-        try:
-            redis_cache, cache_key = await Redis.get_redis_data(prefix="requests", query_params=query_params)
-            if redis_cache:
-                return redis_cache
+    ) -> bytes:
+        query_params = parse_filters(query_params=query_params, filter_columns=FILTER_COLUMNS, sort_columns=SORT_COLUMNS)
+
+        async def load_requests(session: AsyncSession) -> dict:
+            try:
+                page = await fetch_page(object=Requests, query_params=query_params, db=session, profile="request_card")
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"{str(e)}")
+
+            if not page["items"]:
+                raise HTTPException(status_code=404, detail=f"Requests not found")
+            return page
+
+        return await Redis.get_or_load(
+            loader=load_requests,
+            db=db,
+            prefix="requests",
+            query_params=query_params,
+            tags=lambda page: Redis.generate_tags(
+                prefix="requests",
+                dimensions={column.key: query_params.get(column.key) for column in CACHE_TAG_COLUMNS},
+                ids=[request.request_id for request in page["items"]]
+            ) + get_embedded_tags(profile="request_card", rows=page["items"]),
+            raw=True
+        )
+
+    @staticmethod
+    async def search(
+            db: AsyncSession,
+            search: str,
+            query_params: dict
+    ) -> bytes:
+        """
+        Ranked full-text and fuzzy title search, cached per normalized search and filters.
+        """
+        search = normalize_search(search)
+        query_params = {**query_params, "search": search}
 
-            transaction = await build_transaction_query(
+        async def load_requests(session: AsyncSession) -> dict:
+            return await fetch_search_page(
                 object=Requests,
-                query_params=query_params
+                query_params=query_params,
+                search=search,
+                db=session,
+                profile="request_card"
+            )
+
+        return await Redis.get_or_load(
+            loader=load_requests,
+            db=db,
+            prefix="requests",
+            query_params=query_params,
+            tags=lambda page: Redis.generate_tags(
+                prefix="requests",
+                dimensions={column.key: query_params.get(column.key) for column in CACHE_TAG_COLUMNS},
+                ids=[request.request_id for request in page["items"]]
+            ) + get_embedded_tags(profile="request_card", rows=page["items"]),
+            raw=True
+        )
+
+    @staticmethod
+    async def get_facets(
+            db: AsyncSession,
+            query_params: dict
+    ) -> dict:
+        async def load_facets(session: AsyncSession) -> dict:
+            return await fetch_facets(
+                object=Requests,
+                status_column=Requests.request_status_id,
+                query_params=query_params,
+                db=session
             )
-            result = await db.execute(transaction)
-            requests = result.scalars().all()
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"{str(e)}")
 
-        if not requests:
-            raise HTTPException(status_code=404, detail=f"Requests not found")
-        await Redis.set_redis_data(cache_key=cache_key, data=requests)
-        return requests
+        return await Redis.get_or_load(
+            loader=load_facets,
+            db=db,
+            prefix="requests",
+            query_params={**query_params, "facets": True},
+            # Every count of a sub-category entry is within that sub-category (see fetch_facets)
+            tags=lambda _: Redis.generate_tags(
+                prefix="requests",
+                dimensions={"sub_category_id": query_params.get("sub_category_id")}
+            )
+        )
 
@@ -1,34 +1,42 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from freelance_marketplace.api.routes.reviews.reviewsLogic import ReviewsLogic
-from freelance_marketplace.db.sql.database import get_sql_db
+from freelance_marketplace.db.sql.database import get_sql_db, get_read_sql_db
 from freelance_marketplace.models.sql.request_model.ReviewRequest import ReviewRequest
 
 router = APIRouter()
 
 @router.get("/review", tags=["reviews"])
 async def get_review(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         review_id: int = Query(...)
 ):
     return await ReviewsLogic.get(db=db, review_id=review_id)
 
 @router.get("/reviews", tags=["reviews"])
 async def get_all(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         deleted: bool | None = Query(None, description="Filter by deleted"),
         ## TODO comment: str | None = Query(None,description="Filter by comment"),
         rating: float | None = Query(None, description="Filter by rating"),
         ## TODO max_rating: float | None = Query(None, description="Filter by max_rating value"),
         ## TODO min_rating: float | None = Query(None, description="Filter by min_rating value"),
         reviewer_id: int | None = Query(None, description="Filter by reviewer_id"),
-        reviewee_id: int | None = Query(False, description="Filter by reviewee_id")
+        reviewee_id: int | None = Query(False, description="Filter by reviewee_id"),
+        filters: list[str] | None = Query(None, alias="filter", description="Filter as column:operator:value[,value], operators eq, gt, gte, lt, lte, between, in"),
+        sort: str | None = Query(None, description="Comma separated sort columns, prefixed with - for descending"),
+        cursor: str | None = Query(None, description="Cursor of the next page, as returned in next_cursor"),
+        limit: int | None = Query(None, ge=1, description="Page size, capped to the max page size")
 ):
     query_params: dict = {
         'rating': rating,
         'reviewer_id': reviewer_id,
         "reviewee_id": reviewee_id,
         "deleted": deleted,
+        "filter": filters,
+        "sort": sort,
+        "cursor": cursor,
+        "limit": limit
     }
     return await ReviewsLogic.get_all(db=db, query_params=query_params)
 
@@ -1,13 +1,22 @@
-from typing import Sequence
 from fastapi import HTTPException
 from sqlalchemy import update, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from freelance_marketplace.api.services.redis import Redis
-from freelance_marketplace.api.utils.sql_util import soft_delete, build_transaction_query
+from freelance_marketplace.api.utils.loading_profiles import get_embedded_tags
+from freelance_marketplace.api.utils.sql_util import soft_delete, fetch_page, parse_filters, \
+    RANGE_OPERATORS, SET_OPERATORS
 from freelance_marketplace.models.sql.request_model.ReviewRequest import ReviewRequest
 from freelance_marketplace.models.sql.sql_tables import Review
 
+# Filter DSL whitelists of get_all, backed by indexes
+FILTER_COLUMNS = {
+    Review.creation_date: RANGE_OPERATORS,
+    Review.reviewee_id: SET_OPERATORS,
+    Review.reviewer_id: SET_OPERATORS,
+}
+SORT_COLUMNS = (Review.creation_date,)
+
 
 class ReviewsLogic:
 
@@ -19,6 +28,7 @@ class ReviewsLogic:
     ) -> bool:
         try:
             await Review.create(db=db, reviewer_id=reviewer_id, **review_data.model_dump())
+            await db.commit()
             await Redis.invalidate_cache(prefix="reviews")
             return True
         except Exception as e:
@@ -93,23 +103,20 @@ class ReviewsLogic:
     async def get_all(
             db: AsyncSession,
             query_params: dict
-    ) -> Sequence[Review]:
+    ) -> dict:
+        query_params = parse_filters(query_params=query_params, filter_columns=FILTER_COLUMNS, sort_columns=SORT_COLUMNS)
         try:
             redis_cache, cache_key = await Redis.get_redis_data(prefix="reviews", query_params=query_params)
             if redis_cache:
                 return redis_cache
+            since = await Redis.get_eviction_sequence()
 
-            transaction = await build_transaction_query(
-                object=Review,
-                query_params=query_params
-            )
-            result = await db.execute(transaction)
-            reviews = result.scalars().all()
-            if not reviews:
+            page = await fetch_page(object=Review, query_params=query_params, db=db, profile="review_card")
+            if not page["items"]:
                 raise HTTPException(status_code=404, detail=f"reviews not found")
 
-            await Redis.set_redis_data(cache_key, data=reviews)
-            return reviews
+            await Redis.set_redis_data(cache_key, data=page, tags=get_embedded_tags(profile="review_card", rows=page["items"]), since=since)
+            return page
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"{str(e)}")
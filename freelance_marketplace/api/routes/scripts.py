@@ -1,11 +1,15 @@
-from fastapi import APIRouter
-from pycardano import Address, OgmiosChainContext, Network, TransactionBody, Transaction
+from fastapi import APIRouter, Depends
+from pycardano import Address, TransactionBody, Transaction
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from freelance_marketplace.api.services.cardano_submit_api import SubmitAPI
-from freelance_marketplace.api.services.ogmios import Ogmios
+from freelance_marketplace.api.services.chain_context import get_chain_context
+from freelance_marketplace.api.services.chain_executor import chain_executor
+from freelance_marketplace.api.services.loop_lag import loop_lag
 from freelance_marketplace.api.services.transaction_builder import TransactionOrchestrator
 from freelance_marketplace.api.utils.blockchain.key_utils import build_addr_from_vkey, get_vkey
 from freelance_marketplace.core.config import settings
+from freelance_marketplace.db.sql.database import get_sql_db
 from freelance_marketplace.models.enums.transaction_types import TransactionTypes
 
 router = APIRouter()
@@ -13,7 +17,7 @@ router = APIRouter()
 @router.get("/test", tags=["testing"])
 async def test():
     # Connect to Ogmios (Make sure it's running locally)
-    context = OgmiosChainContext(host=settings.ogmios.host, port=settings.ogmios.port, network=Network.TESTNET)
+    context = get_chain_context()
     public_address = settings.test.addr
 
     try:
@@ -23,7 +27,7 @@ async def test():
         raise e
 
     try:
-        utxos = context.utxos(addr_obj)
+        utxos = await context.call(context.utxos, addr_obj)
         
         if utxos:
             print(f"UTXOs for {public_address}:")
@@ -36,13 +40,15 @@ async def test():
         print(f"Error fetching UTXOs: {e}")
 
 @router.get("/create_script", tags=["script"])
-async def create_script():
+async def create_script(
+        milestone_id: int,
+        db: AsyncSession = Depends(get_sql_db)
+):
     tx_builder: TransactionOrchestrator = TransactionOrchestrator()
     verification_key = await get_vkey()
     signer_address: Address = await build_addr_from_vkey(vkey=verification_key)
     client_address: Address = signer_address
     freelancer_address: Address = signer_address
-    milestone_id: int = 0
     milestone: dict = {
         "milestone_id": milestone_id,
         "reward": 0,
@@ -59,4 +65,11 @@ async def create_script():
         transaction_type=TransactionTypes.locking_transaction
     )
     signed_tx: Transaction = await tx_builder.sign_tx(unsigned_tx)
-    await Ogmios().submit_transaction(signed_tx)
+    return await tx_builder.submit_tx(db, signed_tx, milestone_id=milestone_id, action="create_milestone")
+
+@router.get("/chain/stats", tags=["script"])
+async def get_chain_stats():
+    return {
+        "executor": chain_executor.snapshot(),
+        "loop_lag": loop_lag.snapshot()
+    }
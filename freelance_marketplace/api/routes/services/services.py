@@ -1,32 +1,39 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from freelance_marketplace.api.routes.services.servicesLogic import ServicesLogic
-from freelance_marketplace.db.sql.database import get_sql_db
+from freelance_marketplace.api.utils.sql_util import normalize_tags
+from freelance_marketplace.db.sql.database import get_sql_db, get_read_sql_db
 from freelance_marketplace.models.enums.serviceStatus import ServiceStatus
+from freelance_marketplace.models.sql.request_model.BatchRequest import BatchRequest
 from freelance_marketplace.models.sql.request_model.ServiceRequest import ServiceRequest
 
 router = APIRouter()
 
 @router.get("/service", tags=["services"])
 async def get_service(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         service_id: int = Query(...)
 ):
     return await ServicesLogic.get_service(db=db, service_id=service_id)
 
 @router.get("/services", tags=["services"])
 async def get_services(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         service_status_id: int | None = Query(None,
                                             description="Filter by service_status_id (CANCELED = 0, DRAFT = 1, AVAILABLE = 2, CLOSED = 3)"),
         service_id: int | None = Query(None, description="Filter by service_id"),
         title: str | None = Query(None, description="Filter by title"),
-        description: str | None = Query(False, description="Filter by description"),
-        sub_category_id: int | None = Query(False, description="Filter by sub_category_id"),
-        total_price: float | None = Query(False, description="Filter by total_price"),
-        ## TODO tags: bool | None = Query(False, description="Filter by tags"),
+        description: str | None = Query(None, description="Filter by description"),
+        sub_category_id: int | None = Query(None, description="Filter by sub_category_id"),
+        total_price: float | None = Query(None, description="Filter by total_price"),
+        tags: list[str] | None = Query(None, description="Filter by tags"),
+        tags_match: str = Query("any", pattern="^(any|all)$", description="Match any or all of the tags"),
         deleted: bool | None = Query(False, description="Filter by deleted"),
-        freelancer_id: int | None = Query(False, description="Filter by freelancer_id"),
+        freelancer_id: int | None = Query(None, description="Filter by freelancer_id"),
+        filters: list[str] | None = Query(None, alias="filter", description="Filter as column:operator:value[,value], operators eq, gt, gte, lt, lte, between, in"),
+        sort: str | None = Query(None, description="Comma separated sort columns, prefixed with - for descending"),
+        cursor: str | None = Query(None, description="Cursor of the next page, as returned in next_cursor"),
+        limit: int | None = Query(None, ge=1, description="Page size, capped to the max page size")
 ):
     query_params: dict = {
         'service_status_id': service_status_id,
@@ -35,10 +42,60 @@ async def get_services(
         "description": description,
         "sub_category_id": sub_category_id,
         "total_price": total_price,
+        "tags": normalize_tags(tags),
+        "tags_match": tags_match,
         "deleted": deleted,
-        "freelancer_id": freelancer_id
+        "freelancer_id": freelancer_id,
+        "filter": filters,
+        "sort": sort,
+        "cursor": cursor,
+        "limit": limit
     }
-    return await ServicesLogic.get_services(db=db, query_params=query_params)
+    services = await ServicesLogic.get_services(db=db, query_params=query_params)
+    return Response(content=services, media_type="application/json")
+
+@router.get("/services/search", tags=["services"])
+async def search_services(
+        db: AsyncSession = Depends(get_read_sql_db),
+        q: str = Query(..., min_length=2, description="Search in title, description and tags"),
+        sub_category_id: int | None = Query(None, description="Filter by sub_category_id"),
+        service_status_id: int | None = Query(None,
+                                            description="Filter by service_status_id (CANCELED = 0, DRAFT = 1, AVAILABLE = 2, CLOSED = 3)"),
+        total_price: float | None = Query(None, description="Filter by total_price"),
+        freelancer_id: int | None = Query(None, description="Filter by freelancer_id"),
+        tags: list[str] | None = Query(None, description="Filter by tags"),
+        tags_match: str = Query("any", pattern="^(any|all)$", description="Match any or all of the tags"),
+        limit: int | None = Query(None, ge=1, description="Number of results, capped to the max page size")
+):
+    query_params: dict = {
+        "sub_category_id": sub_category_id,
+        "service_status_id": service_status_id,
+        "total_price": total_price,
+        "freelancer_id": freelancer_id,
+        "tags": normalize_tags(tags),
+        "tags_match": tags_match,
+        "deleted": False,
+        "limit": limit
+    }
+    services = await ServicesLogic.search(db=db, search=q, query_params=query_params)
+    return Response(content=services, media_type="application/json")
+
+@router.get("/services/facets", tags=["services"])
+async def get_services_facets(
+        db: AsyncSession = Depends(get_read_sql_db),
+        sub_category_id: int | None = Query(None, description="Filter by sub_category_id"),
+        service_status_id: int | None = Query(None,
+                                            description="Filter by service_status_id (CANCELED = 0, DRAFT = 1, AVAILABLE = 2, CLOSED = 3)"),
+        tags: list[str] | None = Query(None, description="Filter by tags"),
+        tags_match: str = Query("any", pattern="^(any|all)$", description="Match any or all of the tags")
+):
+    query_params: dict = {
+        "sub_category_id": sub_category_id,
+        "service_status_id": service_status_id,
+        "tags": normalize_tags(tags),
+        "tags_match": tags_match
+    }
+    return await ServicesLogic.get_facets(db=db, query_params=query_params)
 
 @router.patch("/service", tags=["services"])
 async def update_service(
@@ -69,6 +126,14 @@ async def create_service(
 ):
     return await ServicesLogic.create(db=db, service_data=service_data, freelancer_id=freelancer_id)
 
+@router.post("/services:batch", tags=["services"])
+async def batch_services(
+        batch: BatchRequest,
+        freelancer_id: int = Query(..., description="Owner of the created services"),
+        db: AsyncSession = Depends(get_sql_db)
+):
+    return await ServicesLogic.batch(db=db, batch=batch, freelancer_id=freelancer_id)
+
 @router.delete("/service", tags=["services"])
 async def delete_service(
         service_id: int = Query(...),
@@ -6,11 +6,26 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from freelance_marketplace.api.services.redis import Redis
-from freelance_marketplace.api.utils.sql_util import soft_delete, build_transaction_query
+from freelance_marketplace.api.utils.loading_profiles import get_loading_options, get_embedded_tags
+from freelance_marketplace.api.utils.sql_util import soft_delete, apply_batch, fetch_page, parse_filters, \
+    fetch_search_page, fetch_facets, normalize_search, build_update, get_tag_dimensions, get_written_tag_dimensions, \
+    RANGE_OPERATORS, SET_OPERATORS
 from freelance_marketplace.models.enums.serviceStatus import ServiceStatus
+from freelance_marketplace.models.sql.request_model.BatchRequest import BatchRequest
 from freelance_marketplace.models.sql.request_model.ServiceRequest import ServiceRequest
-from freelance_marketplace.models.sql.sql_tables import Services
+from freelance_marketplace.models.sql.sql_tables import Services, SubCategory
 
+CACHE_TAG_COLUMNS = (Services.sub_category_id, Services.freelancer_id)
+
+# Filter DSL whitelists of get_all, backed by indexes
+FILTER_COLUMNS = {
+    Services.total_price: RANGE_OPERATORS,
+    Services.creation_date: RANGE_OPERATORS,
+    Services.service_status_id: SET_OPERATORS,
+    Services.sub_category_id: SET_OPERATORS,
+    Services.freelancer_id: SET_OPERATORS,
+}
+SORT_COLUMNS = (Services.creation_date, Services.total_price)
 
 class ServicesLogic:
 
@@ -21,21 +36,68 @@ class ServicesLogic:
             service_data: ServiceRequest
     ) -> bool:
         try:
-            await Services.create(db=db, freelancer_id=freelancer_id, **service_data.model_dump())
-            await Redis.invalidate_cache("services")
+            service = await Services.create(db=db, freelancer_id=freelancer_id, **service_data.model_dump())
+            await db.commit()
+            await Redis.invalidate_tags(prefix="services", dimensions=get_tag_dimensions(service, CACHE_TAG_COLUMNS))
             return True
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"{str(e)}")
 
 
+    @staticmethod
+    async def batch(
+            db: AsyncSession,
+            freelancer_id: int,
+            batch: BatchRequest
+    ) -> dict:
+        try:
+            report, rows = await apply_batch(
+                object=Services,
+                batch=batch,
+                model=ServiceRequest,
+                db=db,
+                returning=CACHE_TAG_COLUMNS,
+                defaults={"freelancer_id": freelancer_id},
+                references={"sub_category_id": SubCategory.sub_category_id}
+            )
+            await db.commit()
+        except HTTPException:
+            raise
+        except IntegrityError as e:
+            await db.rollback()
+            print(f"IntegrityError: {e}")
+            raise HTTPException(status_code=500, detail="Database integrity error.")
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=f"{str(e)}")
+
+        if rows:
+            await Redis.invalidate_batch_tags(
+                prefix="services",
+                dimensions=[dimensions for row in rows for dimensions in get_written_tag_dimensions(row, CACHE_TAG_COLUMNS)],
+                ids=[row[0] for row in rows]
+            )
+        return report
+
     @staticmethod
     async def delete(
             db: AsyncSession,
             service_id: int
     )-> bool:
-        result = await soft_delete(db=db, object=Services, attribute="service_id", object_id=service_id)
-        if result.rowcount > 0:
-            await Redis.invalidate_cache("services")
+        result = await soft_delete(
+            db=db,
+            object=Services,
+            attribute="service_id",
+            object_id=service_id,
+            returning=CACHE_TAG_COLUMNS
+        )
+        service = result.first()
+        if service:
+            await Redis.invalidate_tags(
+                prefix="services",
+                dimensions=get_tag_dimensions(service, CACHE_TAG_COLUMNS),
+                ids=[service_id]
+            )
             return True
         else:
             raise HTTPException(status_code=404, detail="Service not found or already deleted")
@@ -49,14 +111,20 @@ class ServicesLogic:
     ) -> bool:
         try:
             stmt = (
-                update(Services)
-                .where(Services.service_id == service_id)
+                build_update(object=Services, condition=Services.service_id == service_id, columns=CACHE_TAG_COLUMNS)
                 .values(**service_data.model_dump())
                 .execution_options(synchronize_session="fetch")
             )
-            await db.execute(stmt)
+            result = await db.execute(stmt)
+            service = result.first()
             await db.commit()
-            await Redis.invalidate_cache("services")
+            if service:
+                # Both the previous and the new dimensions when the service moved
+                await Redis.invalidate_batch_tags(
+                    prefix="services",
+                    dimensions=get_written_tag_dimensions(service, CACHE_TAG_COLUMNS),
+                    ids=[service_id]
+                )
             return True
 
         except IntegrityError as e:
@@ -79,11 +147,18 @@ class ServicesLogic:
                 update(Services)
                 .where(Services.service_id == service_id)
                 .values(service_status_id=service_status.value)
+                .returning(*CACHE_TAG_COLUMNS)
                 .execution_options(synchronize_session="fetch")
             )
-            await db.execute(stmt)
+            result = await db.execute(stmt)
+            service = result.first()
             await db.commit()
-            await Redis.invalidate_cache("services")
+            if service:
+                await Redis.invalidate_tags(
+                    prefix="services",
+                    dimensions=get_tag_dimensions(service, CACHE_TAG_COLUMNS),
+                    ids=[service_id]
+                )
             return True
 
         except IntegrityError as e:
@@ -104,7 +179,11 @@ class ServicesLogic:
         if redis_data:
             return redis_data
 
-        result = await db.execute(select(Services).where(Services.service_id == service_id))
+        result = await db.execute(
+            select(Services)
+            .where(Services.service_id == service_id)
+            .options(*get_loading_options("service_detail"))
+        )
         service = result.scalars().first()
         if not service:
             raise HTTPException(status_code=404, detail=f"Service not found")
@@ -114,23 +193,86 @@ class ServicesLogic:
     async def get_services(
             db: AsyncSession,
             query_params: dict
-    ) -> Sequence[Services]:
-        redis_data, cache_key = await Redis.get_redis_data(prefix="services", query_params=query_params)
-        if redis_data:
-            return redis_data
+    ) -> bytes:
+        query_params = parse_filters(query_params=query_params, filter_columns=FILTER_COLUMNS, sort_columns=SORT_COLUMNS)
 
-        transaction = await build_transaction_query(
-            object=Services,
-            query_params=query_params
+        async def load_services(session: AsyncSession) -> dict:
+            page = await fetch_page(object=Services, query_params=query_params, db=session, profile="service_card")
+            if not page["items"]:
+                raise HTTPException(status_code=404, detail=f"Services not found")
+            return page
+
+        return await Redis.get_or_load(
+            loader=load_services,
+            db=db,
+            prefix="services",
+            query_params=query_params,
+            tags=lambda page: Redis.generate_tags(
+                prefix="services",
+                dimensions={column.key: query_params.get(column.key) for column in CACHE_TAG_COLUMNS},
+                ids=[service.service_id for service in page["items"]]
+            ) + get_embedded_tags(profile="service_card", rows=page["items"]),
+            raw=True
         )
 
-        result = await db.execute(transaction)
-        services = result.scalars().all()
+    @staticmethod
+    async def search(
+            db: AsyncSession,
+            search: str,
+            query_params: dict
+    ) -> bytes:
+        """
+        Ranked full-text and fuzzy title search, cached per normalized search and filters.
+        """
+        search = normalize_search(search)
+        query_params = {**query_params, "search": search}
 
-        if not services:
-            raise HTTPException(status_code=404, detail=f"Services not found")
-        await Redis.set_redis_data(cache_key=cache_key, data=services)
-        return services
+        async def load_services(session: AsyncSession) -> dict:
+            return await fetch_search_page(
+                object=Services,
+                query_params=query_params,
+                search=search,
+                db=session,
+                profile="service_card"
+            )
+
+        return await Redis.get_or_load(
+            loader=load_services,
+            db=db,
+            prefix="services",
+            query_params=query_params,
+            tags=lambda page: Redis.generate_tags(
+                prefix="services",
+                dimensions={column.key: query_params.get(column.key) for column in CACHE_TAG_COLUMNS},
+                ids=[service.service_id for service in page["items"]]
+            ) + get_embedded_tags(profile="service_card", rows=page["items"]),
+            raw=True
+        )
+
+    @staticmethod
+    async def get_facets(
+            db: AsyncSession,
+            query_params: dict
+    ) -> dict:
+        async def load_facets(session: AsyncSession) -> dict:
+            return await fetch_facets(
+                object=Services,
+                status_column=Services.service_status_id,
+                query_params=query_params,
+                db=session
+            )
+
+        return await Redis.get_or_load(
+            loader=load_facets,
+            db=db,
+            prefix="services",
+            query_params={**query_params, "facets": True},
+            # Every count of a sub-category entry is within that sub-category (see fetch_facets)
+            tags=lambda _: Redis.generate_tags(
+                prefix="services",
+                dimensions={"sub_category_id": query_params.get("sub_category_id")}
+            )
+        )
 
 
     @staticmethod
@@ -1,31 +1,39 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from freelance_marketplace.api.routes.sub_categories.subCategoriesLogic import SubCategoriesLogic
-from freelance_marketplace.db.sql.database import get_sql_db
+from freelance_marketplace.db.sql.database import get_sql_db, get_read_sql_db
 from freelance_marketplace.models.sql.request_model.SubCategoryRequest import SubCategoryRequest
 
 router = APIRouter()
 
 @router.get("/sub-category", tags=["sub-categories"])
 async def get_sub_category(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         sub_category_id: int = Query(...)
 ):
     return await SubCategoriesLogic.get(db=db, sub_category_id=sub_category_id)
 
 @router.get("/sub-categories", tags=["sub-categories"])
 async def get_all(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         sub_category_name: str | None = Query(None, description="Filter by sub_category_name"),
         sub_category_description: str | None = Query(None, description="Filter by sub_category_description"),
         category_id: int | None = Query(None, description="Filter by category_id"),
-        deleted: bool | None = Query(False, description="Filter by deleted")
+        deleted: bool | None = Query(False, description="Filter by deleted"),
+        filters: list[str] | None = Query(None, alias="filter", description="Filter as column:operator:value[,value], operators eq, gt, gte, lt, lte, between, in"),
+        sort: str | None = Query(None, description="Comma separated sort columns, prefixed with - for descending"),
+        cursor: str | None = Query(None, description="Cursor of the next page, as returned in next_cursor"),
+        limit: int | None = Query(None, ge=1, description="Page size, capped to the max page size")
 ):
     query_params: dict = {
         'sub_category_name': sub_category_name,
         'sub_category_description': sub_category_description,
         "category_id": category_id,
-        "deleted": deleted
+        "deleted": deleted,
+        "filter": filters,
+        "sort": sort,
+        "cursor": cursor,
+        "limit": limit
     }
     return await SubCategoriesLogic.get_all(db=db, query_params=query_params)
 
@@ -1,15 +1,20 @@
-from typing import Sequence
-
 from fastapi import HTTPException
 from sqlalchemy import update, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from freelance_marketplace.api.services.redis import Redis
-from freelance_marketplace.api.utils.sql_util import soft_delete, build_transaction_query
+from freelance_marketplace.api.utils.sql_util import soft_delete, fetch_page, parse_filters, \
+    RANGE_OPERATORS, SET_OPERATORS
 from freelance_marketplace.models.sql.request_model.SubCategoryRequest import SubCategoryRequest
 from freelance_marketplace.models.sql.sql_tables import Category, SubCategory
 
+# Filter DSL whitelists of get_all, backed by indexes
+FILTER_COLUMNS = {
+    SubCategory.category_id: SET_OPERATORS,
+}
+SORT_COLUMNS = (SubCategory.creation_date,)
+
 
 class SubCategoriesLogic:
 
@@ -20,6 +25,7 @@ class SubCategoriesLogic:
     ) -> bool:
         try:
             await SubCategory.create(db=db, **sub_category_data.model_dump())
+            await db.commit()
             await Redis.invalidate_cache(prefix="subcategories")
             return True
         except Exception as e:
@@ -35,6 +41,7 @@ class SubCategoriesLogic:
             result = await soft_delete(db=db, object=Category, attribute="sub_category_id", object_id=sub_category_id)
             if result.rowcount > 0:
                 await Redis.invalidate_cache(prefix="subcategories")
+                await Redis.invalidate_tags(prefix="subcategories", ids=[sub_category_id])
                 return True
             else:
                 raise HTTPException(status_code=404, detail="Sub category not found or already deleted")
@@ -58,6 +65,8 @@ class SubCategoriesLogic:
             await db.execute(stmt)
             await db.commit()
             await Redis.invalidate_cache(prefix="subcategories")
+            # Cards embedding the sub-category
+            await Redis.invalidate_tags(prefix="subcategories", ids=[sub_category_id])
 
             return True
         except IntegrityError as e:
@@ -74,19 +83,21 @@ class SubCategoriesLogic:
             db: AsyncSession,
             sub_category_id: int
     ) -> SubCategory:
-        try:
-            redis_data, cache_key = await Redis.get_redis_data(match=f'subcategories:{sub_category_id}')
-            if redis_data:
-                return redis_data
-
-            result = await db.execute(select(SubCategory).where(SubCategory.sub_category_id == sub_category_id))
+        async def load_sub_category(session: AsyncSession) -> SubCategory:
+            result = await session.execute(select(SubCategory).where(SubCategory.sub_category_id == sub_category_id))
             sub_category = result.scalars().first()
             if not sub_category:
                 raise HTTPException(status_code=404, detail=f"Sub-Category not found")
-
-            await Redis.set_redis_data(cache_key, data=sub_category)
             return sub_category
 
+        try:
+            return await Redis.get_or_load(
+                loader=load_sub_category,
+                db=db,
+                match=f'subcategories:{sub_category_id}',
+                local=True
+            )
+
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"{str(e)}")
 
@@ -94,24 +105,23 @@ class SubCategoriesLogic:
     async def get_all(
             db: AsyncSession,
             query_params: dict
-    ) -> Sequence[SubCategory]:
-        try:
-            redis_data, cache_key = await Redis.get_redis_data(prefix='subcategories', query_params=query_params)
-            if redis_data:
-                return redis_data
+    ) -> dict:
+        query_params = parse_filters(query_params=query_params, filter_columns=FILTER_COLUMNS, sort_columns=SORT_COLUMNS)
 
-            transaction = await build_transaction_query(
-                object=SubCategory,
-                query_params=query_params
-            )
-
-            result = await db.execute(transaction)
-            sub_categories = result.scalars().all()
-            if not sub_categories:
+        async def load_sub_categories(session: AsyncSession) -> dict:
+            page = await fetch_page(object=SubCategory, query_params=query_params, db=session)
+            if not page["items"]:
                 raise HTTPException(status_code=404, detail=f"Sub-categories not found")
+            return page
 
-            await Redis.set_redis_data(cache_key, data=sub_categories)
-            return sub_categories
+        try:
+            return await Redis.get_or_load(
+                loader=load_sub_categories,
+                db=db,
+                prefix='subcategories',
+                query_params=query_params,
+                local=True
+            )
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"{str(e)}")
\ No newline at end of file
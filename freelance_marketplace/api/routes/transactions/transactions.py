@@ -2,14 +2,14 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from freelance_marketplace.api.routes.transactions.transactionsLogic import TransactionsLogic
-from freelance_marketplace.db.sql.database import get_sql_db
+from freelance_marketplace.db.sql.database import get_sql_db, get_read_sql_db
 from freelance_marketplace.models.sql.request_model.TransactionRequest import TransactionRequest
 
 router = APIRouter()
 
 @router.get("/transaction", tags=["transactions"])
 async def get_transaction(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         transaction_id: int | None = Query(None),
         milestone_id: int | None = Query(None)
 ):
@@ -21,20 +21,28 @@ async def get_transaction(
 
 @router.get("/transactions", tags=["transactions"])
 async def get_all_transactions(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         amount: float | None = Query(None, description="Filter by amount"),
         token_name: int | None = Query(None, description="Filter by token_name"),
         deleted: bool | None = Query(False, description="Filter by deleted"),
         receiver_address: str | None = Query(False, description="Filter by receiver_address"),
         client_id: int | None = Query(False, description="Filter by client_id"),
         freelancer_id: int | None = Query(False, description="Filter by freelancer_id"),
+        filters: list[str] | None = Query(None, alias="filter", description="Filter as column:operator:value[,value], operators eq, gt, gte, lt, lte, between, in"),
+        sort: str | None = Query(None, description="Comma separated sort columns, prefixed with - for descending"),
+        cursor: str | None = Query(None, description="Cursor of the next page, as returned in next_cursor"),
+        limit: int | None = Query(None, ge=1, description="Page size, capped to the max page size")
 ):
     query_params: dict = {
         'amount': amount,
         'receiver_address': receiver_address,
         'freelancer_id': freelancer_id,
         "client_id": client_id,
-        "deleted": deleted
+        "deleted": deleted,
+        "filter": filters,
+        "sort": sort,
+        "cursor": cursor,
+        "limit": limit
     }
     return await TransactionsLogic.get_all(db=db, query_params=query_params)
 
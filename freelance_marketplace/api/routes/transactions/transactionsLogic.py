@@ -1,14 +1,23 @@
-from typing import Sequence
 from fastapi import HTTPException
 from sqlalchemy import update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from freelance_marketplace.api.services.redis import Redis
-from freelance_marketplace.api.utils.sql_util import build_transaction_query, soft_delete
+from freelance_marketplace.api.utils.sql_util import build_transaction_query, fetch_page, parse_filters, soft_delete, \
+    RANGE_OPERATORS, SET_OPERATORS
 from freelance_marketplace.models.sql.request_model.TransactionRequest import TransactionRequest
 from freelance_marketplace.models.sql.sql_tables import Transaction
 
+# Filter DSL whitelists of get_all, backed by indexes
+FILTER_COLUMNS = {
+    Transaction.creation_date: RANGE_OPERATORS,
+    Transaction.milestone_id: SET_OPERATORS,
+    Transaction.client_id: SET_OPERATORS,
+    Transaction.freelancer_id: SET_OPERATORS,
+}
+SORT_COLUMNS = (Transaction.creation_date,)
+
 
 class TransactionsLogic:
 
@@ -20,6 +29,7 @@ class TransactionsLogic:
     ) -> bool:
         try:
             await Transaction.create(db=db, milestone_id=milestone_id, **transaction_data.model_dump())
+            await db.commit()
             await Redis.invalidate_cache("transactions")
             return True
         except Exception as e:
@@ -94,21 +104,16 @@ class TransactionsLogic:
     async def get_all(
             db: AsyncSession,
             query_params: dict
-    ) -> Sequence[Transaction]:
+    ) -> dict:
+        query_params = parse_filters(query_params=query_params, filter_columns=FILTER_COLUMNS, sort_columns=SORT_COLUMNS)
         redis_data, cache_key = await Redis.get_redis_data(prefix="transactions", query_params=query_params)
         if redis_data:
             return redis_data
 
-        transaction = await build_transaction_query(
-            object=Transaction,
-            query_params=query_params
-        )
-
-        result = await db.execute(transaction)
-        transactions = result.scalars().all()
-        if not transactions:
+        page = await fetch_page(object=Transaction, query_params=query_params, db=db)
+        if not page["items"]:
             raise HTTPException(status_code=404, detail=f"Transactions not found")
 
-        await Redis.set_redis_data(cache_key, data=transactions)
-        return transactions
+        await Redis.set_redis_data(cache_key, data=page)
+        return page
 
@@ -11,17 +11,14 @@ class UserRolesLogic:
 
     @staticmethod
     async def get_all(db: AsyncSession):
-        redis_data, cache_key = await Redis.get_redis_data(match=f"user_roles:all")
-        if redis_data:
-            return redis_data
-
-        result = await db.execute(select(Role))
-        roles = result.scalars().all()
-        if not roles:
-            raise HTTPException(status_code=404, detail="Roles not found")
-
-        await Redis.set_redis_data(cache_key, roles)
-        return roles
+        async def load_roles(session: AsyncSession):
+            result = await session.execute(select(Role))
+            roles = result.scalars().all()
+            if not roles:
+                raise HTTPException(status_code=404, detail="Roles not found")
+            return roles
+
+        return await Redis.get_or_load(loader=load_roles, db=db, match=f"user_roles:all", local=True)
 
 
     @staticmethod
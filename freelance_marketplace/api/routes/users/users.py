@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from freelance_marketplace.api.routes.users.users_logic import UsersLogic
-from freelance_marketplace.db.sql.database import get_sql_db
+from freelance_marketplace.db.sql.database import get_sql_db, get_read_sql_db
 from freelance_marketplace.models.sql.request_model.UserRequest import UserRequest
 
 router = APIRouter()
@@ -34,7 +34,7 @@ async def update_user(
 @router.get("/user", tags=["users"])
 async def get_user(
         user_id: int = Query(...),
-        db: AsyncSession = Depends(get_sql_db)
+        db: AsyncSession = Depends(get_read_sql_db)
 ):
     return await UsersLogic.get_user(
         db=db,
@@ -43,12 +43,16 @@ async def get_user(
 
 @router.get("/users", tags=["users"])
 async def get_all(
-        db: AsyncSession = Depends(get_sql_db),
+        db: AsyncSession = Depends(get_read_sql_db),
         active: bool | None = Query(None, description="Filter by active"),
         deleted: bool | None = Query(None, description="Filter by deleted"),
         wallet_public_address: str | None = Query(None, description="Filter by wallet_public_address"),
         wallet_type_id: int | None = Query(None, description="Filter by wallet_type_id"),
-        role_id: int | None = Query(None, description="Filter by role_id")
+        role_id: int | None = Query(None, description="Filter by role_id"),
+        filters: list[str] | None = Query(None, alias="filter", description="Filter as column:operator:value[,value], operators eq, gt, gte, lt, lte, between, in"),
+        sort: str | None = Query(None, description="Comma separated sort columns, prefixed with - for descending"),
+        cursor: str | None = Query(None, description="Cursor of the next page, as returned in next_cursor"),
+        limit: int | None = Query(None, ge=1, description="Page size, capped to the max page size")
 ):
 
     ## TODO IMPROVE QUERY PARAMS TO QUERY BY USER PROFILE PROPERTIES, LIKE NAME ETC..
@@ -57,6 +61,10 @@ async def get_all(
         'deleted': deleted,
         "wallet_public_address": wallet_public_address,
         "wallet_type_id": wallet_type_id,
-        "role_id": role_id
+        "role_id": role_id,
+        "filter": filters,
+        "sort": sort,
+        "cursor": cursor,
+        "limit": limit
     }
     return await UsersLogic.get_all(db=db, query_params=query_params)
\ No newline at end of file
@@ -1,14 +1,22 @@
-from typing import Sequence
 from fastapi import HTTPException
 from sqlalchemy import update, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from freelance_marketplace.api.services.redis import Redis
-from freelance_marketplace.api.utils.sql_util import soft_delete, build_transaction_query
+from freelance_marketplace.api.utils.sql_util import soft_delete, fetch_page, parse_filters, \
+    RANGE_OPERATORS, SET_OPERATORS
 from freelance_marketplace.models.sql.request_model.UserRequest import UserRequest
 from freelance_marketplace.models.sql.sql_tables import User
 
+# Filter DSL whitelists of get_all, backed by indexes
+FILTER_COLUMNS = {
+    User.creation_date: RANGE_OPERATORS,
+    User.role_id: SET_OPERATORS,
+    User.wallet_type_id: SET_OPERATORS,
+}
+SORT_COLUMNS = (User.creation_date,)
+
 
 class UsersLogic:
     @staticmethod
@@ -18,6 +26,7 @@ class UsersLogic:
     ) -> bool:
         try:
             await User.create(db=db, **user.model_dump())
+            await db.commit()
             await Redis.invalidate_cache("users")
             return True
         except Exception as e:
@@ -31,6 +40,7 @@ class UsersLogic:
         result = await soft_delete(db=db, object=User, attribute="user_id", object_id=user_id)
         if result.rowcount > 0:
             await Redis.invalidate_cache("users")
+            await Redis.invalidate_tags(prefix="users", ids=[user_id])
             return True
         else:
             raise HTTPException(status_code=404, detail="User not found or already deleted")
@@ -52,6 +62,8 @@ class UsersLogic:
             await db.execute(stmt)
             await db.commit()
             await Redis.invalidate_cache("users")
+            # Cards and details embedding the user
+            await Redis.invalidate_tags(prefix="users", ids=[user_id])
             return True
         except IntegrityError as e:
             await db.rollback()
@@ -65,23 +77,17 @@ class UsersLogic:
     async def get_all(
             db: AsyncSession,
             query_params: dict
-    ) -> Sequence[User]:
+    ) -> dict:
+        query_params = parse_filters(query_params=query_params, filter_columns=FILTER_COLUMNS, sort_columns=SORT_COLUMNS)
         redis_data, cache_key = await Redis.get_redis_data(prefix="users", query_params=query_params)
         if redis_data:
             return redis_data
 
-        transaction = await build_transaction_query(
-            object=User,
-            query_params=query_params
-        )
-
-        result = await db.execute(transaction)
-        users = result.scalars().all()
-
-        if not users:
+        page = await fetch_page(object=User, query_params=query_params, db=db)
+        if not page["items"]:
             raise HTTPException(status_code=404, detail="Users not found")
-        await Redis.set_redis_data(cache_key=cache_key, data=users)
-        return users
+        await Redis.set_redis_data(cache_key=cache_key, data=page)
+        return page
 
     @staticmethod
     async def get_user(
@@ -5,8 +5,6 @@ from datetime import datetime, timedelta
 from hashlib import sha256
 import jwt
 from fastapi import Response, HTTPException
-from nacl.exceptions import BadSignatureError
-from pycardano.cip import cip8
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
@@ -36,7 +34,7 @@ class Authentication:
         token = request.cookies.get("access_token")
         if token:
             session_id = hashlib.sha256(token.encode()).hexdigest()
-            await Redis.invalidate_cache(f"sessions:{session_id}")
+            await Redis.delete_cache(f"sessions:{session_id}")
         response.delete_cookie("access_token")
         return True
 
@@ -60,6 +58,10 @@ class Authentication:
 
     @classmethod
     async def verify_signature(cls, login_request: LoginRequest):
+        # pycardano is imported on first login rather than with the app
+        from nacl.exceptions import BadSignatureError
+        from pycardano.cip import cip8
+
         try:
             signed_message = {
                 "signature": login_request.signature,
@@ -1,6 +1,7 @@
 from fastapi import HTTPException
 from pycardano import Transaction
 import requests
+from freelance_marketplace.api.services.chain_executor import chain_executor
 from freelance_marketplace.core.config import settings
 
 
@@ -17,13 +18,19 @@ class SubmitAPI:
 
     async def submit_transaction(self, tx: Transaction) -> bool:
         try:
-            if not self.__is_transaction_signed(tx=tx):
+            if not await self.__is_transaction_signed(tx=tx):
                 raise HTTPException(500, "Transaction was not signed.")
 
             tx_bytes: bytes = tx.to_cbor()
             headers = {"Content-Type": "application/cbor"}
             endpoint = self.submit_api_url + "/api/submit/tx"
-            response = requests.post(endpoint, data=tx_bytes, headers=headers)
+            response = await chain_executor.run(
+                requests.post,
+                endpoint,
+                data=tx_bytes,
+                headers=headers,
+                timeout=settings.ogmios.request_timeout
+            )
 
             if response.status_code != 200:
                 raise HTTPException(500, "Failed to submit transaction")
@@ -0,0 +1,195 @@
+import socket
+import threading
+import time
+from typing import List, Callable, Any, Dict, Union
+
+from ogmios.client import Client as OgmiosClient
+from ogmios.datatypes import Address as OgmiosAddress, TxOutputReference
+from ogmios.utils import GenesisParameters, get_current_era
+from pycardano import OgmiosChainContext, UTxO, ExecutionUnits, ProtocolParameters
+from websockets.exceptions import ConnectionClosed
+
+from freelance_marketplace.api.services.chain_executor import chain_executor
+from freelance_marketplace.core.config import settings
+
+
+class ManagedChainContext(OgmiosChainContext):
+    """
+    OgmiosChainContext shared by the whole process, see get_chain_context.
+
+    OgmiosChainContext opens a websocket per query and refetches the protocol parameters and genesis
+    whenever the tip moves. This one keeps a connection per thread (the chain executor threads, so at most
+    executor_workers connections), reused across calls, and keeps the parameters until the epoch changes
+    (they only change at epoch boundaries).
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Guards the connections, the caches and the parameters, never held across a query
+        self.__lock = threading.RLock()
+        self.__param_lock = threading.RLock()
+        self.__clients: dict[int, OgmiosClient] = {}
+        self.__aborted: set[int] = set()
+        self.__epoch: int | None = None
+        self.__epoch_checked = 0.0
+
+    async def call(self, function: Callable, *args, abortable: bool = True, **kwargs) -> Any:
+        """
+        Runs a synchronous method of the context (or anything using it, e.g. TransactionBuilder.build)
+        on the chain executor. When it times out the connection of its thread is shut down, unless it is
+        not abortable (a submission, which may have reached the node).
+        """
+        return await chain_executor.run(self.__run, function, args, kwargs, abort=self.abort if abortable else None)
+
+    def __run(self, function: Callable, args: tuple, kwargs: dict) -> Any:
+        with self.__lock:
+            # A previous call of this thread was aborted after its last query, its connection is dead
+            if threading.get_ident() in self.__aborted:
+                self.__aborted.discard(threading.get_ident())
+                self.__drop(threading.get_ident())
+        return function(*args, **kwargs)
+
+    def __execute(self, query: Callable[[OgmiosClient], Any], retry: bool = True) -> Any:
+        thread_id = threading.get_ident()
+        try:
+            return query(self.__connect())
+        except (ConnectionClosed, OSError):
+            # Ogmios restarted or dropped the idle connection, reconnect once (unless aborted)
+            with self.__lock:
+                aborted = thread_id in self.__aborted
+                self.__aborted.discard(thread_id)
+                self.__drop(thread_id)
+            if not retry or aborted:
+                raise
+        return query(self.__connect())
+
+    def __connect(self) -> OgmiosClient:
+        thread_id = threading.get_ident()
+        client = self.__clients.get(thread_id)
+        if client is None:
+            client = OgmiosClient(self.host, self.port, self.path, self.secure)
+            with self.__lock:
+                self.__clients[thread_id] = client
+        return client
+
+    def __drop(self, thread_id: int):
+        client = self.__clients.pop(thread_id, None)
+        if client is not None:
+            try:
+                client.connection.close()
+            except Exception:
+                pass
+
+    def abort(self, thread_id: int):
+        """
+        Unblocks a call of the given thread stuck past its timeout by shutting down the socket of that
+        thread's connection, the connections of the other threads are untouched.
+        """
+        with self.__lock:
+            client = self.__clients.get(thread_id)
+            if client is not None:
+                self.__aborted.add(thread_id)
+                client.connection.socket.shutdown(socket.SHUT_RDWR)
+
+    def close(self):
+        with self.__lock:
+            for thread_id in list(self.__clients):
+                self.__drop(thread_id)
+
+    def __refresh_epoch(self):
+        if time.monotonic() - self.__epoch_checked < settings.ogmios.epoch_check_interval:
+            return
+        epoch = self._query_current_epoch()
+        self.__epoch_checked = time.monotonic()
+        if epoch != self.__epoch:
+            self.__epoch = epoch
+            self._protocol_param = None
+            self._genesis_param = None
+
+    @property
+    def protocol_param(self) -> ProtocolParameters:
+        with self.__param_lock:
+            self.__refresh_epoch()
+            if self._protocol_param is None:
+                # Still opens its own connection, once per epoch
+                self._protocol_param = self._fetch_protocol_param()
+            return self._protocol_param
+
+    @property
+    def genesis_param(self) -> GenesisParameters:
+        with self.__param_lock:
+            self.__refresh_epoch()
+            if self._genesis_param is None:
+                self._genesis_param = self._fetch_genesis_param()
+            return self._genesis_param
+
+    def _fetch_genesis_param(self) -> GenesisParameters:
+        return self.__execute(lambda client: GenesisParameters(client, get_current_era(client)))
+
+    def _query_current_era(self):
+        return self.__execute(get_current_era)
+
+    def _query_current_epoch(self) -> int:
+        return self.__execute(lambda client: client.query_epoch.execute()[0])
+
+    def _query_chain_tip(self):
+        return self.__execute(lambda client: client.query_network_tip.execute()[0])
+
+    def _query_utxos_by_address(self, address: OgmiosAddress) -> list:
+        return self.__execute(lambda client: client.query_utxo.execute([address])[0])
+
+    def _query_utxos_by_tx_id(self, tx_id: str, index: int) -> list:
+        return self.__execute(lambda client: client.query_utxo.execute([TxOutputReference(tx_id, index)])[0])
+
+    def _utxos(self, address: str) -> List[UTxO]:
+        # The UTxO cache is not thread safe, the query runs outside its lock
+        key = (self.last_block_slot, address)
+        with self.__lock:
+            if key in self._utxo_cache:
+                return self._utxo_cache[key]
+        utxos = self._utxos_ogmios(OgmiosAddress(address=address))
+        with self.__lock:
+            self._utxo_cache[key] = utxos
+        return utxos
+
+    def submit_tx_cbor(self, cbor: Union[bytes, str]):
+        if isinstance(cbor, bytes):
+            cbor = cbor.hex()
+        # Never resubmitted on a dropped connection, the first attempt may have reached the node
+        self.__execute(lambda client: client.submit_transaction.execute(cbor), retry=False)
+
+    def evaluate_tx_cbor(self, cbor: Union[bytes, str]) -> Dict[str, ExecutionUnits]:
+        if isinstance(cbor, bytes):
+            cbor = cbor.hex()
+        result, _ = self.__execute(lambda client: client.evaluate_transaction.execute(cbor))
+        execution_units = {}
+        for item in result:
+            purpose = item["validator"]["purpose"]
+            # Renamed in recent Ogmios versions
+            if purpose == "withdraw":
+                purpose = "withdrawal"
+            execution_units[f"{purpose}:{item['validator']['index']}"] = ExecutionUnits(
+                mem=item["budget"]["memory"],
+                steps=item["budget"]["cpu"]
+            )
+        return execution_units
+
+
+_chain_context: ManagedChainContext | None = None
+_chain_context_lock = threading.Lock()
+
+
+def get_chain_context() -> ManagedChainContext:
+    """
+    The chain context of this process, created on first use.
+    """
+    global _chain_context
+    if _chain_context is None:
+        with _chain_context_lock:
+            if _chain_context is None:
+                _chain_context = ManagedChainContext(
+                    host=settings.ogmios.host,
+                    port=settings.ogmios.port,
+                    network=settings.blockchain.cardano_network
+                )
+    return _chain_context
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Any, Optional
+
+from fastapi import HTTPException
+
+from freelance_marketplace.core.config import settings
+
+
+class ChainCall:
+    """
+    State of a call submitted to the executor, shared by the event loop and the thread running it.
+    """
+
+    QUEUED, RUNNING, DONE, CANCELLED = "queued", "running", "done", "cancelled"
+
+    def __init__(self):
+        self.state = ChainCall.QUEUED
+        self.thread_id: Optional[int] = None
+        self.start: Optional[float] = None
+
+
+class ChainExecutor:
+    """
+    Bounded thread pool running the synchronous chain calls (pycardano, Ogmios, the submit API) off the
+    event loop, each with a timeout.
+
+    The timeout is counted twice: a call waits at most `timeout` for a thread, and once a thread picked it
+    up it has `timeout` to complete. A call whose caller gives up (queue timeout or cancelled request)
+    before a thread picked it up never runs. A running call cannot be interrupted: on timeout
+    abort(thread_id) is called with the thread still running that same call, to unblock it (e.g. shutting
+    down the connection of that thread). Calls without abort (submissions) run to completion.
+    """
+
+    def __init__(self, max_workers: int, timeout: float):
+        self.timeout = timeout
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chain")
+        self.__lock = threading.Lock()
+        self.max_workers = max_workers
+        self.calls = 0
+        self.timeouts = 0
+        self.queue_timeouts = 0
+        self.aborts = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    async def run(self, function: Callable, *args, abort: Optional[Callable[[int], Any]] = None, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        call = ChainCall()
+        started = loop.create_future()
+        start = time.perf_counter()
+        self.in_flight += 1
+        try:
+            future = loop.run_in_executor(self.__executor, self.__invoke, call, loop, started, function, args, kwargs)
+            await self.__wait_started(call, started)
+            # From the moment the call got its thread (and the connection of that thread)
+            remaining = call.start + self.timeout - time.perf_counter()
+            try:
+                return await asyncio.wait_for(future, max(remaining, 0))
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                if abort is not None:
+                    self.__abort(call, abort)
+                raise HTTPException(status_code=504, detail="Chain request timed out")
+        except HTTPException:
+            raise
+        except asyncio.CancelledError:
+            with self.__lock:
+                if call.state == ChainCall.QUEUED:
+                    call.state = ChainCall.CANCELLED
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.in_flight -= 1
+            self.calls += 1
+            self.total_time += elapsed
+            self.max_time = max(self.max_time, elapsed)
+
+    async def __wait_started(self, call: ChainCall, started: asyncio.Future):
+        try:
+            await asyncio.wait_for(asyncio.shield(started), self.timeout)
+        except asyncio.TimeoutError:
+            with self.__lock:
+                if call.state == ChainCall.QUEUED:
+                    call.state = ChainCall.CANCELLED
+                    self.queue_timeouts += 1
+                    raise HTTPException(status_code=504, detail="Chain executor busy")
+            # Picked up right at the deadline
+            await started
+
+    def __invoke(self, call: ChainCall, loop: asyncio.AbstractEventLoop, started: asyncio.Future, function: Callable, args: tuple, kwargs: dict) -> Any:
+        with self.__lock:
+            if call.state == ChainCall.CANCELLED:
+                return None
+            call.state = ChainCall.RUNNING
+            call.thread_id = threading.get_ident()
+            call.start = time.perf_counter()
+        loop.call_soon_threadsafe(lambda: started.done() or started.set_result(None))
+        try:
+            return function(*args, **kwargs)
+        finally:
+            with self.__lock:
+                call.state = ChainCall.DONE
+
+    def __abort(self, call: ChainCall, abort: Callable[[int], Any]):
+        # Under the lock the call cannot complete, abort never reaches the next call of the thread
+        with self.__lock:
+            if call.state != ChainCall.RUNNING:
+                return
+            self.aborts += 1
+            try:
+                abort(call.thread_id)
+            except Exception as e:
+                print(f"Chain call abort failed: {e}")
+
+    def snapshot(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "timeout_s": self.timeout,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "queue_timeouts": self.queue_timeouts,
+            "aborts": self.aborts,
+            "errors": self.errors,
+            "avg_ms": round(self.total_time / self.calls * 1000, 3) if self.calls else None,
+            "max_ms": round(self.max_time * 1000, 3),
+        }
+
+
+chain_executor = ChainExecutor(max_workers=settings.ogmios.executor_workers, timeout=settings.ogmios.request_timeout)
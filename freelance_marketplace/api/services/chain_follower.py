@@ -0,0 +1,315 @@
+"""
+Follows the chain through Ogmios' chain-sync protocol and keeps the chain tables up to date: tracked
+PendingTransaction rows are confirmed or failed, outputs at Script addresses are indexed and marked spent
+when consumed, and rollbacks undo what the rolled back blocks did. Each block is applied in one
+transaction together with its checkpoint, so a restarted follower resumes where it stopped. Without a
+checkpoint the script addresses are first backfilled from a UTxO query, then followed from the tip
+observed before that query.
+
+    poetry run python -m freelance_marketplace.api.services.chain_follower follow
+    poetry run python -m freelance_marketplace.api.services.chain_follower follow --record blocks.jsonl
+    poetry run python -m freelance_marketplace.api.services.chain_follower replay blocks.jsonl
+"""
+import argparse
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import websockets
+from sqlalchemy import select, update, delete, tuple_
+from sqlalchemy.dialects.postgresql import insert as p_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from freelance_marketplace.api.services.chain_context import ManagedChainContext, get_chain_context
+from freelance_marketplace.api.services.chain_indexer import ChainIndexer
+from freelance_marketplace.api.services.script_registry import ScriptRegistry
+from freelance_marketplace.core.config import settings
+from freelance_marketplace.db.sql.database import AsyncSessionLocal
+from freelance_marketplace.models.sql.sql_tables import Script, Utxo, PendingTransaction, ChainCheckpoint
+
+FOLLOWER_NAME = "script_follower"
+NEXT_BLOCK = json.dumps({"jsonrpc": "2.0", "method": "nextBlock"})
+
+
+class OgmiosChainSync:
+    """
+    Chain-sync client on its own websocket, yields the nextBlock results from the first of the points
+    found on chain (the tip when there are none). nextBlock requests are pipelined, Ogmios answers in order.
+    """
+
+    def __init__(self, record: Optional[Path] = None):
+        self.url = f"ws://{settings.ogmios.host}:{settings.ogmios.port}"
+        self.record = record
+
+    async def tip(self) -> Optional[dict]:
+        async with websockets.connect(self.url, max_size=None) as websocket:
+            tip = await self.__request(websocket, "queryNetwork/tip")
+            return {"slot": tip["slot"], "id": tip["id"]}
+
+    async def follow(self, points: list[dict]) -> AsyncIterator[dict]:
+        async with websockets.connect(self.url, max_size=None) as websocket:
+            if not points:
+                points = [await self.tip()]
+            await self.__request(websocket, "findIntersection", {"points": points})
+
+            for _ in range(settings.chain_sync.pipeline):
+                await websocket.send(NEXT_BLOCK)
+            async for message in websocket:
+                await websocket.send(NEXT_BLOCK)
+                if self.record:
+                    with open(self.record, "a") as file:
+                        file.write(message.strip() + "\n")
+                yield json.loads(message)["result"]
+
+    @staticmethod
+    async def __request(websocket, method: str, params: Optional[dict] = None) -> dict:
+        await websocket.send(json.dumps({"jsonrpc": "2.0", "method": method, "params": params or {}}))
+        response = json.loads(await websocket.recv())
+        if "error" in response:
+            raise RuntimeError(f"Ogmios {method} failed: {response['error']}")
+        return response["result"]
+
+
+class FixtureChainSync:
+    """
+    Replays nextBlock responses recorded by OgmiosChainSync (one JSON-RPC response per line), to run the
+    follower against a known block stream without a node.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    async def tip(self) -> Optional[dict]:
+        # The recording starts at the point it was recorded from, nothing to backfill
+        return None
+
+    async def follow(self, points: list[dict]) -> AsyncIterator[dict]:
+        with open(self.path) as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)["result"]
+
+
+class ChainFollower:
+    def __init__(self, source, name: str = FOLLOWER_NAME, context: Optional[ManagedChainContext] = None):
+        self.source = source
+        self.name = name
+        self.context = context
+
+    async def run(self):
+        async with AsyncSessionLocal() as session:
+            # Outputs are only tracked at the addresses of the scripts table
+            for name in ScriptRegistry.SCRIPTS:
+                await ScriptRegistry.register(session, name)
+            await session.commit()
+            points = await self.get_checkpoints(session)
+            if not points:
+                points = await self.backfill(session)
+
+        async for result in self.source.follow(points):
+            async with AsyncSessionLocal() as session:
+                if result["direction"] == "forward":
+                    await self.roll_forward(session, result["block"])
+                else:
+                    await self.roll_backward(session, result["point"])
+                await session.commit()
+
+    async def get_checkpoints(self, session: AsyncSession) -> list[dict]:
+        result = await session.execute(
+            select(ChainCheckpoint.slot, ChainCheckpoint.block_hash)
+            .where(ChainCheckpoint.name == self.name)
+            .order_by(ChainCheckpoint.slot.desc())
+            .limit(settings.chain_sync.checkpoint_depth)
+        )
+        return [{"slot": row.slot, "id": row.block_hash} for row in result]
+
+    async def backfill(self, session: AsyncSession) -> list[dict]:
+        """
+        Indexes the outputs already at the script addresses when the follower first runs, and confirms the
+        pending transactions that created them. The tip is taken before the UTxO query, blocks between the
+        two are replayed on top (outputs are inserted once, spends marked again). Commits.
+        """
+        tip = await self.source.tip()
+        if tip is None:
+            return []
+
+        context = self.context or get_chain_context()
+        for name in ScriptRegistry.SCRIPTS:
+            await ChainIndexer.sync_script(session, context, ScriptRegistry.get(name).address())
+
+        now = datetime.now(timezone.utc)
+        await session.execute(
+            update(PendingTransaction)
+            .where(
+                PendingTransaction.status == "pending",
+                PendingTransaction.tx_hash.in_(select(Utxo.tx_hash))
+            )
+            .values(status="confirmed", confirmation_date=now, confirmation_slot=tip["slot"], last_poll_date=now)
+        )
+        await self.save_checkpoint(session, tip["slot"], tip["id"])
+        await session.commit()
+        return [tip]
+
+    async def roll_forward(self, session: AsyncSession, block: dict):
+        slot = block.get("slot")
+        if slot is None:
+            # Epoch boundary blocks have no slot and no transactions
+            return
+        now = datetime.now(timezone.utc)
+        if block.get("transactions"):
+            await self.apply_transactions(session, block["transactions"], slot, now)
+        await self.expire_pending(session, now)
+        await self.save_checkpoint(session, slot, block["id"])
+
+    async def apply_transactions(self, session: AsyncSession, transactions: list[dict], slot: int, now: datetime):
+        result = await session.execute(
+            select(PendingTransaction.tx_hash, PendingTransaction.milestone_id)
+            .where(PendingTransaction.tx_hash.in_([tx["id"] for tx in transactions]))
+        )
+        tracked = {row.tx_hash: row.milestone_id for row in result}
+
+        # A transaction failing phase-2 validation only consumes its collateral
+        valid = [tx for tx in transactions if tx.get("spends", "inputs") == "inputs"]
+        confirmed = [tx["id"] for tx in valid if tx["id"] in tracked]
+        failed = [tx["id"] for tx in transactions if tx.get("spends") == "collaterals" and tx["id"] in tracked]
+        if confirmed:
+            await session.execute(
+                update(PendingTransaction)
+                .where(PendingTransaction.tx_hash.in_(confirmed))
+                .values(status="confirmed", confirmation_date=now, confirmation_slot=slot, last_poll_date=now, failure_reason=None)
+            )
+        if failed:
+            await session.execute(
+                update(PendingTransaction)
+                .where(PendingTransaction.tx_hash.in_(failed))
+                .values(status="failed", confirmation_slot=slot, last_poll_date=now, failure_reason="Script validation failed, the collateral was consumed")
+            )
+
+        # Outputs first, a later transaction of the block may spend them
+        scripts = await self.get_scripts(session)
+        rows = [
+            self.to_row(scripts[output["address"]], tx["id"], index, output, tracked.get(tx["id"]), slot, now)
+            for tx in valid
+            for index, output in enumerate(tx["outputs"])
+            if output["address"] in scripts
+        ]
+        for start in range(0, len(rows), settings.sql.max_batch_size):
+            await session.execute(
+                p_insert(Utxo)
+                .values(rows[start:start + settings.sql.max_batch_size])
+                .on_conflict_do_nothing(index_elements=["tx_hash", "tx_index"])
+            )
+
+        inputs = [(spent["transaction"]["id"], spent["index"]) for tx in valid for spent in tx["inputs"]]
+        for start in range(0, len(inputs), settings.sql.max_batch_size):
+            await session.execute(
+                update(Utxo)
+                .where(
+                    tuple_(Utxo.tx_hash, Utxo.tx_index).in_(inputs[start:start + settings.sql.max_batch_size]),
+                    Utxo.spent == False
+                )
+                .values(spent=True, spent_date=now, spent_slot=slot)
+            )
+
+    @staticmethod
+    async def get_scripts(session: AsyncSession) -> dict[str, int]:
+        result = await session.execute(select(Script.address, Script.script_id))
+        return {row.address: row.script_id for row in result}
+
+    @staticmethod
+    def to_row(script_id: int, tx_hash: str, index: int, output: dict, milestone_id: Optional[int], slot: int, now: datetime) -> dict:
+        value = output["value"]
+        token_unit, token_quantity = None, None
+        multi_asset = [(policy, tokens) for policy, tokens in value.items() if policy != "ada"]
+        if multi_asset:
+            # The contract locks at most one token, the column pair holds the first one
+            policy, tokens = multi_asset[0]
+            asset_name, token_quantity = next(iter(tokens.items()))
+            token_unit = policy + asset_name
+
+        return {
+            "script_id": script_id,
+            "tx_hash": tx_hash,
+            "tx_index": index,
+            "datum": output.get("datum"),
+            "value_lovelace": value["ada"]["lovelace"],
+            "token_unit": token_unit,
+            "token_quantity": token_quantity,
+            "milestone_id": milestone_id,
+            "creation_date": now,
+            "created_slot": slot,
+            "spent": False,
+        }
+
+    @staticmethod
+    async def expire_pending(session: AsyncSession, now: datetime):
+        await session.execute(
+            update(PendingTransaction)
+            .where(
+                PendingTransaction.status == "pending",
+                PendingTransaction.submission_date < now - timedelta(seconds=settings.chain_sync.pending_timeout)
+            )
+            .values(status="timeout", last_poll_date=now)
+        )
+
+    async def roll_backward(self, session: AsyncSession, point):
+        # "origin" or {"slot", "id"}: everything after the point is undone
+        slot = point["slot"] if isinstance(point, dict) else -1
+        await session.execute(delete(Utxo).where(Utxo.created_slot > slot))
+        await session.execute(
+            update(Utxo)
+            .where(Utxo.spent_slot > slot)
+            .values(spent=False, spent_date=None, spent_slot=None)
+        )
+        await session.execute(
+            update(PendingTransaction)
+            .where(PendingTransaction.confirmation_slot > slot)
+            .values(status="pending", confirmation_date=None, confirmation_slot=None, failure_reason=None)
+        )
+        await session.execute(
+            delete(ChainCheckpoint).where(ChainCheckpoint.name == self.name, ChainCheckpoint.slot > slot)
+        )
+
+    async def save_checkpoint(self, session: AsyncSession, slot: int, block_hash: str):
+        await session.execute(
+            p_insert(ChainCheckpoint)
+            .values(name=self.name, slot=slot, block_hash=block_hash)
+            .on_conflict_do_update(index_elements=["name", "slot"], set_={"block_hash": block_hash})
+        )
+        recent = (
+            select(ChainCheckpoint.slot)
+            .where(ChainCheckpoint.name == self.name)
+            .order_by(ChainCheckpoint.slot.desc())
+            .limit(settings.chain_sync.checkpoint_depth)
+        )
+        await session.execute(
+            delete(ChainCheckpoint).where(ChainCheckpoint.name == self.name, ChainCheckpoint.slot.not_in(recent))
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Chain follower")
+    parser.add_argument("command", choices=("follow", "replay"))
+    parser.add_argument("path", nargs="?", type=Path, help="replay: recorded nextBlock responses")
+    parser.add_argument("--record", type=Path, help="follow: also append the nextBlock responses to this file")
+    args = parser.parse_args()
+
+    if args.command == "replay":
+        if args.path is None:
+            parser.error("replay needs the path of a recorded block stream")
+        await ChainFollower(FixtureChainSync(args.path)).run()
+        return
+
+    follower = ChainFollower(OgmiosChainSync(record=args.record))
+    while True:
+        try:
+            await follower.run()
+        except (OSError, websockets.ConnectionClosed) as e:
+            print(f"Chain sync interrupted: {e}")
+        await asyncio.sleep(settings.chain_sync.reconnect_delay)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,254 @@
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from pycardano import Address, UTxO, RawCBOR
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as p_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from freelance_marketplace.api.services.chain_context import ManagedChainContext
+from freelance_marketplace.core.config import settings
+from freelance_marketplace.models.sql.sql_tables import Script, Utxo, PendingTransaction
+
+SCRIPT_NAME = "milestone_script"
+
+# TransactionOrchestrator actions and the PendingTransaction action_type they are recorded as
+ACTION_TYPES = {
+    "create_milestone": "milestone_creation",
+    "approve_milestone": "milestone_approval",
+    "redeem_milestone": "milestone_payment",
+    "refund_milestone": "milestone_payment",
+}
+
+
+class ChainIndexer:
+    """
+    Mirrors the unspent outputs of a script address into the utxos table, so the output of a milestone is
+    an indexed lookup on (milestone_id, spent = false) instead of a scan of every contract at the address.
+
+    The datum does not carry the milestone, an output belongs to the milestone of the PendingTransaction
+    that created it, recorded by record_submission before the transaction is submitted.
+    """
+
+    # Last full reconcile of each script address in this worker (monotonic seconds)
+    __last_sync: dict[str, float] = {}
+
+    @staticmethod
+    async def record_submission(
+            db: AsyncSession,
+            tx_hash: str,
+            milestone_id: int,
+            action: str,
+            script_address: Address
+    ):
+        """
+        Records a transaction of a milestone as pending, linking its script outputs to the milestone.
+        Recorded before submitting, a block may confirm the transaction before the submit call returns.
+        Does not commit.
+        """
+        await db.execute(
+            p_insert(PendingTransaction)
+            .values(
+                tx_hash=tx_hash,
+                milestone_id=milestone_id,
+                action_type=ACTION_TYPES[action],
+                status="pending",
+                submission_date=datetime.now(timezone.utc),
+                script_id=await ChainIndexer.get_script_id(db, script_address)
+            )
+            .on_conflict_do_nothing(index_elements=["tx_hash"])
+        )
+
+    @staticmethod
+    async def record_failure(db: AsyncSession, tx_hash: str, reason: str):
+        """
+        Marks a recorded transaction the node rejected as failed. Does not commit.
+        """
+        await db.execute(
+            update(PendingTransaction)
+            .where(PendingTransaction.tx_hash == tx_hash, PendingTransaction.status == "pending")
+            .values(status="failed", failure_reason=reason, last_poll_date=datetime.now(timezone.utc))
+        )
+
+    @staticmethod
+    async def get_script_id(db: AsyncSession, script_address: Address) -> int:
+        address = str(script_address)
+        result = await db.execute(select(Script.script_id).where(Script.address == address))
+        script_id = result.scalar_one_or_none()
+        if script_id is None:
+            # No-op update so concurrent workers all get the id back
+            result = await db.execute(
+                p_insert(Script)
+                .values(name=SCRIPT_NAME, address=address)
+                .on_conflict_do_update(index_elements=["address"], set_={"address": address})
+                .returning(Script.script_id)
+            )
+            script_id = result.scalar_one()
+        return script_id
+
+    @staticmethod
+    async def sync_script(db: AsyncSession, context: ManagedChainContext, script_address: Address) -> dict:
+        """
+        Reconciles the indexed outputs of the script with its UTxO set on chain: new outputs are added,
+        indexed outputs missing on chain are marked spent. Does not commit.
+        """
+        script_id = await ChainIndexer.get_script_id(db, script_address)
+        outputs = {
+            (utxo.input.transaction_id.payload.hex(), utxo.input.index): utxo
+            for utxo in await context.call(context.utxos, script_address)
+        }
+
+        result = await db.execute(
+            select(Utxo.utxo_id, Utxo.tx_hash, Utxo.tx_index)
+            .where(Utxo.script_id == script_id, Utxo.spent == False)
+        )
+        indexed = {(row.tx_hash, row.tx_index): row.utxo_id for row in result}
+
+        spent_ids = [utxo_id for output, utxo_id in indexed.items() if output not in outputs]
+        if spent_ids:
+            await db.execute(
+                update(Utxo)
+                .where(Utxo.utxo_id.in_(spent_ids))
+                .values(spent=True, spent_date=datetime.now(timezone.utc))
+            )
+
+        new_outputs = [utxo for output, utxo in outputs.items() if output not in indexed]
+        if new_outputs:
+            milestones = await ChainIndexer.get_milestones_by_tx(
+                db,
+                tx_hashes={utxo.input.transaction_id.payload.hex() for utxo in new_outputs}
+            )
+            rows = [
+                ChainIndexer.to_row(
+                    script_id=script_id,
+                    utxo=utxo,
+                    milestone_id=milestones.get(utxo.input.transaction_id.payload.hex())
+                )
+                for utxo in new_outputs
+            ]
+            # Bounded like the batch endpoints, a multi-row INSERT is capped by the bind parameter limit
+            for start in range(0, len(rows), settings.sql.max_batch_size):
+                await db.execute(
+                    p_insert(Utxo)
+                    .values(rows[start:start + settings.sql.max_batch_size])
+                    .on_conflict_do_nothing(index_elements=["tx_hash", "tx_index"])
+                )
+
+        return {
+            "script_id": script_id,
+            "unspent": len(outputs),
+            "added": len(new_outputs),
+            "spent": len(spent_ids),
+        }
+
+    @staticmethod
+    async def get_milestones_by_tx(db: AsyncSession, tx_hashes: set[str]) -> dict[str, int]:
+        if not tx_hashes:
+            return {}
+        result = await db.execute(
+            select(PendingTransaction.tx_hash, PendingTransaction.milestone_id)
+            .where(PendingTransaction.tx_hash.in_(tx_hashes))
+        )
+        return {row.tx_hash: row.milestone_id for row in result}
+
+    @staticmethod
+    def to_row(script_id: int, utxo: UTxO, milestone_id: Optional[int]) -> dict:
+        amount = utxo.output.amount
+        token_unit, token_quantity = None, None
+        if amount.multi_asset:
+            # The contract locks at most one token, the column pair holds the first one
+            policy, assets = next(iter(amount.multi_asset.items()))
+            asset_name, token_quantity = next(iter(assets.items()))
+            token_unit = policy.payload.hex() + asset_name.payload.hex()
+
+        datum = utxo.output.datum
+        if isinstance(datum, RawCBOR):
+            datum = datum.cbor.hex()
+        elif datum is not None:
+            datum = datum.to_cbor_hex()
+
+        return {
+            "script_id": script_id,
+            "tx_hash": utxo.input.transaction_id.payload.hex(),
+            "tx_index": utxo.input.index,
+            "datum": datum,
+            "value_lovelace": amount.coin,
+            "token_unit": token_unit,
+            "token_quantity": token_quantity,
+            "milestone_id": milestone_id,
+            "spent": False,
+        }
+
+    @staticmethod
+    async def find_milestone_utxo(db: AsyncSession, context: ManagedChainContext, milestone_id: int) -> Optional[UTxO]:
+        """
+        The indexed unspent output of the milestone, confirmed with a point lookup of that output.
+        Returns None when the milestone has no indexed output or it was spent since.
+        """
+        result = await db.execute(
+            select(Utxo.utxo_id, Utxo.tx_hash, Utxo.tx_index)
+            .where(Utxo.milestone_id == milestone_id, Utxo.spent == False)
+            .order_by(Utxo.utxo_id.desc())
+            .limit(1)
+        )
+        row = result.first()
+        if row is None:
+            return None
+
+        utxo = await context.call(context.utxo_by_tx_id, row.tx_hash, row.tx_index)
+        if utxo is None:
+            await db.execute(
+                update(Utxo)
+                .where(Utxo.utxo_id == row.utxo_id)
+                .values(spent=True, spent_date=datetime.now(timezone.utc))
+            )
+        return utxo
+
+    @staticmethod
+    async def has_transactions(db: AsyncSession, milestone_id: int) -> bool:
+        result = await db.execute(
+            select(PendingTransaction.pending_transaction_id)
+            .where(
+                PendingTransaction.milestone_id == milestone_id,
+                PendingTransaction.status.in_(["pending", "confirmed"])
+            )
+            .limit(1)
+        )
+        return result.first() is not None
+
+    @staticmethod
+    def should_reconcile(script_address: Address) -> bool:
+        """
+        Whether a miss may rescan the script address, at most once per reconcile_interval in this worker.
+        """
+        address = str(script_address)
+        now = time.monotonic()
+        if now - ChainIndexer.__last_sync.get(address, float("-inf")) < settings.chain_sync.reconcile_interval:
+            return False
+        ChainIndexer.__last_sync[address] = now
+        return True
+
+    @staticmethod
+    async def get_milestone_utxo(
+            db: AsyncSession,
+            context: ManagedChainContext,
+            milestone_id: int,
+            script_address: Address
+    ) -> Optional[UTxO]:
+        """
+        Indexed lookup of the unspent output of a milestone. When the index is stale (no output or a spent
+        one) the script address is reconciled with Ogmios and the lookup retried, unless the milestone has
+        no live transaction (none of the outputs can be its) or the address was reconciled recently.
+        Commits.
+        """
+        utxo = await ChainIndexer.find_milestone_utxo(db, context, milestone_id)
+        if (
+                utxo is None
+                and await ChainIndexer.has_transactions(db, milestone_id)
+                and ChainIndexer.should_reconcile(script_address)
+        ):
+            await ChainIndexer.sync_script(db, context, script_address)
+            utxo = await ChainIndexer.find_milestone_utxo(db, context, milestone_id)
+        await db.commit()
+        return utxo
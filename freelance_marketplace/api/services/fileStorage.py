@@ -1,5 +1,4 @@
 import uuid
-import boto3
 from typing import List
 import hashlib
 from freelance_marketplace.core.config import settings
@@ -9,6 +8,9 @@ class FileStorage:
         self,
         bucket_name: str,
     ):
+        # boto3 is imported on first use rather than with the app
+        import boto3
+
         self.bucket_name = bucket_name
         self.s3 = boto3.client(
             "s3",
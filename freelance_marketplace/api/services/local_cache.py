@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+from freelance_marketplace.core.config import settings
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with a TTL, used in front of Redis for reference data
+    (categories, sub-categories, roles) that rarely changes.
+    Entries are dropped across workers through the Redis invalidation channel.
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.__entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        entry = self.__entries.get(key)
+        if entry is None:
+            cache_stats.miss("local")
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.__entries[key]
+            cache_stats.miss("local")
+            return None
+
+        self.__entries.move_to_end(key)
+        cache_stats.hit("local")
+        return value
+
+    def set(self, key: str, value: Any):
+        self.__entries[key] = (time.monotonic() + self.ttl, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+
+    def invalidate(self, prefix: str):
+        namespace = prefix.partition(":")[0]
+        for key in [key for key in self.__entries if key.partition(":")[0] == namespace]:
+            del self.__entries[key]
+
+    def clear(self):
+        self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+class CacheStats:
+    """
+    Hit/miss counters per cache layer ("local", "redis") of this worker.
+    """
+
+    def __init__(self):
+        self.__counters: dict[str, dict[str, int]] = {}
+
+    def hit(self, layer: str):
+        self.__layer(layer)["hits"] += 1
+
+    def miss(self, layer: str):
+        self.__layer(layer)["misses"] += 1
+
+    def __layer(self, layer: str) -> dict[str, int]:
+        return self.__counters.setdefault(layer, {"hits": 0, "misses": 0})
+
+    def snapshot(self) -> dict:
+        return {
+            layer: {
+                **counters,
+                "hit_ratio": round(counters["hits"] / total, 4) if (total := counters["hits"] + counters["misses"]) else None
+            }
+            for layer, counters in self.__counters.items()
+        }
+
+
+cache_stats = CacheStats()
+local_cache = LocalCache(max_size=settings.redis.local_cache_max_size, ttl=settings.redis.local_cache_ttl)
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from freelance_marketplace.core.config import settings
+
+
+class LoopLagMonitor:
+    """
+    How late the event loop wakes up a sleeping probe, i.e. how long every coroutine of this worker waits
+    behind blocking code.
+    """
+
+    # Upper bounds in ms of the lag histogram
+    BUCKETS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.__histogram = [0] * (len(self.BUCKETS) + 1)
+
+    def record(self, lag: float):
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        lag_ms = lag * 1000
+        self.__histogram[next((index for index, bound in enumerate(self.BUCKETS) if lag_ms <= bound), -1)] += 1
+
+    async def run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.record(max(time.perf_counter() - start - self.interval, 0.0))
+
+    def snapshot(self) -> dict:
+        return {
+            "interval_s": self.interval,
+            "samples": self.samples,
+            "avg_lag_ms": round(self.total_lag / self.samples * 1000, 3) if self.samples else None,
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "lag_histogram_ms": {
+                **{f"<={bound}": count for bound, count in zip(self.BUCKETS, self.__histogram)},
+                f">{self.BUCKETS[-1]}": self.__histogram[-1]
+            }
+        }
+
+
+loop_lag = LoopLagMonitor(interval=settings.workers.loop_lag_interval)
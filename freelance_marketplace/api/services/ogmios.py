@@ -1,18 +1,24 @@
 from typing import Optional, List
-from pycardano import OgmiosChainContext, Address, UTxO, Transaction
-from freelance_marketplace.core.config import settings
+
+from fastapi import HTTPException
+from pycardano import Address, UTxO, Transaction
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from freelance_marketplace.api.services.chain_context import ManagedChainContext, get_chain_context
+from freelance_marketplace.api.services.chain_indexer import ChainIndexer
+from freelance_marketplace.db.sql.database import AsyncSessionLocal
 
 
 class Ogmios:
     def __init__(self):
-        self.context = OgmiosChainContext(host=settings.ogmios.host, port=settings.ogmios.port, network=settings.blockchain.network)
+        self.context = get_chain_context()
 
     @staticmethod
-    async def get_context():
-        return OgmiosChainContext(host=settings.ogmios.host, port=settings.ogmios.port, network=settings.blockchain.network)
+    async def get_context() -> ManagedChainContext:
+        return get_chain_context()
 
     async def get_utxo_from_wallet(self, signer_address: Address):
-        utxos: List[UTxO] = self.context.utxos(address=signer_address)
+        utxos: List[UTxO] = await self.context.call(self.context.utxos, signer_address)
         min_lovelace = 5_000_000
         for utxo in utxos:
             ada_amount = utxo.output.amount.coin
@@ -20,24 +26,20 @@ class Ogmios:
                 return utxo
         return None
 
-    async def get_utxo_by_milestone(self, milestone_id: int, script_address: Address) -> Optional[UTxO]:
-        # Fetch UTXOs at the validator address
-        utxos = self.context.utxos(str(script_address))
-
-        for utxo in utxos:
-            datum = utxo.output.datum
-            if datum is not None:
-                try:
-                    # Check if datum has the milestone_id field
-                    if hasattr(datum, "milestone_id") and datum.milestone_id == milestone_id:
-                        return utxo
-                except Exception as e:
-                    continue  # Some datums might be malformed or not PlutusData instances
-
-        return None
+    async def get_utxo_by_milestone(
+            self,
+            milestone_id: int,
+            script_address: Address,
+            db: Optional[AsyncSession] = None
+    ) -> Optional[UTxO]:
+        # Indexed lookup in the utxos table, reconciled with the script address when stale
+        if db is not None:
+            return await ChainIndexer.get_milestone_utxo(db, self.context, milestone_id, script_address)
+        async with AsyncSessionLocal() as session:
+            return await ChainIndexer.get_milestone_utxo(session, self.context, milestone_id, script_address)
 
     async def get_collateral_utxo(self, wallet_address: Address) -> Optional[UTxO]:
-        utxos: list[UTxO] = self.context.utxos(address=wallet_address)
+        utxos: list[UTxO] = await self.context.call(self.context.utxos, wallet_address)
 
         for utxo in utxos:
             value = utxo.output.amount
@@ -52,13 +54,16 @@ class Ogmios:
 
     async def is_valid_transaction(self, tx: Transaction) -> bool:
         try:
-            self.context.evaluate_tx(tx)
+            await self.context.call(self.context.evaluate_tx, tx)
             return True
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Transaction validation failed: {e}")
             return False
 
     async def submit_transaction(self, tx: Transaction) -> bool:
-        self.context.submit_tx(tx.to_cbor())
+        # Never aborted, the node may already have the transaction
+        await self.context.call(self.context.submit_tx, tx.to_cbor(), abortable=False)
         return True
 
@@ -1,15 +1,57 @@
+import asyncio
 import hashlib
-import json
-from typing import Any
+import math
+import random
+import secrets
+import time
+from typing import Any, Iterable, Callable, Awaitable
 import redis.asyncio as redis
 from fastapi import HTTPException
-from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from freelance_marketplace.api.services.local_cache import local_cache, cache_stats
+from freelance_marketplace.api.utils.cache_codec import CacheCodec
 from freelance_marketplace.core.config import settings
+from freelance_marketplace.db.sql.database import get_session_factory, ReplicaSessionLocal
+
+INVALIDATION_CHANNEL = "cache_invalidation"
+EVICTION_SEQUENCE_KEY = "cache_eviction_sequence"
+# How long the eviction of a tag is remembered, longer than any load
+EVICTION_MARKER_SECONDS = 3600
+
+# Numbers the eviction and marks every evicted tag with it (KEYS: sequence, markers; ARGV: marker TTL)
+EVICT_SCRIPT = """
+local sequence = redis.call('INCR', KEYS[1])
+for i = 2, #KEYS do
+    redis.call('SET', KEYS[i], sequence, 'EX', ARGV[1])
+end
+return sequence
+"""
+# Writes an entry and its tags unless one of the tags was evicted after ARGV[3], the eviction sequence read
+# before the entry was loaded (KEYS: entry, tag sets, markers; ARGV: entry, TTL, sequence, tag count)
+SET_ENTRY_SCRIPT = """
+local count = tonumber(ARGV[4])
+for i = 2 + count, #KEYS do
+    local evicted = redis.call('GET', KEYS[i])
+    if evicted and tonumber(evicted) > tonumber(ARGV[3]) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+for i = 2, 1 + count do
+    redis.call('SADD', KEYS[i], KEYS[1])
+    redis.call('EXPIRE', KEYS[i], ARGV[2])
+end
+return 1
+"""
 
 
 class Redis:
+    # Loads currently running in this worker, keyed by cache key (single-flight).
+    __in_flight: dict[str, asyncio.Future] = {}
+
     def __init__(self):
         self.client = None
+        self.binary_client = None
         self.__init_redis()
 
     def __init_redis(self):
@@ -18,16 +60,26 @@ class Redis:
             port=settings.redis.port,
             decode_responses=settings.redis.decode_responses
         )
+        # Cache entries are encoded by CacheCodec and must not be decoded as text.
+        self.binary_client = redis.Redis(
+            host=settings.redis.host,
+            port=settings.redis.port,
+            decode_responses=False
+        )
 
     def get_client(self):
         return self.client
 
+    def get_binary_client(self):
+        return self.binary_client
+
     @staticmethod
     async def __get_redis_data(cache_key: str):
         try:
-            redis_data = await redis_client.get(cache_key)
-            if redis_data:
-                return json.loads(redis_data)
+            redis_data = await redis_binary_client.get(cache_key)
+            # Entries another host encoded with a library missing here are misses
+            if redis_data and CacheCodec.is_readable(redis_data):
+                return CacheCodec.decode(redis_data)
             else:
                 return None
         except Exception as e:
@@ -39,48 +91,389 @@ class Redis:
             match: str = None,
             query_params: dict = None
     ) -> tuple[Any | None, str]:
+        cache_key = await Redis.__resolve_cache_key(prefix=prefix, match=match, query_params=query_params)
+        redis_data = await Redis.__get_redis_data(cache_key=cache_key)
+        if redis_data:
+            cache_stats.hit("redis")
+        else:
+            cache_stats.miss("redis")
+        return redis_data, cache_key
 
-        assert prefix or match
-        assert not (prefix and match)
-        if prefix:
-            assert query_params
-        if query_params:
-            assert prefix
+    @staticmethod
+    async def get_or_load(
+            loader: Callable[[AsyncSession], Awaitable[Any]],
+            db: AsyncSession,
+            prefix: str = None,
+            match: str = None,
+            query_params: dict = None,
+            ex: int = 3600,
+            tags: Callable[[Any], list[str]] = None,
+            local: bool = False,
+            raw: bool = False
+    ) -> Any:
+        """
+        Reads a cache entry and, on a miss, loads and caches it through `loader` with stampede protection:
+        concurrent misses are coalesced in this worker and across workers (short Redis lock), and entries
+        are recomputed probabilistically before they expire (XFetch), proportionally to their load time.
+        `loader` gets a session of its own on the database of `db` (primary or replica): a load is shared by
+        the coalesced requests and outlives the request that started it, it must not use that request's session.
+        Loads from a replica are not cached while a write to one of their tags may not have reached it yet,
+        and no load is cached when one of its tags was evicted while it ran: it may have read the rows before
+        the write committed.
+        `tags` builds the cache tags of the loaded data.
+        `local` also keeps the entry in the in-process cache, meant for rarely changing reference data.
+        `raw` returns the entry as an encoded JSON document, taken as-is from the cached bytes.
+        """
+        logical_key = await Redis.__logical_cache_key(prefix=prefix, match=match, query_params=query_params)
+        if local and not raw:
+            local_data = local_cache.get(logical_key)
+            if local_data is not None:
+                return local_data
 
-        if prefix:
-            cache_key = await Redis.__generate_cache_key(query_params=query_params, prefix=prefix)
-            return await Redis.__get_redis_data(cache_key=cache_key), cache_key
-        if match:
-            return await Redis.__get_redis_data(cache_key=match), match
-        raise HTTPException(status_code=500, detail=f"Prefix or match not provided")
+        cache_key = await Redis.__versioned_key(cache_key=logical_key)
+        entry = await Redis.__get_or_load(
+            cache_key=cache_key,
+            loader=loader,
+            session_factory=get_session_factory(db),
+            ex=ex,
+            tags=tags
+        )
+        if raw:
+            return CacheCodec.to_json(entry)
+
+        data = CacheCodec.decode(entry)
+        if local:
+            local_cache.set(logical_key, data)
+        return data
 
+    @staticmethod
+    async def __get_or_load(
+            cache_key: str,
+            loader: Callable[[AsyncSession], Awaitable[Any]],
+            session_factory: async_sessionmaker,
+            ex: int,
+            tags: Callable[[Any], list[str]] | None
+    ) -> bytes:
+        try:
+            async with redis_binary_client.pipeline(transaction=False) as pipe:
+                pipe.get(cache_key)
+                pipe.pttl(cache_key)
+                pipe.get(Redis.__delta_key(cache_key=cache_key))
+                pipe.get(EVICTION_SEQUENCE_KEY)
+                redis_data, ttl_ms, delta, since = await pipe.execute()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
+        # Entries another host encoded with a library missing here are reloaded
+        stale = redis_data if redis_data and CacheCodec.is_readable(redis_data) else None
+        if stale:
+            cache_stats.hit("redis")
+            # XFetch: recompute early with a probability that grows as the entry gets closer to expiring.
+            recompute_ms = float(delta or 0) * 1000 * settings.redis.xfetch_beta * -math.log(1.0 - random.random())
+            if ttl_ms < 0 or recompute_ms < ttl_ms:
+                return stale
+            if cache_key in Redis.__in_flight:
+                return stale
+        else:
+            cache_stats.miss("redis")
 
+        load = Redis.__in_flight.get(cache_key)
+        if load is None:
+            load = asyncio.ensure_future(Redis.__load(
+                cache_key=cache_key,
+                loader=loader,
+                session_factory=session_factory,
+                ex=ex,
+                tags=tags,
+                stale=stale,
+                since=int(since or 0)
+            ))
+            Redis.__in_flight[cache_key] = load
+            load.add_done_callback(lambda _: Redis.__in_flight.pop(cache_key, None))
+        return await asyncio.shield(load)
 
     @staticmethod
-    async def set_redis_data(cache_key: str, data, ex: int = 3600):
+    async def __load(
+            cache_key: str,
+            loader: Callable[[AsyncSession], Awaitable[Any]],
+            session_factory: async_sessionmaker,
+            ex: int,
+            tags: Callable[[Any], list[str]] | None,
+            stale: bytes | None,
+            since: int
+    ) -> bytes:
+        lock_key = f"lock:{cache_key}"
+        token = secrets.token_hex(16)
+        lock_timeout_ms = settings.redis.lock_timeout_ms
+        acquired = await redis_client.set(lock_key, token, nx=True, px=lock_timeout_ms)
+
+        if not acquired:
+            # Another worker is already loading this entry.
+            if stale:
+                return stale
+            deadline = time.monotonic() + lock_timeout_ms / 1000
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                redis_data = await redis_binary_client.get(cache_key)
+                if redis_data and CacheCodec.is_readable(redis_data):
+                    return redis_data
+
         try:
-            data_encoded = jsonable_encoder(data)
-            await redis_client.set(cache_key, json.dumps(data_encoded), ex=ex)
-            return True
+            start = time.monotonic()
+            async with session_factory() as session:
+                data = await loader(session)
+                entry = CacheCodec.encode(data)
+                entry_tags = tags(data) if tags else None
+            delta = time.monotonic() - start
+
+            if session_factory is ReplicaSessionLocal and await Redis.__in_write_window(cache_key=cache_key, tags=entry_tags):
+                return entry
+            if await Redis.__set_entry(cache_key=cache_key, entry=entry, ex=ex, tags=entry_tags, since=since):
+                await redis_client.set(Redis.__delta_key(cache_key=cache_key), delta, ex=ex)
+            return entry
+        finally:
+            if acquired:
+                await redis_client.eval(
+                    "if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end return 0",
+                    1,
+                    lock_key,
+                    token
+                )
+
+    @staticmethod
+    async def get_eviction_sequence() -> int:
+        """
+        The number of the last tag eviction, to read before loading data passed to set_redis_data (`since`).
+        """
+        return int(await redis_client.get(EVICTION_SEQUENCE_KEY) or 0)
+
+    @staticmethod
+    async def set_redis_data(cache_key: str, data, ex: int = 3600, tags: list[str] = None, since: int = None):
+        """
+        Caches `data` with its tags. With `since` (get_eviction_sequence before the data was read), nothing
+        is cached when one of the tags was evicted in the meantime.
+        """
+        try:
+            # The data may have been read from a replica behind a recent write
+            if await Redis.__in_write_window(cache_key=cache_key, tags=tags):
+                return False
+            return await Redis.__set_entry(cache_key=cache_key, entry=CacheCodec.encode(data), ex=ex, tags=tags, since=since)
 
         except Exception as e:
             print(f"{str(e)}")
             return False
 
 
+    @staticmethod
+    async def __set_entry(cache_key: str, entry: bytes, ex: int, tags: list[str] | None, since: int | None = None) -> bool:
+        tags = tags or []
+        if since is None:
+            async with redis_binary_client.pipeline(transaction=False) as pipe:
+                pipe.set(cache_key, entry, ex=ex)
+                for tag in tags:
+                    tag_key = Redis.__tag_key(tag=tag)
+                    pipe.sadd(tag_key, cache_key)
+                    pipe.expire(tag_key, ex)
+                await pipe.execute()
+            return True
+
+        # Atomic with the evictions: one running after the check finds the entry in the tag sets
+        stored = await redis_binary_client.eval(
+            SET_ENTRY_SCRIPT,
+            1 + 2 * len(tags),
+            cache_key,
+            *(Redis.__tag_key(tag=tag) for tag in tags),
+            *(Redis.__eviction_marker_key(tag=tag) for tag in tags),
+            entry,
+            ex,
+            since,
+            len(tags)
+        )
+        return bool(stored)
+
     @staticmethod
     async def invalidate_cache(prefix: str):
+        """
+        Invalidates every cache entry of a namespace (e.g. "services") by bumping its version.
+        Entries written under older versions are never read again and expire through their TTL.
+        """
         try:
-            cursor, keys = await redis_client.scan(match=f"{prefix}*", count=100_000_000)
-            if keys:
-                await redis_client.delete(*keys)
-
+            await Redis.__open_write_window(keys=[Redis.__write_window_key(name=prefix)])
+            await redis_client.incr(Redis.__namespace_version_key(namespace=prefix))
+            local_cache.invalidate(prefix=prefix)
+            await redis_client.publish(INVALIDATION_CHANNEL, prefix)
             return True
         except Exception as e:
             print(f"Error invalidating cache for prefix {prefix}: {e}")
             return False
 
+    @staticmethod
+    async def listen_invalidations():
+        """
+        Drops in-process cache entries invalidated by any worker. Runs for the lifetime of the worker.
+        """
+        while True:
+            try:
+                pubsub = redis_client.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Invalidations published while disconnected were missed.
+                local_cache.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        local_cache.invalidate(prefix=message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Cache invalidation listener failed: {e}")
+                await asyncio.sleep(1)
+
+    @staticmethod
+    async def delete_cache(cache_key: str):
+        """
+        Deletes a single cache entry (e.g. "profiles:1") of the current namespace version.
+        """
+        try:
+            await redis_client.delete(await Redis.__versioned_key(cache_key=cache_key))
+            return True
+        except Exception as e:
+            print(f"Error deleting cache key {cache_key}: {e}")
+            return False
+
+    @staticmethod
+    def generate_tags(prefix: str, dimensions: dict, ids: Iterable = ()) -> list[str]:
+        """
+        Builds the tags of a cached entry: the filter dimensions it is scoped to and the ids it contains.
+        An entry that is not scoped to any dimension is tagged as unscoped ("<prefix>:*").
+        """
+        tags = [f"{prefix}:{key}={value}" for key, value in dimensions.items() if value is not None]
+        if not tags:
+            tags.append(f"{prefix}:*")
+        tags.extend(Redis.generate_entity_tags(prefix=prefix, ids=ids))
+        return tags
+
+    @staticmethod
+    def generate_entity_tags(prefix: str, ids: Iterable) -> list[str]:
+        """
+        Builds the tags of cached single entities, evicted by any write to one of the given ids.
+        """
+        return [f"{prefix}:id={object_id}" for object_id in ids]
+
+    @staticmethod
+    async def invalidate_tags(prefix: str, dimensions: dict = None, ids: Iterable = ()):
+        """
+        Evicts only the cache entries affected by a write: entries containing one of the written ids,
+        entries scoped to one of the written dimension values and unscoped entries.
+        """
+        tags = Redis.generate_tags(prefix=prefix, dimensions=dimensions or {}, ids=ids)
+        return await Redis.__evict_tags(prefix=prefix, tags=tags)
+
+    @staticmethod
+    async def invalidate_batch_tags(prefix: str, dimensions: Iterable[dict], ids: Iterable = ()):
+        """
+        invalidate_tags for a batch of writes, with the tags of every written row evicted at once.
+        """
+        tags = {tag for row_dimensions in dimensions for tag in Redis.generate_tags(prefix=prefix, dimensions=row_dimensions)}
+        tags.update(Redis.generate_entity_tags(prefix=prefix, ids=ids))
+        return await Redis.__evict_tags(prefix=prefix, tags=list(tags))
+
+    @staticmethod
+    async def __evict_tags(prefix: str, tags: list[str]):
+        if f"{prefix}:*" not in tags:
+            tags.append(f"{prefix}:*")
+        tag_keys = [Redis.__tag_key(tag=tag) for tag in tags]
+        try:
+            # Before the eviction, so a replica load finishing after it sees the window
+            await Redis.__open_write_window(keys=[Redis.__write_window_key(name=tag) for tag in tags])
+            # Before the tag sets are read, so a load that ran across the write does not cache its result
+            await redis_client.eval(
+                EVICT_SCRIPT,
+                1 + len(tags),
+                EVICTION_SEQUENCE_KEY,
+                *(Redis.__eviction_marker_key(tag=tag) for tag in tags),
+                EVICTION_MARKER_SECONDS
+            )
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                members = await pipe.execute()
+
+            cache_keys = set().union(*members)
+            await redis_client.delete(*cache_keys, *tag_keys)
+            return True
+        except Exception as e:
+            print(f"Error invalidating cache tags {tags}: {e}")
+            return False
+
+    @staticmethod
+    async def __open_write_window(keys: list[str]):
+        """
+        Marks tags (or a namespace) as written for read_your_writes_seconds, the time the replicas may
+        take to catch up. Without replicas every read is on the primary and nothing is marked.
+        """
+        if not settings.sql.replica_connection_string:
+            return
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.set(key, 1, ex=settings.sql.read_your_writes_seconds)
+            await pipe.execute()
+
+    @staticmethod
+    async def __in_write_window(cache_key: str, tags: list[str] | None) -> bool:
+        if not settings.sql.replica_connection_string:
+            return False
+        namespace = cache_key.partition(":")[0]
+        keys = [Redis.__write_window_key(name=namespace), *(Redis.__write_window_key(name=tag) for tag in tags or [])]
+        return await redis_client.exists(*keys) > 0
+
+    @staticmethod
+    def __write_window_key(name: str) -> str:
+        return f"cache_write_window:{name}"
+
+    @staticmethod
+    def __delta_key(cache_key: str) -> str:
+        return f"{cache_key}:delta"
+
+    @staticmethod
+    def __tag_key(tag: str) -> str:
+        return f"cache_tags:{tag}"
+
+    @staticmethod
+    def __eviction_marker_key(tag: str) -> str:
+        return f"cache_evicted:{tag}"
+
+    @staticmethod
+    def __namespace_version_key(namespace: str) -> str:
+        return f"cache_version:{namespace}"
+
+    @staticmethod
+    async def __versioned_key(cache_key: str) -> str:
+        namespace, _, suffix = cache_key.partition(":")
+        version = await redis_client.get(Redis.__namespace_version_key(namespace=namespace))
+        return f"{namespace}:v{int(version) if version else 0}:{suffix}"
+
+    @staticmethod
+    async def __resolve_cache_key(prefix: str = None, match: str = None, query_params: dict = None) -> str:
+        cache_key = await Redis.__logical_cache_key(prefix=prefix, match=match, query_params=query_params)
+        return await Redis.__versioned_key(cache_key=cache_key)
+
+    @staticmethod
+    async def __logical_cache_key(prefix: str = None, match: str = None, query_params: dict = None) -> str:
+        assert prefix or match
+        assert not (prefix and match)
+        if prefix:
+            assert query_params
+        if query_params:
+            assert prefix
+
+        if prefix:
+            cache_key = await Redis.__generate_cache_key(query_params=query_params, prefix=prefix)
+        elif match:
+            cache_key = match
+        else:
+            raise HTTPException(status_code=500, detail=f"Prefix or match not provided")
+
+        return cache_key
+
     @staticmethod
     async def __generate_cache_key(prefix: str, query_params: dict = None) -> str:
         filtered_params = {key: value for key, value in query_params.items() if value is not None}
@@ -91,5 +484,7 @@ class Redis:
         return f"{prefix}:{hashed_key}"
 
 
-redis_client = Redis().get_client()
+redis_connection = Redis()
+redis_client = redis_connection.get_client()
+redis_binary_client = redis_connection.get_binary_client()
 
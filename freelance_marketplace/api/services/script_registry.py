@@ -0,0 +1,113 @@
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Optional
+
+from pycardano import PlutusScript, ScriptHash, Address, Network, plutus_script_hash
+from sqlalchemy.dialects.postgresql import insert as p_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from freelance_marketplace.core.config import settings
+from freelance_marketplace.models.sql.sql_tables import Script
+
+SMART_CONTRACTS_DIR = Path(__file__).resolve().parent.parent.parent / "smart_contracts"
+
+
+class CompiledScript:
+    """
+    A validator of an Aiken blueprint (CIP-57), parsed once with its hash. Addresses are built per network
+    on first use.
+    """
+
+    def __init__(self, name: str, script: PlutusScript, content_hash: str, version: str):
+        self.name = name
+        self.script = script
+        self.script_hash: ScriptHash = plutus_script_hash(script)
+        self.content_hash = content_hash
+        self.version = version
+        self.__addresses: dict[Network, Address] = {}
+
+    def address(self, network: Optional[Network] = None) -> Address:
+        network = network or settings.blockchain.cardano_network
+        if network not in self.__addresses:
+            self.__addresses[network] = Address(payment_part=self.script_hash, network=network)
+        return self.__addresses[network]
+
+
+class ScriptRegistry:
+    """
+    Compiled validators of the platform, parsed once and again only when the content of their blueprint
+    changes (a stat per lookup, the file is only read when its mtime or size moved).
+    """
+
+    # name: (blueprint in smart_contracts/, validator title)
+    SCRIPTS = {
+        "job_agreement": ("job_agreement_plutus.json", "job_agreements.job_agreements.spend"),
+    }
+
+    __scripts: dict[str, CompiledScript] = {}
+    __file_stats: dict[str, tuple[int, int]] = {}
+    # (name, network, content hash) -> script_id of the rows already recorded by this process
+    __registered: dict[tuple, int] = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def get(cls, name: str = "job_agreement") -> CompiledScript:
+        file_name, title = cls.SCRIPTS[name]
+        path = SMART_CONTRACTS_DIR / file_name
+        stat = path.stat()
+        file_stat = (stat.st_mtime_ns, stat.st_size)
+        if cls.__file_stats.get(name) == file_stat:
+            return cls.__scripts[name]
+
+        with cls.__lock:
+            if cls.__file_stats.get(name) != file_stat:
+                content = path.read_bytes()
+                content_hash = hashlib.sha256(content).hexdigest()
+                current = cls.__scripts.get(name)
+                # A touched but unchanged blueprint keeps its parsed script
+                if current is None or current.content_hash != content_hash:
+                    cls.__scripts[name] = cls.__parse(name, title, content, content_hash)
+                cls.__file_stats[name] = file_stat
+        return cls.__scripts[name]
+
+    @staticmethod
+    def __parse(name: str, title: str, content: bytes, content_hash: str) -> CompiledScript:
+        blueprint = json.loads(content)
+        validator = next((item for item in blueprint["validators"] if item["title"] == title), None)
+        if validator is None:
+            raise ValueError(f"Validator {title} not found in the {name} blueprint")
+
+        plutus_version = int(blueprint["preamble"]["plutusVersion"].removeprefix("v"))
+        script = PlutusScript.from_version(plutus_version, bytes.fromhex(validator["compiledCode"]))
+        compiled = CompiledScript(
+            name=name,
+            script=script,
+            content_hash=content_hash,
+            # Fits scripts.version, the content hash tells apart rebuilds of the same blueprint version
+            version=f"{blueprint['preamble']['version']}+{content_hash[:12]}"
+        )
+        if validator.get("hash") and compiled.script_hash.payload.hex() != validator["hash"]:
+            raise ValueError(f"Hash of the {name} validator does not match its blueprint")
+        return compiled
+
+    @classmethod
+    async def register(cls, db: AsyncSession, name: str = "job_agreement", network: Optional[Network] = None) -> int:
+        """
+        Records the script and its address on the network in the scripts table, once per process and
+        content. Does not commit.
+        """
+        compiled = cls.get(name)
+        network = network or settings.blockchain.cardano_network
+        key = (name, network, compiled.content_hash)
+        if key not in cls.__registered:
+            address = str(compiled.address(network))
+            result = await db.execute(
+                p_insert(Script)
+                .values(name=name, address=address, version=compiled.version)
+                .on_conflict_do_update(index_elements=["address"], set_={"name": name, "version": compiled.version})
+                .returning(Script.script_id)
+            )
+            cls.__registered[key] = result.scalar_one()
+        return cls.__registered[key]
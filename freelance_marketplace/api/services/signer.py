@@ -0,0 +1,206 @@
+"""
+Signs transaction hashes with the platform payment key, decrypted once instead of running gpg per signature.
+
+The key lives in an mlock'd buffer (never swapped out) and is zeroed when its TTL (KEY_SIGNER_TTL) expires,
+the next signature decrypts it again. Python cannot prevent transient copies while signing, those are
+released right after each signature.
+
+With KEY_SIGNER_SOCKET set the API process never holds the key: signatures are requested from a separate
+signer process over a unix socket, started with
+
+    poetry run python -m freelance_marketplace.api.services.signer serve
+"""
+import argparse
+import asyncio
+import ctypes
+import ctypes.util
+import os
+from typing import Optional
+
+from fastapi import HTTPException
+from nacl.bindings import crypto_sign, crypto_sign_seed_keypair, crypto_sign_BYTES, crypto_sign_SEEDBYTES
+from pycardano import ExtendedSigningKey
+
+from freelance_marketplace.api.utils.blockchain.key_utils import get_skey
+from freelance_marketplace.core.config import settings
+
+_libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+# Only transaction hashes (blake2b-256) are signed
+MESSAGE_SIZE = 32
+
+
+class LockedBuffer:
+    """
+    Fixed size buffer locked in RAM, zeroed by wipe().
+    """
+
+    def __init__(self, data: bytes):
+        self.size = len(data)
+        self.__buffer = bytearray(self.size)
+        # Pins the bytearray, it can no longer be resized (and moved) while exported
+        self.__view = (ctypes.c_char * self.size).from_buffer(self.__buffer)
+        self.locked = _libc.mlock(ctypes.addressof(self.__view), self.size) == 0
+        self.__buffer[:] = data
+
+    def bytes(self) -> bytes:
+        return bytes(self.__buffer)
+
+    def wipe(self):
+        ctypes.memset(ctypes.addressof(self.__view), 0, self.size)
+        if self.locked:
+            _libc.munlock(ctypes.addressof(self.__view), self.size)
+            self.locked = False
+
+
+class Signer:
+    """
+    In-process signer, the key is decrypted on first use and kept for ttl seconds.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.__key: Optional[LockedBuffer] = None
+        self.__expiry: Optional[asyncio.TimerHandle] = None
+        self.__lock = asyncio.Lock()
+
+    async def load(self) -> LockedBuffer:
+        if self.__key is None:
+            # Concurrent first signatures share one gpg run
+            async with self.__lock:
+                if self.__key is None:
+                    signing_key = await get_skey()
+                    # The seed of a plain ed25519 key, an extended (BIP32) key signs differently
+                    if isinstance(signing_key, ExtendedSigningKey) or len(signing_key.payload) != crypto_sign_SEEDBYTES:
+                        raise ValueError(f"The signer needs a {crypto_sign_SEEDBYTES} bytes non-extended signing key")
+                    _, secret_key = crypto_sign_seed_keypair(signing_key.payload)
+                    self.__key = LockedBuffer(secret_key)
+                    if not self.__key.locked:
+                        print(f"Signer: mlock failed (errno {ctypes.get_errno()}), the key may be swapped out")
+                    if self.ttl > 0:
+                        self.__expiry = asyncio.get_running_loop().call_later(self.ttl, self.wipe)
+        return self.__key
+
+    async def sign(self, message: bytes) -> bytes:
+        key = await self.load()
+        return crypto_sign(message, key.bytes())[:crypto_sign_BYTES]
+
+    def wipe(self):
+        if self.__expiry is not None:
+            self.__expiry.cancel()
+            self.__expiry = None
+        if self.__key is not None:
+            self.__key.wipe()
+            self.__key = None
+
+
+class RemoteSigner:
+    """
+    Client of the signer process, one persistent connection. Same sign() as Signer.
+    Protocol: one hex encoded hash per line, answered by the hex signature or "error: <reason>".
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__reader: Optional[asyncio.StreamReader] = None
+        self.__writer: Optional[asyncio.StreamWriter] = None
+        self.__lock = asyncio.Lock()
+
+    async def sign(self, message: bytes) -> bytes:
+        async with self.__lock:
+            try:
+                if self.__writer is None:
+                    self.__reader, self.__writer = await asyncio.open_unix_connection(self.path)
+                self.__writer.write(message.hex().encode() + b"\n")
+                await self.__writer.drain()
+                line = await self.__reader.readline()
+                if not line:
+                    raise ConnectionError("connection closed")
+            except OSError as e:
+                self.close()
+                raise HTTPException(status_code=503, detail=f"Signer unavailable: {e}")
+            except BaseException:
+                # Cancelled mid-exchange, the unread reply would answer the next request
+                self.close()
+                raise
+
+        response = line.decode().strip()
+        if response.startswith("error"):
+            raise HTTPException(status_code=500, detail=f"Signer {response}")
+        return bytes.fromhex(response)
+
+    def close(self):
+        if self.__writer is not None:
+            self.__writer.close()
+        self.__reader, self.__writer = None, None
+
+    def wipe(self):
+        self.close()
+
+
+async def handle_connection(signer: Signer, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while line := await reader.readline():
+            try:
+                message = bytes.fromhex(line.decode().strip())
+                if len(message) != MESSAGE_SIZE:
+                    raise ValueError(f"expected a {MESSAGE_SIZE} bytes hash")
+                response = (await signer.sign(message)).hex()
+            except Exception as e:
+                response = f"error: {e}"
+            writer.write(response.encode() + b"\n")
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def start_server(signer: Signer, path: str) -> asyncio.AbstractServer:
+    if os.path.exists(path):
+        os.unlink(path)
+    # Owner only from the moment the socket exists
+    umask = os.umask(0o177)
+    try:
+        return await asyncio.start_unix_server(
+            lambda reader, writer: handle_connection(signer, reader, writer),
+            path=path
+        )
+    finally:
+        os.umask(umask)
+
+
+_signer: Signer | RemoteSigner | None = None
+
+
+def get_signer() -> Signer | RemoteSigner:
+    """
+    The signer of this process: the signer process when KEY_SIGNER_SOCKET is set, in process otherwise.
+    """
+    global _signer
+    if _signer is None:
+        if settings.wallet_keys.signer_socket:
+            _signer = RemoteSigner(settings.wallet_keys.signer_socket)
+        else:
+            _signer = Signer(ttl=settings.wallet_keys.signer_ttl)
+    return _signer
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Signer process")
+    parser.add_argument("command", choices=("serve",))
+    parser.add_argument("--socket", default=settings.wallet_keys.signer_socket, help="unix socket path")
+    args = parser.parse_args()
+    if not args.socket:
+        parser.error("--socket or KEY_SIGNER_SOCKET is required")
+
+    signer = Signer(ttl=settings.wallet_keys.signer_ttl)
+    # Decrypt at startup, a gpg failure stops the process instead of the first signature
+    await signer.load()
+    server = await start_server(signer, args.socket)
+    print(f"Signer listening on {args.socket}")
+    try:
+        await server.serve_forever()
+    finally:
+        signer.wipe()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -7,9 +7,14 @@ from typing import List, Optional, Any, Coroutine
 from fastapi import HTTPException
 from pycardano import *
 from pycardano import TransactionBody
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from freelance_marketplace.api.services.chain_context import get_chain_context
+from freelance_marketplace.api.services.chain_indexer import ChainIndexer
 from freelance_marketplace.api.services.ogmios import Ogmios
-from freelance_marketplace.api.utils.blockchain.key_utils import get_skey, get_vkey
+from freelance_marketplace.api.services.script_registry import ScriptRegistry
+from freelance_marketplace.api.services.signer import get_signer
+from freelance_marketplace.api.utils.blockchain.key_utils import get_vkey
 from freelance_marketplace.core.config import settings
 from freelance_marketplace.models.datums.default_datum import Milestone, DatumModel, MilestoneModel, \
     JobAgreement
@@ -19,25 +24,14 @@ from freelance_marketplace.models.redeemers.default_redeemer import DefaultRedee
 
 class TransactionOrchestrator:
     def __init__(self):
-        self.script = self.__load_script()
-        self.context = Ogmios.get_context()
-
-    async def __load_script(self) -> bytes:
-        project_root = Path(__file__).resolve().parent.parent.parent
-        path = project_root / "smart_contracts" / "job_agreement_plutus.json"
-        with open(path, "rb") as f:
-            data = f.read()
-        return data
+        self.context = get_chain_context()
+        self.ogmios = Ogmios()
 
     async def get_script_address(self) -> Address:
-        plutus_script: PlutusV2Script = PlutusV2Script(await self.__load_script())
-        script_hash: ScriptHash = plutus_script_hash(plutus_script)
-        script_address = Address(payment_part=script_hash, network=settings.blockchain.network)
-        return script_address
+        return ScriptRegistry.get().address()
 
-    async def get_plutus_script(self) -> PlutusV2Script:
-        script_bytes: bytes = await self.__load_script()
-        return PlutusV2Script(script_bytes)
+    async def get_plutus_script(self) -> PlutusScript:
+        return ScriptRegistry.get().script
 
     async def build_unsigned_tx(
             self,
@@ -52,9 +46,9 @@ class TransactionOrchestrator:
 
         script_address = await self.get_script_address()
         if transaction_type == TransactionTypes.spending_transaction:
-            utxo: UTxO = await Ogmios().get_utxo_by_milestone(milestone_id=milestone_id, script_address=script_address)
+            utxo: UTxO = await self.ogmios.get_utxo_by_milestone(milestone_id=milestone_id, script_address=script_address)
         else:
-            utxo: UTxO = await Ogmios().get_utxo_from_wallet(signer_address=signer_address)
+            utxo: UTxO = await self.ogmios.get_utxo_from_wallet(signer_address=signer_address)
 
         if not utxo:
             raise HTTPException(status_code=404, detail="UTXO Milestone not found")
@@ -74,7 +68,7 @@ class TransactionOrchestrator:
         )
 
 
-        collateral_utxo: UTxO = await Ogmios().get_collateral_utxo(wallet_address=signer_address)
+        collateral_utxo: UTxO = await self.ogmios.get_collateral_utxo(wallet_address=signer_address)
         if not collateral_utxo:
             raise HTTPException(status_code=404, detail="UTXO Collateral not found")
 
@@ -115,7 +109,7 @@ class TransactionOrchestrator:
                 amount=Value(datum.milestone.reward),
                 datum=datum
             )
-            min_ada = min_lovelace(await self.context, output, has_datum=True)
+            min_ada = await self.context.call(min_lovelace, self.context, output, has_datum=True)
             if output.amount < min_ada:
                 output.amount = Value(min_ada)
             outputs.append(output)
@@ -134,7 +128,7 @@ class TransactionOrchestrator:
                 amount=utxo.output.amount,  # Keep same value
                 datum=datum
             )
-            min_ada = min_lovelace(await self.context, output, has_datum=True)
+            min_ada = await self.context.call(min_lovelace, self.context, output, has_datum=True)
             if output.amount < min_ada:
                 output.amount = Value(min_ada)
             outputs.append(output)
@@ -216,8 +210,7 @@ class TransactionOrchestrator:
             collateral_utxos: List[UTxO],
             extra_outputs: Optional[List[TransactionOutput]] = None
     ) -> TransactionBody:
-        context = await Ogmios.get_context()
-        builder = TransactionBuilder(context)
+        builder = TransactionBuilder(self.context)
 
         # Add required signer (for script signature check)
         builder.required_signers = [
@@ -254,15 +247,15 @@ class TransactionOrchestrator:
 
         builder.change_address = signer_address
 
-        tx = builder.build()
+        # Fetches the wallet UTxOs, protocol parameters and script costs
+        tx = await self.context.call(builder.build)
         return tx
 
     async def sign_tx(self, tx_body: TransactionBody) -> Transaction:
-        signing_key: PaymentSigningKey = await get_skey()
         verification_key: PaymentVerificationKey = await get_vkey()
 
         tx_hash = tx_body.hash()
-        signature = signing_key.sign(tx_hash)
+        signature = await get_signer().sign(tx_hash)
 
         vkey_witness = VerificationKeyWitness(
             signature=signature,
@@ -275,4 +268,28 @@ class TransactionOrchestrator:
             transaction_witness_set=witness_set
         )
 
-        return signed_tx
\ No newline at end of file
+        return signed_tx
+    async def submit_tx(self, db: AsyncSession, signed_tx: Transaction, milestone_id: int, action: str) -> str:
+        """
+        Records the transaction as pending for the milestone, then submits it. The chain follower confirms
+        it and indexes its script outputs under the milestone. Commits.
+        """
+        tx_hash = str(signed_tx.id)
+        await ChainIndexer.record_submission(
+            db,
+            tx_hash=tx_hash,
+            milestone_id=milestone_id,
+            action=action,
+            script_address=await self.get_script_address()
+        )
+        await db.commit()
+
+        try:
+            await self.ogmios.submit_transaction(signed_tx)
+        except Exception as e:
+            # A submit that timed out may still reach the node, it stays pending until seen or timed out
+            if not (isinstance(e, HTTPException) and e.status_code == 504):
+                await ChainIndexer.record_failure(db, tx_hash=tx_hash, reason=str(e))
+                await db.commit()
+            raise
+        return tx_hash
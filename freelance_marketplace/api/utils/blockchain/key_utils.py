@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import json
 import subprocess
@@ -8,17 +9,23 @@ from freelance_marketplace.core.config import settings
 
 
 async def get_skey() -> PaymentSigningKey:
+    """
+    Decrypts the signing key with gpg. Forks a process, use the Signer service rather than calling this
+    per signature.
+    """
     encrypted_skey_base64 = settings.wallet_keys.skey_encrypted
     encrypted_skey = base64.b64decode(encrypted_skey_base64)
 
-    result = subprocess.run(
-        ["gpg", "--decrypt"],
-        input=encrypted_skey,
-        capture_output=True,
-        check=True
+    process = await asyncio.create_subprocess_exec(
+        "gpg", "--decrypt",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
     )
+    skey_raw, stderr = await process.communicate(encrypted_skey)
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, ["gpg", "--decrypt"], stderr=stderr)
 
-    skey_raw = result.stdout
     signing_key: PaymentSigningKey = PaymentSigningKey.from_json(skey_raw)
     return signing_key
 
@@ -28,4 +35,4 @@ async def get_vkey() -> PaymentVerificationKey:
     return vkey
 
 async def build_addr_from_vkey(vkey: PaymentVerificationKey) -> Address:
-    return Address(payment_part=vkey.hash(), network=settings.blockchain.network)
\ No newline at end of file
+    return Address(payment_part=vkey.hash(), network=settings.blockchain.cardano_network)
\ No newline at end of file
@@ -0,0 +1,178 @@
+import datetime
+import decimal
+import enum
+import json
+import uuid
+from typing import Any
+
+from pydantic import BaseModel
+
+from freelance_marketplace.core.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# Every encoded entry starts with [FORMAT_VERSION, codec id, compression id].
+# Entries written before the codec existed are plain JSON text and never start with this byte.
+FORMAT_VERSION = 1
+
+CODEC_JSON = 0
+CODEC_ORJSON = 1
+CODEC_MSGPACK = 2
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+COMPRESSION_LZ4 = 2
+
+
+class CacheCodec:
+    """
+    Serializes cache entries without going through jsonable_encoder.
+    The codec (json, orjson, msgpack) and compression (zstd, lz4) are configured through the REDIS_ settings;
+    unavailable libraries fall back to json and no compression. Entries written by a host with a library this
+    one lacks are not readable here (see is_readable) and are read as cache misses.
+    """
+
+    @staticmethod
+    def to_primitive(obj: Any) -> Any:
+        """
+        Converts the values the codecs cannot serialize natively, mirroring jsonable_encoder's output.
+        """
+        if hasattr(obj, "_sa_instance_state"):
+            return {key: value for key, value in obj.__dict__.items() if not key.startswith("_sa")}
+        if isinstance(obj, BaseModel):
+            return obj.model_dump(mode="json")
+        if isinstance(obj, decimal.Decimal):
+            return float(obj)
+        if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+            return obj.isoformat()
+        if isinstance(obj, enum.Enum):
+            return obj.value
+        if isinstance(obj, uuid.UUID):
+            return str(obj)
+        if isinstance(obj, (set, frozenset, tuple)):
+            return list(obj)
+        if isinstance(obj, bytes):
+            return obj.decode()
+        raise TypeError(f"Object of type {type(obj).__name__} is not cache serializable")
+
+    @staticmethod
+    def dumps_json(data: Any) -> bytes:
+        """
+        Encodes rows straight to a JSON document, the same document FastAPI would render for them.
+        """
+        if orjson is not None:
+            return orjson.dumps(data, default=CacheCodec.to_primitive)
+        return json.dumps(data, default=CacheCodec.to_primitive, separators=(",", ":")).encode()
+
+    @staticmethod
+    def encode(data: Any) -> bytes:
+        codec = CacheCodec.__codec_id()
+        if codec == CODEC_ORJSON:
+            payload = orjson.dumps(data, default=CacheCodec.to_primitive)
+        elif codec == CODEC_MSGPACK:
+            payload = msgpack.packb(data, default=CacheCodec.to_primitive, use_bin_type=True)
+        else:
+            payload = json.dumps(data, default=CacheCodec.to_primitive, separators=(",", ":")).encode()
+
+        compression = COMPRESSION_NONE
+        if len(payload) >= settings.redis.cache_compression_threshold:
+            compression = CacheCodec.__compression_id()
+            if compression == COMPRESSION_ZSTD:
+                payload = zstandard.ZstdCompressor(level=settings.redis.cache_compression_level).compress(payload)
+            elif compression == COMPRESSION_LZ4:
+                payload = lz4_frame.compress(payload)
+
+        return bytes((FORMAT_VERSION, codec, compression)) + payload
+
+    @staticmethod
+    def is_readable(raw: bytes | str) -> bool:
+        """
+        Whether this host has the libraries `raw` was encoded with. orjson entries are plain JSON and always are.
+        """
+        if isinstance(raw, str) or raw[0] != FORMAT_VERSION:
+            return True
+        codec, compression = raw[1], raw[2]
+        if codec == CODEC_MSGPACK and msgpack is None:
+            return False
+        if compression == COMPRESSION_ZSTD and zstandard is None:
+            return False
+        if compression == COMPRESSION_LZ4 and lz4_frame is None:
+            return False
+        return True
+
+    @staticmethod
+    def decode(raw: bytes | str) -> Any:
+        if isinstance(raw, str) or raw[0] != FORMAT_VERSION:
+            # Entry written before the codec existed
+            return json.loads(raw)
+
+        CacheCodec.__check_readable(raw)
+        codec, payload = raw[1], CacheCodec.__decompress(compression=raw[2], payload=raw[3:])
+        if codec == CODEC_ORJSON and orjson is not None:
+            return orjson.loads(payload)
+        if codec == CODEC_MSGPACK:
+            return msgpack.unpackb(payload, raw=False)
+        return json.loads(payload)
+
+    @staticmethod
+    def to_json(raw: bytes) -> bytes:
+        """
+        Returns an encoded entry as a JSON document. Entries stored as JSON are only decompressed, never parsed.
+        """
+        if raw[0] != FORMAT_VERSION:
+            return raw
+
+        CacheCodec.__check_readable(raw)
+        codec, payload = raw[1], CacheCodec.__decompress(compression=raw[2], payload=raw[3:])
+        if codec in (CODEC_JSON, CODEC_ORJSON):
+            return payload
+        return CacheCodec.dumps_json(CacheCodec.decode(raw))
+
+    @staticmethod
+    def __check_readable(raw: bytes):
+        if not CacheCodec.is_readable(raw):
+            raise ValueError(f"Cache entry encoded with codec {raw[1]} and compression {raw[2]}, not installed on this host")
+
+    @staticmethod
+    def __decompress(compression: int, payload: bytes) -> bytes:
+        if compression == COMPRESSION_ZSTD:
+            return zstandard.ZstdDecompressor().decompress(payload)
+        if compression == COMPRESSION_LZ4:
+            return lz4_frame.decompress(payload)
+        return payload
+
+    @staticmethod
+    def __codec_id() -> int:
+        codec = settings.redis.cache_codec.lower()
+        if codec == "orjson" and orjson is not None:
+            return CODEC_ORJSON
+        if codec == "msgpack" and msgpack is not None:
+            return CODEC_MSGPACK
+        return CODEC_JSON
+
+    @staticmethod
+    def __compression_id() -> int:
+        compression = settings.redis.cache_compression.lower()
+        if compression == "zstd" and zstandard is not None:
+            return COMPRESSION_ZSTD
+        if compression == "lz4" and lz4_frame is not None:
+            return COMPRESSION_LZ4
+        return COMPRESSION_NONE
@@ -1,5 +1,4 @@
 import subprocess
-from PIL import Image, UnidentifiedImageError
 from fastapi import UploadFile
 import uuid
 
@@ -19,6 +18,9 @@ class FileManipulator:
 
     @staticmethod
     def is_image(file_path: str) -> bool:
+        # Pillow is imported on first upload rather than with the app
+        from PIL import Image, UnidentifiedImageError
+
         try:
             with Image.open(file_path) as img:
                 img.verify()  # Verifies image integrity
@@ -0,0 +1,105 @@
+from typing import Iterable
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload, raiseload
+
+from freelance_marketplace.api.services.redis import Redis
+from freelance_marketplace.models.sql.sql_tables import Services, Requests, Milestones, Order, Proposal, Review
+
+# Relationships rendered by each endpoint, loaded with the rows instead of per row.
+# Many-to-one relationships are joined into the page query, collections cost one extra IN query each,
+# so a page runs the same number of statements whatever its size.
+LOADING_PROFILES: dict[str, tuple] = {
+    "service_card": (
+        joinedload(Services.status),
+        joinedload(Services.freelancer),
+        joinedload(Services.sub_category),
+    ),
+    "service_detail": (
+        joinedload(Services.status),
+        joinedload(Services.freelancer),
+        joinedload(Services.sub_category),
+        selectinload(Services.milestones),
+    ),
+    "request_card": (
+        joinedload(Requests.request_status),
+        joinedload(Requests.client),
+        joinedload(Requests.sub_category),
+    ),
+    "request_detail": (
+        joinedload(Requests.request_status),
+        joinedload(Requests.client),
+        joinedload(Requests.sub_category),
+        selectinload(Requests.milestones),
+    ),
+    "milestone_card": (
+        joinedload(Milestones.milestone_status),
+    ),
+    "milestone_detail": (
+        joinedload(Milestones.milestone_status),
+        joinedload(Milestones.freelancer),
+        joinedload(Milestones.client),
+        selectinload(Milestones.requests),
+        selectinload(Milestones.services),
+        selectinload(Milestones.orders),
+        selectinload(Milestones.proposals),
+    ),
+    "order_card": (
+        joinedload(Order.status),
+        joinedload(Order.service),
+        joinedload(Order.client),
+    ),
+    "proposal_card": (
+        joinedload(Proposal.status),
+        joinedload(Proposal.request),
+        joinedload(Proposal.freelancer),
+    ),
+    "review_card": (
+        joinedload(Review.reviewer),
+        joinedload(Review.reviewee),
+    ),
+}
+
+# Cache prefix of the rows each profile embeds ({relationship: prefix}): a cached entry rendering them is
+# tagged with their ids, so a write to the user, sub-category, status or service shown evicts it.
+PROFILE_TAGS: dict[str, dict[str, str]] = {
+    "service_card": {"status": "service_status", "freelancer": "users", "sub_category": "subcategories"},
+    "request_card": {"request_status": "request_status", "client": "users", "sub_category": "subcategories"},
+    "milestone_card": {"milestone_status": "milestone_status"},
+    "milestone_detail": {
+        "milestone_status": "milestone_status",
+        "freelancer": "users",
+        "client": "users",
+        "requests": "requests",
+        "services": "services",
+        "orders": "orders",
+        "proposals": "proposals",
+    },
+    "order_card": {"status": "order_status", "service": "services", "client": "users"},
+    "proposal_card": {"status": "proposal_status", "request": "requests", "freelancer": "users"},
+    "review_card": {"reviewer": "users", "reviewee": "users"},
+}
+
+
+def get_loading_options(profile: str | None) -> tuple:
+    """
+    Loader options of a LOADING_PROFILES entry. Relationships the profile leaves out raise on access
+    rather than lazy loading, which would be one query per row (and fails outright on an async session).
+    """
+    if profile is None:
+        return ()
+    return *LOADING_PROFILES[profile], raiseload("*")
+
+
+def get_embedded_tags(profile: str, rows: Iterable) -> list[str]:
+    """
+    Entity tags of the PROFILE_TAGS relationships embedded in `rows`, loaded with `profile`.
+    """
+    ids: dict[str, set] = {}
+    for row in rows:
+        for relationship, prefix in PROFILE_TAGS.get(profile, {}).items():
+            related = getattr(row, relationship)
+            for item in related if isinstance(related, list) else (related,):
+                if item is not None:
+                    ids.setdefault(prefix, set()).add(inspect(item).identity[0])
+    return [tag for prefix, prefix_ids in ids.items() for tag in Redis.generate_entity_tags(prefix=prefix, ids=sorted(prefix_ids))]
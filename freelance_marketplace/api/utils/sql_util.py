@@ -1,12 +1,37 @@
-from typing import Any
+import base64
+import json
+from datetime import datetime
+from functools import cache
+from typing import Any, Callable
 
 from fastapi import HTTPException
-from sqlalchemy import select, Select, update, Result, CursorResult
+from pydantic import BaseModel, ValidationError, create_model
+from sqlalchemy import select, Select, update, Result, CursorResult, inspect, tuple_, func, or_, and_, ARRAY, text, \
+    insert, cast, column as column_clause, values as values_clause
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from freelance_marketplace.models.sql.sql_tables import Order, Proposal, Requests, Services
+from freelance_marketplace.api.utils.loading_profiles import get_loading_options
+from freelance_marketplace.core.config import settings
+from freelance_marketplace.models.sql.request_model.BatchRequest import BatchRequest
+from freelance_marketplace.models.sql.sql_tables import Order, Proposal, Requests, Services, SEARCH_CONFIG, FacetCount
 from freelance_marketplace.models.enums.orderStatus import OrderStatus as OrderStatusEnum
 
+# Filter DSL operators: "filter=column:operator:value[,value]"
+FILTER_OPERATORS: dict[str, Callable] = {
+    "eq": lambda column, values: column == values[0],
+    "gt": lambda column, values: column > values[0],
+    "gte": lambda column, values: column >= values[0],
+    "lt": lambda column, values: column < values[0],
+    "lte": lambda column, values: column <= values[0],
+    "between": lambda column, values: column.between(values[0], values[1]),
+    "in": lambda column, values: column.in_(values),
+}
+FILTER_ARITY = {"eq": 1, "gt": 1, "gte": 1, "lt": 1, "lte": 1, "between": 2}
+
+# Per-column whitelists, see the FILTER_COLUMNS of each *Logic module
+RANGE_OPERATORS = ("eq", "gt", "gte", "lt", "lte", "between")
+SET_OPERATORS = ("eq", "in")
+
 
 async def build_transaction_query(object, query_params: dict) ->  Select[tuple[Any]] | Select:
     try:
@@ -18,21 +43,243 @@ async def build_transaction_query(object, query_params: dict) ->  Select[tuple[A
             if column_attr is None:
                 continue
 
-            if isinstance(value, str):
+            if isinstance(value, list) and isinstance(column_attr.type, ARRAY):
+                # "<column>_match": "all" requires every value, otherwise any of them
+                if query_params.get(f"{key}_match") == "all":
+                    transaction = transaction.where(column_attr.contains(value))
+                else:
+                    transaction = transaction.where(column_attr.overlap(value))
+            elif isinstance(value, str):
                 transaction = transaction.where(column_attr == value.lower())
             else:
                 transaction = transaction.where(column_attr == value)
+
+        # Filter AST built by parse_filters
+        for key, operator, values in query_params.get("filter") or ():
+            transaction = transaction.where(FILTER_OPERATORS[operator](getattr(object, key), values))
         return transaction
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-async def soft_delete(
+async def fetch_page(object, query_params: dict, db: AsyncSession, profile: str | None = None) -> dict:
+    """
+    Runs the build_transaction_query filters as one keyset page, ordered by the query_params "sort"
+    (see parse_filters), newest first by default, with the primary key as tie-breaker.
+    query_params "cursor" resumes after the last row of the previous page and "limit" is capped to the max page size.
+    Rows with a NULL sort value cannot be paged through and are left out.
+    `profile` names the LOADING_PROFILES relationships loaded with the rows.
+    Returns {"items": [...], "next_cursor": str | None}.
+    """
+    limit = get_page_size(query_params.get("limit"))
+    primary_key = inspect(object).primary_key[0]
+    sort = [(getattr(object, key), direction == "desc") for key, direction in query_params.get("sort") or ()]
+    sort = sort or [(object.creation_date, True)]
+    sort.append((primary_key, sort[0][1]))
+
+    transaction = await build_transaction_query(object=object, query_params=query_params)
+    for column, _ in sort[:-1]:
+        transaction = transaction.where(column.isnot(None))
+    cursor = query_params.get("cursor")
+    if cursor:
+        values = decode_cursor(cursor=cursor, columns=[column for column, _ in sort])
+        transaction = transaction.where(get_keyset_condition(sort=sort, values=values))
+    transaction = (
+        transaction
+        .order_by(*(column.desc() if descending else column.asc() for column, descending in sort))
+        .limit(limit + 1)
+        .options(*get_loading_options(profile))
+    )
+
+    result = await db.execute(transaction)
+    rows = result.scalars().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(values=[getattr(rows[-1], column.key) for column, _ in sort])
+    return {"items": rows, "next_cursor": next_cursor}
+
+def get_keyset_condition(sort: list[tuple], values: list):
+    """
+    Rows strictly after `values` in the `sort` order. A single row comparison when all columns go
+    the same direction (matches a composite index), expanded into OR-ed prefixes otherwise.
+    """
+    if len({descending for _, descending in sort}) == 1:
+        columns, last_values = tuple_(*(column for column, _ in sort)), tuple_(*values)
+        return columns < last_values if sort[0][1] else columns > last_values
+
+    conditions = []
+    for index, (column, descending) in enumerate(sort):
+        equal = [previous == value for (previous, _), value in zip(sort[:index], values)]
+        conditions.append(and_(*equal, column < values[index] if descending else column > values[index]))
+    return or_(*conditions)
+
+def parse_filters(query_params: dict, filter_columns: dict, sort_columns: tuple) -> dict:
+    """
+    Normalizes the "filter" (["column:operator:value[,value]", ...]) and "sort" ("-column,column") query params
+    into a sorted filter AST and a sort spec, checked against the per-column whitelists of the endpoint.
+    Equivalent queries normalize to the same values, and so to the same cache key.
+    """
+    allowed = {column.key: (column, operators) for column, operators in filter_columns.items()}
+    filters = []
+    for expression in query_params.get("filter") or []:
+        key, _, expression = expression.partition(":")
+        operator, _, raw_values = expression.partition(":")
+        if key not in allowed or operator not in allowed[key][1]:
+            raise HTTPException(status_code=400, detail=f"Unsupported filter {key}:{operator}")
+
+        column = allowed[key][0]
+        values = tuple(coerce_value(column=column, value=value) for value in raw_values.split(","))
+        if operator == "in":
+            values = tuple(sorted(set(values)))
+        elif len(values) != FILTER_ARITY[operator]:
+            raise HTTPException(status_code=400, detail=f"{operator} expects {FILTER_ARITY[operator]} value(s)")
+        filters.append((key, operator, values))
+
+    sortable = {column.key for column in sort_columns}
+    sort = []
+    for key in (query_params.get("sort") or "").split(","):
+        key = key.strip()
+        if not key:
+            continue
+        direction = "desc" if key.startswith("-") else "asc"
+        key = key.lstrip("+-")
+        if key not in sortable:
+            raise HTTPException(status_code=400, detail=f"Unsupported sort {key}")
+        sort.append((key, direction))
+
+    return {**query_params, "filter": tuple(sorted(filters)) or None, "sort": tuple(sort) or None}
+
+def coerce_value(column, value: str):
+    try:
+        python_type = column.type.python_type
+        if python_type is bool:
+            return value.lower() in ("true", "1")
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is str:
+            return value.lower()
+        return python_type(value)
+    except Exception:
+        raise HTTPException(status_code=400, detail=f"Invalid value {value} for {column.key}")
+
+async def fetch_search_page(
         object,
-        attribute: str,
-        object_id: int,
-        db: AsyncSession
-) -> Result | CursorResult:
+        query_params: dict,
+        search: str,
+        db: AsyncSession,
+        profile: str | None = None
+) -> dict:
+    """
+    Ranked search over a table with a search_vector column (see SEARCH_VECTOR_FUNCTION), combined with
+    the build_transaction_query filters. Rows match the full-text query or are similar to the title (pg_trgm),
+    best matches first, with the `profile` relationships loaded (see fetch_page).
+    Returns the first "limit" results as {"items": [...]}.
+    """
+    limit = get_page_size(query_params.get("limit"))
+    primary_key = inspect(object).primary_key[0]
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, search)
+    rank = func.ts_rank_cd(object.search_vector, ts_query) + func.similarity(object.title, search)
+
+    transaction = await build_transaction_query(object=object, query_params=query_params)
+    transaction = (
+        transaction
+        .where(or_(object.search_vector.op("@@")(ts_query), object.title.op("%")(search)))
+        .order_by(rank.desc(), primary_key.desc())
+        .limit(limit)
+        .options(*get_loading_options(profile))
+    )
+    result = await db.execute(transaction)
+    return {"items": result.scalars().all()}
+
+async def fetch_facets(object, status_column, query_params: dict, db: AsyncSession, size: int = 50) -> dict:
+    """
+    Tag and sub-category counts of the live rows matching query_params.
+    Sub-category and status filters are answered from the facet_counts summary table; any other filter
+    (e.g. tags) needs the rows themselves and is aggregated over them instead, with the same conditions.
+    """
+    sub_category_id = query_params.get("sub_category_id")
+    status_id = query_params.get(status_column.key)
+    summary_filters = {"sub_category_id", status_column.key}
+    row_filters = [
+        key for key, value in query_params.items()
+        if value is not None and key not in summary_filters and getattr(object, key, None) is not None
+    ]
+
+    if row_filters or query_params.get("filter"):
+        transaction = await build_transaction_query(
+            object=object,
+            query_params={**query_params, "deleted": False}
+        )
+        rows = transaction.subquery()
+        tag = func.unnest(rows.c.tags).label("tag")
+        tags = select(tag, func.count().label("count")).group_by(tag)
+        sub_categories = (
+            select(rows.c.sub_category_id, func.count().label("count"))
+            .group_by(rows.c.sub_category_id)
+        )
+    else:
+        conditions = [FacetCount.entity == object.__tablename__]
+        if sub_category_id is not None:
+            conditions.append(FacetCount.sub_category_id == sub_category_id)
+        if status_id is not None:
+            conditions.append(FacetCount.status_id == status_id)
+        count = func.sum(FacetCount.count).label("count")
+        tags = (
+            select(FacetCount.tag, count)
+            .where(*conditions, FacetCount.tag != "")
+            .group_by(FacetCount.tag)
+            .having(count > 0)
+        )
+        sub_categories = (
+            select(FacetCount.sub_category_id, count)
+            .where(*conditions, FacetCount.tag == "")
+            .group_by(FacetCount.sub_category_id)
+            .having(count > 0)
+        )
+
+    tags_result = await db.execute(tags.order_by(text("count DESC")).limit(size))
+    sub_categories_result = await db.execute(sub_categories.order_by(text("count DESC")))
+    return {
+        "tags": [{"tag": tag, "count": count} for tag, count in tags_result.all()],
+        "sub_categories": [
+            {"sub_category_id": sub_category_id, "count": count}
+            for sub_category_id, count in sub_categories_result.all()
+        ]
+    }
+
+def normalize_tags(tags: list[str] | None) -> list[str] | None:
+    if not tags:
+        return None
+    return sorted({tag.strip().lower() for tag in tags if tag.strip()}) or None
+
+def normalize_search(search: str) -> str:
+    return " ".join(search.lower().split())
+
+def get_page_size(limit: int | None) -> int:
+    if not limit:
+        return settings.sql.default_page_size
+    return max(1, min(limit, settings.sql.max_page_size))
+
+def encode_cursor(values: list) -> str:
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    payload = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
 
+def decode_cursor(cursor: str, columns: list) -> list:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+        if len(values) != len(columns):
+            raise ValueError("Cursor does not match the sort")
+        return [coerce_value(column=column, value=str(value)) for column, value in zip(columns, values)]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def build_soft_delete(object, attribute: str) -> tuple:
+    """
+    Returns the soft delete UPDATE of `object`, still to be filtered, and its `attribute` id column.
+    """
     object_id_column_attr = getattr(object, attribute, None)
     if object_id_column_attr is None:
         raise ValueError(f"Object does not have attribute {attribute}")
@@ -42,14 +289,216 @@ async def soft_delete(
     if status_id_column_attr is None:
         raise ValueError(f"Object does not have status attribute {status_id}")
 
-    stmt = (
-        update(object)
-        .where(object_id_column_attr == object_id)
-        .values(deleted=True)
-    )
-
+    stmt = update(object).values(deleted=True)
     if issubclass(object, (Order, Proposal, Requests, Services)):
         stmt = stmt.values({status_id_column_attr.key: OrderStatusEnum.CANCELED.value})
+    return stmt, object_id_column_attr
+
+async def soft_delete(
+        object,
+        attribute: str,
+        object_id: int,
+        db: AsyncSession,
+        returning: tuple = ()
+) -> Result | CursorResult:
+
+    stmt, object_id_column_attr = build_soft_delete(object=object, attribute=attribute)
+    stmt = stmt.where(object_id_column_attr == object_id)
+    if returning:
+        stmt = stmt.returning(*returning)
     result = await db.execute(stmt)
     await db.commit()
     return result
+
+def build_update(object, condition, columns: tuple):
+    """
+    Returns the UPDATE of the rows of `object` matching `condition`, still to be given its values, returning
+    the primary key, the new values of the cache tag `columns` and their previous values ("previous_<key>"),
+    read and locked in the same statement. See get_written_tag_dimensions.
+    """
+    primary_key = inspect(object).primary_key[0]
+    previous = select(primary_key, *columns).where(condition).with_for_update().cte("previous")
+    return (
+        update(object)
+        .where(primary_key == previous.c[primary_key.key])
+        .returning(primary_key, *columns, *(previous.c[column.key].label(f"previous_{column.key}") for column in columns))
+    )
+
+async def apply_batch(
+        object,
+        batch: BatchRequest,
+        model: type[BaseModel],
+        db: AsyncSession,
+        returning: tuple = (),
+        defaults: dict = None,
+        references: dict = None,
+        exclude: set = None
+) -> tuple[dict, list]:
+    """
+    Applies a BatchRequest with one statement per operation, without committing: a multi-row INSERT ... RETURNING,
+    an UPDATE ... FROM (VALUES ...) and a soft delete of all the ids.
+    Items are validated one by one against `model` and their `references` ({field: referenced column})
+    checked with one query per field, so a bad item is reported in "errors" instead of failing the whole
+    batch. `defaults` are added to every created row. Updates carry their primary key and only the fields
+    to change, the others are left as they are: one UPDATE per distinct set of fields.
+    Returns the report {"created": [ids], "updated": [ids], "deleted": [ids], "errors": [...]} and the
+    RETURNING rows (primary key and `returning` columns, plus their previous values for the updates) of every
+    write, for the cache invalidation.
+    """
+    if len(batch.create) + len(batch.update) + len(batch.delete) > settings.sql.max_batch_size:
+        raise HTTPException(status_code=400, detail=f"Batches are limited to {settings.sql.max_batch_size} items")
+
+    primary_key = inspect(object).primary_key[0]
+    errors = []
+    creates = validate_batch_items(items=batch.create, model=model, operation="create", errors=errors, exclude=exclude)
+    updates = validate_batch_items(
+        items=batch.update,
+        model=get_partial_model(model),
+        operation="update",
+        errors=errors,
+        exclude=exclude,
+        key=primary_key.key
+    )
+    for field, referenced in (references or {}).items():
+        wanted = {values[field] for _, _, values in creates + updates if values.get(field) is not None}
+        if not wanted:
+            continue
+        result = await db.execute(select(referenced).where(referenced.in_(wanted)))
+        missing = wanted - set(result.scalars().all())
+        for operation, index, values in creates + updates:
+            if values.get(field) in missing:
+                errors.append({"operation": operation, "index": index, "detail": f"{field} {values[field]} not found"})
+        creates = [item for item in creates if item[2].get(field) not in missing]
+        updates = [item for item in updates if item[2].get(field) not in missing]
+
+    rows = []
+    created = []
+    if creates:
+        result = await db.execute(
+            insert(object)
+            .values([{**values, **(defaults or {})} for _, _, values in creates])
+            .returning(primary_key, *returning)
+        )
+        created = result.all()
+        rows.extend(created)
+
+    updated = []
+    if updates:
+        groups: dict[tuple, list] = {}
+        for item in updates:
+            groups.setdefault(tuple(item[2]), []).append(item)
+        for keys, items in groups.items():
+            data = (
+                values_clause(*(column_clause(key, object.__table__.c[key].type) for key in keys), name="batch")
+                .data([tuple(values[key] for key in keys) for _, _, values in items])
+            )
+            result = await db.execute(
+                build_update(
+                    object=object,
+                    condition=primary_key.in_([values[primary_key.key] for _, _, values in items]),
+                    columns=returning
+                )
+                .where(primary_key == cast(data.c[primary_key.key], primary_key.type))
+                .values({key: cast(data.c[key], object.__table__.c[key].type) for key in keys if key != primary_key.key})
+                .execution_options(synchronize_session=False)
+            )
+            updated.extend(result.all())
+        rows.extend(updated)
+        found = {row[0] for row in updated}
+        errors.extend(
+            {"operation": "update", "index": index, "detail": "Not found"}
+            for _, index, values in updates if values[primary_key.key] not in found
+        )
+
+    deleted = []
+    if batch.delete:
+        stmt, id_column = build_soft_delete(object=object, attribute=primary_key.key)
+        result = await db.execute(
+            stmt
+            .where(id_column.in_(set(batch.delete)), object.deleted == False)
+            .returning(primary_key, *returning)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = result.all()
+        rows.extend(deleted)
+        found = {row[0] for row in deleted}
+        errors.extend(
+            {"operation": "delete", "index": index, "detail": "Not found or already deleted"}
+            for index, object_id in enumerate(batch.delete) if object_id not in found
+        )
+
+    report = {
+        "created": [row[0] for row in created],
+        "updated": [row[0] for row in updated],
+        "deleted": [row[0] for row in deleted],
+        "errors": sorted(errors, key=lambda error: (error["operation"], error["index"]))
+    }
+    return report, rows
+
+def validate_batch_items(
+        items: list[dict],
+        model: type[BaseModel],
+        operation: str,
+        errors: list,
+        exclude: set = None,
+        key: str = None
+) -> list[tuple[str, int, dict]]:
+    """
+    Validates the items of one batch operation, appending the invalid ones to `errors`.
+    With a `key` (the primary key of updates) the item must carry it, once per batch, and only the fields
+    it sets are kept.
+    Returns (operation, index, column values) of the valid items.
+    """
+    valid = []
+    seen = set()
+    for index, item in enumerate(items):
+        try:
+            values = model.model_validate(item).model_dump(exclude=exclude, exclude_unset=key is not None)
+        except ValidationError as e:
+            errors.append({
+                "operation": operation,
+                "index": index,
+                "detail": e.errors(include_url=False, include_context=False, include_input=False)
+            })
+            continue
+        if key:
+            object_id = item.get(key)
+            if not isinstance(object_id, int) or object_id in seen:
+                errors.append({"operation": operation, "index": index, "detail": f"Missing or duplicated {key}"})
+                continue
+            seen.add(object_id)
+            if not values:
+                errors.append({"operation": operation, "index": index, "detail": "No field to update"})
+                continue
+            values = {key: object_id, **values}
+        valid.append((operation, index, values))
+    return valid
+
+@cache
+def get_partial_model(model: type[BaseModel]) -> type[BaseModel]:
+    """
+    `model` with every field optional, for the updates of apply_batch. Defaults are not validated, a field
+    left out is not set, while an explicit null still has to be valid for the field.
+    """
+    fields = {name: (field.annotation, None) for name, field in model.model_fields.items()}
+    return create_model(f"Partial{model.__name__}", __base__=model, **fields)
+
+def get_tag_dimensions(row, columns: tuple) -> dict:
+    """
+    Returns the cache tag dimensions (e.g. sub_category_id, freelancer_id) of an ORM object or a RETURNING row.
+    """
+    return {column.key: getattr(row, column.key) for column in columns}
+
+def get_written_tag_dimensions(row, columns: tuple) -> list[dict]:
+    """
+    Returns the cache tag dimensions touched by a write: those of `row` and, for a build_update row moved to
+    another dimension value (e.g. sub_category_id), the previous ones, whose entries (facets included) still
+    count the row.
+    """
+    dimensions = [get_tag_dimensions(row, columns)]
+    mapping = row._mapping if hasattr(row, "_mapping") else {}
+    if all(f"previous_{column.key}" in mapping for column in columns):
+        previous = {column.key: mapping[f"previous_{column.key}"] for column in columns}
+        if previous != dimensions[0]:
+            dimensions.append(previous)
+    return dimensions
@@ -1,7 +1,6 @@
 import os
 
 from dotenv import load_dotenv
-from pycardano import Network
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
 load_dotenv()
@@ -29,6 +28,14 @@ class Redis(BaseSettings):
     port: str = "6379"
     host: str = "localhost"
     decode_responses: bool = True
+    lock_timeout_ms: int = 5000
+    xfetch_beta: float = 1.0
+    local_cache_max_size: int = 1024
+    local_cache_ttl: int = 300
+    cache_codec: str = "orjson"  # json, orjson or msgpack
+    cache_compression: str = "zstd"  # none, zstd or lz4
+    cache_compression_threshold: int = 16384  # bytes
+    cache_compression_level: int = 3
 
     class Config:
         env_prefix = "REDIS_"
@@ -37,6 +44,20 @@ class Redis(BaseSettings):
 
 class SQL(BaseSettings):
     connection_string: str = ""
+    default_page_size: int = 50
+    max_page_size: int = 200
+    max_batch_size: int = 500  # items per batch endpoint request
+    echo: bool = False
+    pool_size: int = 10  # per worker
+    max_overflow: int = 10
+    pool_timeout: int = 30  # seconds
+    pool_recycle: int = 1800  # seconds
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100  # asyncpg prepared statements per connection, 0 behind pgbouncer
+    statement_timeout_ms: int = 30000
+    replica_connection_string: str = ""  # read replicas, empty to read from the primary
+    read_your_writes_seconds: int = 5  # a client that wrote keeps reading from the primary for this long
+    seed_on_startup: bool = True  # False leaves schema and seeding to alembic and the seed CLI
 
     class Config:
         env_prefix = "SQL_"
@@ -80,12 +101,27 @@ class CardanoSubmitAPI(BaseSettings):
 class Ogmios(BaseSettings):
     host: str = ""
     port: str = ""
+    epoch_check_interval: int = 60  # seconds, how often the shared chain context checks for a new epoch
+    request_timeout: int = 30  # seconds a chain call may take before it is abandoned
+    executor_workers: int = 8  # threads running the synchronous chain calls
 
     class Config:
         env_prefix = "OGMIOS_"
         env_file = ".env"
         extra = "ignore"
 
+class ChainSync(BaseSettings):
+    pipeline: int = 50  # nextBlock requests in flight
+    checkpoint_depth: int = 32  # recent points kept to resume from after a rollback
+    pending_timeout: int = 3600  # seconds before an unseen PendingTransaction times out
+    reconnect_delay: int = 5  # seconds
+    reconcile_interval: int = 30  # seconds between full scans of a script address on an index miss
+
+    class Config:
+        env_prefix = "CHAIN_SYNC_"
+        env_file = ".env"
+        extra = "ignore"
+
 class CardanoNode(BaseSettings):
     socket_path: str = ""
     class Config:
@@ -94,6 +130,8 @@ class CardanoNode(BaseSettings):
 class WalletKeys(BaseSettings):
     skey_encrypted: str = ""
     vkey: str = ""
+    signer_ttl: int = 900  # seconds the decrypted signing key stays in memory, 0 to keep it until shutdown
+    signer_socket: str = ""  # unix socket of an out-of-process signer, empty to sign in this process
 
     class Config:
         env_prefix = "KEY_"
@@ -101,22 +139,35 @@ class WalletKeys(BaseSettings):
         extra = "ignore"
 
 class Blockchain(BaseSettings):
-    network: Network = Network.TESTNET
+    network: str = "testnet"
 
     @field_validator("network", mode="before")
     @classmethod
     def parse_network(cls, value):
-        if isinstance(value, Network):
-            return value
         if isinstance(value, str) and value.lower() == "testnet":
-            return Network.TESTNET
-        return Network.MAINNET
+            return "testnet"
+        return "mainnet"
+
+    @property
+    def cardano_network(self):
+        # pycardano is only imported by the code talking to the chain
+        from pycardano import Network
+        return Network.TESTNET if self.network == "testnet" else Network.MAINNET
 
     class Config:
         env_prefix = "BLOCKCHAIN_"
         env_file = ".env"
         extra = "ignore"
 
+class Workers(BaseSettings):
+    router_profile: str = "all"  # routers served by this worker: api, chain or all, see ROUTER_PROFILES
+    loop_lag_interval: float = 0.5  # seconds between event loop lag probes
+
+    class Config:
+        env_prefix = "WORKER_"
+        env_file = ".env"
+        extra = "ignore"
+
 class Settings(BaseSettings):
     fastapi: FastAPISettings = FastAPISettings()
     mongo: Mongo = Mongo()
@@ -127,8 +178,10 @@ class Settings(BaseSettings):
     services: Services = Services()
     cardano_node: CardanoNode = CardanoNode()
     ogmios: Ogmios = Ogmios()
+    chain_sync: ChainSync = ChainSync()
     wallet_keys: WalletKeys = WalletKeys()
     blockchain: Blockchain = Blockchain()
+    workers: Workers = Workers()
 
 
     class Config:
@@ -1,19 +1,79 @@
+import time
+
+from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import (AsyncSession,
-                                    create_async_engine, async_sessionmaker)
+                                    create_async_engine, async_sessionmaker, AsyncEngine)
 from sqlalchemy.ext.declarative import declarative_base
 from freelance_marketplace.core.config import settings
+from freelance_marketplace.db.sql.pool_metrics import MeteredQueuePool
 Base = declarative_base()
 
+# Set on responses to writes, pins the client to the primary until the replicas caught up
+PRIMARY_UNTIL_COOKIE = "db_primary_until"
+
+
+def create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=settings.sql.echo,
+        future=True,
+        poolclass=MeteredQueuePool,
+        pool_size=settings.sql.pool_size,
+        max_overflow=settings.sql.max_overflow,
+        pool_timeout=settings.sql.pool_timeout,
+        pool_recycle=settings.sql.pool_recycle,
+        pool_pre_ping=settings.sql.pool_pre_ping,
+        connect_args={
+            # asyncpg's own statement cache and SQLAlchemy's prepared statement cache on top of it
+            "statement_cache_size": settings.sql.statement_cache_size,
+            "prepared_statement_cache_size": settings.sql.statement_cache_size,
+            "server_settings": {"statement_timeout": str(settings.sql.statement_timeout_ms)},
+        },
+    )
+
 DATABASE_URL = settings.sql.connection_string
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+engine = create_engine(DATABASE_URL)
+replica_engine = create_engine(settings.sql.replica_connection_string) if settings.sql.replica_connection_string else engine
 
 AsyncSessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+ReplicaSessionLocal = async_sessionmaker(bind=replica_engine, expire_on_commit=False, class_=AsyncSession)
+
+def get_session_factory(db: AsyncSession) -> async_sessionmaker:
+    """
+    Session factory of the database `db` is bound to, for work that must not use the session itself.
+    """
+    return ReplicaSessionLocal if db.bind is replica_engine and replica_engine is not engine else AsyncSessionLocal
 
 async def init_db():
     async with engine.begin() as conn:
         print(Base.metadata.tables)
         await conn.run_sync(Base.metadata.create_all)
 
-async def get_sql_db():
+async def get_sql_db(request: Request, response: Response):
+    """
+    Session on the primary. Writes pin the client to the primary for read_your_writes_seconds.
+    """
+    if request.method not in ("GET", "HEAD", "OPTIONS") and replica_engine is not engine:
+        window = settings.sql.read_your_writes_seconds
+        response.set_cookie(
+            PRIMARY_UNTIL_COOKIE,
+            str(time.time() + window),
+            max_age=window,
+            httponly=True,
+            samesite="lax"
+        )
     async with AsyncSessionLocal() as session:
         yield session
+
+async def get_read_sql_db(request: Request):
+    """
+    Read-only session for GET routes, on the replicas unless the client wrote recently.
+    """
+    try:
+        primary_until = float(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+    except ValueError:
+        primary_until = 0
+
+    session_factory = AsyncSessionLocal if primary_until > time.time() else ReplicaSessionLocal
+    async with session_factory() as session:
+        yield session
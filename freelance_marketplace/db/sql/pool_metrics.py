@@ -0,0 +1,71 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """
+    Connection checkout latency and saturation of this worker's pool, to size pool_size / max_overflow.
+    """
+
+    # Upper bounds in ms of the checkout latency histogram
+    BUCKETS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.__histogram = [0] * (len(self.BUCKETS) + 1)
+
+    def checkout(self, wait: float):
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        wait_ms = wait * 1000
+        self.__histogram[next((index for index, bound in enumerate(self.BUCKETS) if wait_ms <= bound), -1)] += 1
+
+    def timeout(self):
+        self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        capacity = pool.size() + pool.max_overflow
+        return {
+            "size": pool.size(),
+            "max_overflow": pool.max_overflow,
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "idle": pool.checkedin(),
+            "saturation": round(pool.checkedout() / capacity, 4) if capacity > 0 else None,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else None,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+            "wait_histogram_ms": {
+                **{f"<={bound}": count for bound, count in zip(self.BUCKETS, self.__histogram)},
+                f">{self.BUCKETS[-1]}": self.__histogram[-1]
+            }
+        }
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool timing how long each checkout waits for a connection.
+    """
+
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        # QueuePool only keeps it private
+        self.max_overflow = max_overflow
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeout()
+            raise
+        self.metrics.checkout(time.perf_counter() - start)
+        return connection
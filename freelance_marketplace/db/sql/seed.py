@@ -0,0 +1,145 @@
+"""
+Seeds the reference rows (roles, statuses, categories, skills...) from a precompiled snapshot.
+
+The skills are compiled from api_file_utilities/*.xlsx into api_file_utilities/seed_snapshot.json.gz,
+so seeding never parses spreadsheets. The database records the hash of the snapshot it was seeded with
+and is only seeded again when the snapshot changes.
+
+    poetry run python -m freelance_marketplace.db.sql.seed compile  # after editing the xlsx files
+    poetry run python -m freelance_marketplace.db.sql.seed check    # fails if the snapshot is stale
+    poetry run python -m freelance_marketplace.db.sql.seed apply    # create_all and seed, once per snapshot
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+from sqlalchemy import select, func
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from freelance_marketplace.db.sql.database import AsyncSessionLocal, init_db
+from freelance_marketplace.models.sql.sql_tables import Role, User, MilestoneStatus, WalletTypes, RequestStatus, \
+    ServiceStatus, ProposalStatus, OrderStatus, Category, SubCategory, Skills, SeedVersion
+
+ROOT_DIR = Path(__file__).resolve().parents[3]
+SNAPSHOT_PATH = ROOT_DIR / "api_file_utilities" / "seed_snapshot.json.gz"
+# (xlsx file, skill columns)
+SKILL_SOURCES = (
+    ("api_file_utilities/technology_skills.xlsx", [2]),
+    ("api_file_utilities/knowledge.xlsx", [3]),
+)
+SNAPSHOT_FORMAT = 1
+# Bump when the default rows of the seed_* classmethods change, so seeded databases pick them up
+SEED_VERSION = 1
+SEED_NAME = "reference_data"
+# pg_advisory_xact_lock key, one worker seeds while the others wait
+SEED_LOCK_ID = 4_240_917
+
+
+def get_sources_hash() -> str:
+    digest = hashlib.sha256()
+    for file_path, columns in SKILL_SOURCES:
+        digest.update(f"{file_path}:{columns}".encode())
+        digest.update((ROOT_DIR / file_path).read_bytes())
+    return digest.hexdigest()
+
+
+async def compile_snapshot() -> dict:
+    """
+    Parses the xlsx sources and writes the snapshot. Deterministic: the same sources give the same bytes.
+    """
+    # Build time only, keeps pandas/openpyxl out of the workers
+    from freelance_marketplace.api.utils.file_manipulation import FileTransformer
+
+    skills = set()
+    for file_path, columns in SKILL_SOURCES:
+        skills.update(await FileTransformer.get_file_content(file_path, columns=columns))
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "sources_hash": get_sources_hash(),
+        "skills": sorted(skills),
+    }
+    payload = json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")).encode()
+    SNAPSHOT_PATH.write_bytes(gzip.compress(payload, compresslevel=9, mtime=0))
+    return snapshot
+
+
+def load_snapshot() -> tuple[dict, str]:
+    """
+    Returns the snapshot and its seed hash, which also covers SEED_VERSION.
+    """
+    raw = SNAPSHOT_PATH.read_bytes()
+    snapshot = json.loads(gzip.decompress(raw))
+    if snapshot.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported seed snapshot format {snapshot.get('format')}, recompile it")
+    snapshot_hash = hashlib.sha256(f"{SEED_VERSION}:".encode() + raw).hexdigest()
+    return snapshot, snapshot_hash
+
+
+async def get_seeded_hash(session: AsyncSession) -> str | None:
+    try:
+        result = await session.execute(select(SeedVersion.snapshot_hash).where(SeedVersion.name == SEED_NAME))
+        return result.scalar_one_or_none()
+    except DBAPIError:
+        # seed_versions does not exist yet
+        await session.rollback()
+        return None
+
+
+async def seed_database(force: bool = False) -> bool:
+    """
+    Creates the tables and seeds the snapshot unless the database is already at its hash.
+    Returns whether anything was seeded; an up to date database costs a single SELECT.
+    """
+    snapshot, snapshot_hash = load_snapshot()
+    async with AsyncSessionLocal() as session:
+        if not force and await get_seeded_hash(session) == snapshot_hash:
+            return False
+
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        await session.execute(select(func.pg_advisory_xact_lock(SEED_LOCK_ID)))
+        # Another worker may have seeded while this one waited for the lock
+        if not force and await get_seeded_hash(session) == snapshot_hash:
+            return False
+
+        await Role.seed_roles(session)
+        await MilestoneStatus.seed_status(session)
+        await WalletTypes.seed_types(session)
+        await Skills.seed_skills(session, skills=snapshot["skills"])
+        await RequestStatus.seed_status(session)
+        await ServiceStatus.seed_status(session)
+        await ProposalStatus.seed_status(session)
+        await OrderStatus.seed_status(session)
+        await Category.seed_categories(session)
+        await SubCategory.seed_sub_categories(session)
+        await User.seed_users(session)
+        await session.merge(SeedVersion(name=SEED_NAME, snapshot_hash=snapshot_hash))
+        await session.commit()
+    return True
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Seed snapshot")
+    parser.add_argument("command", choices=("compile", "check", "apply"))
+    parser.add_argument("--force", action="store_true", help="apply even if the database is at the snapshot hash")
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        snapshot = await compile_snapshot()
+        print(f"Compiled {len(snapshot['skills'])} skills into {SNAPSHOT_PATH}")
+    elif args.command == "check":
+        snapshot, _ = load_snapshot()
+        if snapshot["sources_hash"] != get_sources_hash():
+            raise SystemExit(f"{SNAPSHOT_PATH} is stale, run the compile command")
+        print("Seed snapshot is up to date")
+    else:
+        seeded = await seed_database(force=args.force)
+        print("Database seeded" if seeded else "Database already at the seed snapshot")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,6 @@
+import asyncio
+import importlib
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -6,31 +9,42 @@ from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from freelance_marketplace.api.services.redis import redis_client
+from freelance_marketplace.api.services.loop_lag import loop_lag
+from freelance_marketplace.api.services.redis import redis_client, Redis
 from freelance_marketplace.core.config import settings
-from freelance_marketplace.middleware.response_wrapper import transform_response_middleware
+from freelance_marketplace.middleware.response_wrapper import TransformResponseMiddleware
 from dotenv import load_dotenv
-from freelance_marketplace.db.sql.database import init_db, AsyncSessionLocal
+from freelance_marketplace.db.sql.seed import seed_database
 from freelance_marketplace.db.no_sql.mongo import mongo_session
-from freelance_marketplace.api.routes.user_roles.user_roles import router as user_roles_router
-from freelance_marketplace.api.routes.reviews.reviews import router as reviews_router
-from freelance_marketplace.api.routes.profiles.profiles import router as profiles_router
-from freelance_marketplace.api.routes.portfolios.portfolio import router as portfolio_router
-from freelance_marketplace.api.routes.notifications.notifications import router as notifications_router
-from freelance_marketplace.api.routes.categories.categories import router as categories_router
-from freelance_marketplace.api.routes.sub_categories.subCategories import router as sub_categories_router
-from freelance_marketplace.api.routes.services.services import router as services_router
-from freelance_marketplace.api.routes.auth.auth import router as auth_router
-from freelance_marketplace.api.routes.requests.requests import router as requests_router
-from freelance_marketplace.api.routes.milestones.milestones import router as milestones_router
-from freelance_marketplace.api.routes.orders.orders import router as orders_router
-from freelance_marketplace.api.routes.proposals.proposals import router as proposals_router
-from freelance_marketplace.api.routes.transactions.transactions import router as transactions_router
-from freelance_marketplace.api.routes.conversations.conversations import router as conversations_router
-from freelance_marketplace.api.routes.users.users import router as users_router
-from freelance_marketplace.api.routes.scripts import router as hello_router
-from freelance_marketplace.models.sql.sql_tables import Role, User, MilestoneStatus, WalletTypes, RequestStatus, \
-    ServiceStatus, ProposalStatus, OrderStatus, Category, SubCategory, Skills
+
+# Router modules served by each WORKER_ROUTER_PROFILE, only the served ones are imported.
+# "chain" is the only profile importing pycardano.
+ROUTER_PROFILES = {
+    "chain": [
+        "freelance_marketplace.api.routes.scripts",
+    ],
+    "api": [
+        "freelance_marketplace.api.routes.user_roles.user_roles",
+        "freelance_marketplace.api.routes.users.users",
+        "freelance_marketplace.api.routes.profiles.profiles",
+        "freelance_marketplace.api.routes.notifications.notifications",
+        "freelance_marketplace.api.routes.portfolios.portfolio",
+        "freelance_marketplace.api.routes.categories.categories",
+        "freelance_marketplace.api.routes.sub_categories.subCategories",
+        "freelance_marketplace.api.routes.services.services",
+        "freelance_marketplace.api.routes.requests.requests",
+        "freelance_marketplace.api.routes.reviews.reviews",
+        "freelance_marketplace.api.routes.milestones.milestones",
+        "freelance_marketplace.api.routes.orders.orders",
+        "freelance_marketplace.api.routes.proposals.proposals",
+        "freelance_marketplace.api.routes.transactions.transactions",
+        "freelance_marketplace.api.routes.conversations.conversations",
+        "freelance_marketplace.api.routes.auth.auth",
+        "freelance_marketplace.api.routes.cache.cache",
+        "freelance_marketplace.api.routes.database.database",
+    ],
+}
+ROUTER_PROFILES["all"] = ROUTER_PROFILES["chain"] + ROUTER_PROFILES["api"]
 
 load_dotenv()
 origins = ["http://localhost:45002"]
@@ -56,25 +70,10 @@ app.add_middleware(
 # Apply Middlewares
 app.add_middleware(SlowAPIMiddleware)
 # app.middleware("http")(auth_middleware)
-app.middleware("http")(transform_response_middleware)
+app.add_middleware(TransformResponseMiddleware)
 
-app.include_router(hello_router, prefix="/api/v1")
-app.include_router(user_roles_router, prefix="/api/v1")
-app.include_router(users_router, prefix="/api/v1")
-app.include_router(profiles_router, prefix="/api/v1")
-app.include_router(notifications_router, prefix="/api/v1")
-app.include_router(portfolio_router, prefix="/api/v1")
-app.include_router(categories_router, prefix="/api/v1")
-app.include_router(sub_categories_router, prefix="/api/v1")
-app.include_router(services_router, prefix="/api/v1")
-app.include_router(requests_router, prefix="/api/v1")
-app.include_router(reviews_router, prefix="/api/v1")
-app.include_router(milestones_router, prefix="/api/v1")
-app.include_router(orders_router, prefix="/api/v1")
-app.include_router(proposals_router, prefix="/api/v1")
-app.include_router(transactions_router, prefix="/api/v1")
-app.include_router(conversations_router, prefix="/api/v1")
-app.include_router(auth_router, prefix="/api/v1")
+for router_module in ROUTER_PROFILES[settings.workers.router_profile]:
+    app.include_router(importlib.import_module(router_module).router, prefix="/api/v1")
 
 
 @app.on_event("startup")
@@ -85,24 +84,18 @@ async def startup():
     except Exception as e:
         print(f"Redis connection failed: {e}")
 
-    await init_db()
+    app.state.cache_invalidation_listener = asyncio.create_task(Redis.listen_invalidations())
+    app.state.loop_lag_monitor = asyncio.create_task(loop_lag.run())
+    if settings.sql.seed_on_startup:
+        # A single SELECT when the database is already at the seed snapshot
+        await seed_database()
     await mongo_session.init_mongo()
-    async with AsyncSessionLocal() as session:
-        await Role.seed_roles(session)
-        await MilestoneStatus.seed_status(session)
-        await WalletTypes.seed_types(session)
-        await Skills.seed_skills(session)
-        await RequestStatus.seed_status(session)
-        await ServiceStatus.seed_status(session)
-        await ProposalStatus.seed_status(session)
-        await OrderStatus.seed_status(session)
-        await Category.seed_categories(session)
-        await SubCategory.seed_sub_categories(session)
-        await User.seed_users(session)
 
 @app.on_event("shutdown")
 async def on_shutdown():
     print("shutting down")
+    app.state.cache_invalidation_listener.cancel()
+    app.state.loop_lag_monitor.cancel()
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="127.0.0.1", port=45001, reload=True)
@@ -1,68 +1,132 @@
-from fastapi import Response
-import time
 import datetime
-from fastapi import Request
 import json
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+EXCLUDED_PATHS = {"/docs", "/openapi.json", "/redoc"}
+EXCLUDED_METHODS = {"OPTIONS", "HEAD"}
+
 
-async def transform_response_middleware(request : Request, call_next):
+class TransformResponseMiddleware:
     """
-    Transforms the response by adding processing time and request ID.
-    It calculates the processing time, formats the response, and attaches it to the state.
-    This function ensures that the response is formatted consistently before being returned.
+    Wraps every response in the {status, code, data, timestamp, processing_time, metadata} envelope.
+    JSON bodies are never parsed: the envelope is spliced around them as a prefix and a suffix,
+    and the body chunks are streamed through as they come.
+    Other bodies are small (errors, plain text), they are buffered and encoded as a JSON string.
     """
-    if request.method == "OPTIONS":
-        response = await call_next(request)
-        return response
-
-    start_time = time.time()
-    if request.url.path in ["/docs", "/openapi.json", "/redoc"]:
-        return await call_next(request)
-
-
-    response = await call_next(request)
-
-    chunks = []
-    async for chunk in response.body_iterator:
-        chunks.append(chunk)
-    response_body = b''.join(chunks)
-
-    content = response_body.decode() if response_body else None
-
-    try:
-        data = json.loads(content) if content else None
-    except json.JSONDecodeError:
-        data = content
-
-    request.state.processing_time = round(time.time() - start_time, 4)
-    
-    formatted_response = {
-        "status": "success" if response.status_code < 400 else "error",
-        "code": response.status_code,
-        "data": data,
-        "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
-        "processing_time": request.state.processing_time,
-        "metadata": {
-            "api_version": "v1",
-            "path": request.url.path,
-            "method": request.method
-        }
-    }
-
-    request.state.formatted_response = formatted_response
-
-    modified_response = json.dumps(formatted_response).encode("utf-8")
-    response.headers["Content-Length"] = str(len(modified_response))
-
-    final_response = Response(
-        content=modified_response,
-        status_code=response.status_code,
-        headers=dict(response.headers),
-        media_type=response.media_type,
-    )
-
-    # Copy Set-Cookie headers manually
-    set_cookie_headers = [header for header in response.raw_headers if header[0].lower() == b'set-cookie']
-    for header in set_cookie_headers:
-        final_response.raw_headers.append(header)
-
-    return final_response
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] in EXCLUDED_METHODS or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.time()
+        start_message: Message = {}
+        prefix = suffix = b""
+        is_json = False
+        prefix_sent = False
+        buffered = []
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, prefix, suffix, is_json, prefix_sent
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = [(key, value) for key, value in message.get("headers", []) if key.lower() != b"content-length"]
+                content_type = next((value for key, value in headers if key.lower() == b"content-type"), b"")
+                is_json = TransformResponseMiddleware.__is_json(content_type=content_type)
+                if not is_json:
+                    return
+
+                prefix, suffix = TransformResponseMiddleware.__envelope(
+                    scope=scope,
+                    status_code=message["status"],
+                    start_time=start_time
+                )
+                content_length = next(
+                    (int(value) for key, value in message.get("headers", []) if key.lower() == b"content-length"),
+                    None
+                )
+                if content_length is not None:
+                    # An empty body is sent as "data": null
+                    length = len(prefix) + (content_length or len(b"null")) + len(suffix)
+                    headers.append((b"content-length", str(length).encode()))
+                await send({**message, "headers": headers})
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if not is_json:
+                buffered.append(body)
+                if not more_body:
+                    await TransformResponseMiddleware.__send_buffered(
+                        scope=scope,
+                        send=send,
+                        start_message=start_message,
+                        body=b"".join(buffered),
+                        start_time=start_time
+                    )
+                return
+
+            chunk = body
+            if not prefix_sent and (body or not more_body):
+                chunk = prefix + (body or b"null")
+                prefix_sent = True
+            if not more_body:
+                chunk += suffix
+            if chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def __is_json(content_type: bytes) -> bool:
+        media_type = content_type.split(b";")[0].strip().lower()
+        return media_type == b"application/json" or media_type.endswith(b"+json")
+
+    @staticmethod
+    def __envelope(scope: Scope, status_code: int, start_time: float) -> tuple[bytes, bytes]:
+        """
+        Returns the envelope bytes written before and after the "data" value.
+        """
+        head = json.dumps({
+            "status": "success" if status_code < 400 else "error",
+            "code": status_code,
+        })
+        tail = json.dumps({
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "processing_time": round(time.time() - start_time, 4),
+            "metadata": {
+                "api_version": "v1",
+                "path": scope["path"],
+                "method": scope["method"]
+            }
+        })
+        return f'{head[:-1]}, "data": '.encode("utf-8"), f', {tail[1:]}'.encode("utf-8")
+
+    @staticmethod
+    async def __send_buffered(scope: Scope, send: Send, start_message: Message, body: bytes, start_time: float):
+        prefix, suffix = TransformResponseMiddleware.__envelope(
+            scope=scope,
+            status_code=start_message["status"],
+            start_time=start_time
+        )
+        data = json.dumps(body.decode() if body else None).encode("utf-8")
+        content = prefix + data + suffix
+
+        headers = [
+            (key, value) for key, value in start_message.get("headers", [])
+            if key.lower() not in (b"content-length", b"content-type")
+        ]
+        headers.append((b"content-length", str(len(content)).encode()))
+        headers.append((b"content-type", b"application/json"))
+        await send({**start_message, "headers": headers})
+        await send({"type": "http.response.body", "body": content, "more_body": False})
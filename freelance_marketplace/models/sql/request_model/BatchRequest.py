@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+class BatchRequest(BaseModel):
+    # Items are validated one by one, see apply_batch
+    create: list[dict] = []
+    update: list[dict] = []
+    delete: list[int] = []
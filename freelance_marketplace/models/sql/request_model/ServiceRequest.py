@@ -1,8 +1,14 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 class ServiceRequest(BaseModel):
     title: str
     description: str
     sub_category_id: int
     total_price: float
-    tags: list[str]
\ No newline at end of file
+    tags: list[str]
+
+    @field_validator("tags")
+    @classmethod
+    def normalize_tags(cls, tags: list[str]) -> list[str]:
+        # Tags are filtered and faceted lowercased
+        return sorted({tag.strip().lower() for tag in tags if tag.strip()})
@@ -1,9 +1,8 @@
 from datetime import datetime, timezone
-from sqlalchemy import Boolean, ForeignKey, VARCHAR, Table, insert, TIMESTAMP, Float, ARRAY, \
-    DECIMAL, select, BigInteger, Enum
+from sqlalchemy import Boolean, ForeignKey, VARCHAR, Table, insert, TIMESTAMP, Float, \
+    DECIMAL, select, update, BigInteger, Enum, Index, text, event, DDL
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.dialects.postgresql import insert as p_insert
-from freelance_marketplace.api.utils.file_manipulation import FileTransformer
+from sqlalchemy.dialects.postgresql import insert as p_insert, TSVECTOR, ARRAY
 from freelance_marketplace.db.sql.database import Base
 from freelance_marketplace.models.enums.milestoneStatus import MilestoneStatus as MilestoneStatusEnum
 from freelance_marketplace.models.enums.userRole import UserRole
@@ -11,7 +10,7 @@ from freelance_marketplace.models.enums.walletType import WalletType as WalletTy
 from typing import List
 from sqlalchemy import Column, Integer, String, Text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import relationship, Mapped
+from sqlalchemy.orm import relationship, Mapped, deferred
 from starlette.exceptions import HTTPException
 from freelance_marketplace.models.enums.proposalStatus import ProposalStatus as ProposalStatusEnum
 from freelance_marketplace.models.enums.serviceStatus import ServiceStatus as ServiceStatusEnum
@@ -53,8 +52,92 @@ service_milestone_association = Table(
     Column('milestone_id', Integer, ForeignKey('milestones.milestone_id'))
 )
 
+# Full-text search over services and requests: search_vector is maintained by a trigger
+# (title > description > tags) and titles are fuzzy matched through pg_trgm.
+SEARCH_CONFIG = "english"
+
+SEARCH_VECTOR_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'B') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(array_to_string(NEW.tags, ' '), '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SEARCH_VECTOR_TRIGGER = (
+    "CREATE TRIGGER %(table)s_search_vector_trigger "
+    "BEFORE INSERT OR UPDATE OF title, description, tags ON %(table)s "
+    "FOR EACH ROW EXECUTE FUNCTION search_vector_update()"
+)
+
+# Tag and sub-category facet counts of live services and requests, kept in facet_counts by a trigger.
+# tag = '' holds the row count of a (sub_category_id, status_id) group.
+FACET_COUNTS_APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION facet_counts_apply(
+    p_entity text, p_sub_category_id integer, p_status_id integer, p_tags text[], p_delta integer
+) RETURNS void AS $$
+BEGIN
+    INSERT INTO facet_counts AS f (entity, sub_category_id, status_id, tag, count)
+    SELECT DISTINCT p_entity, p_sub_category_id, coalesce(p_status_id, -1), lower(t), p_delta
+    FROM unnest(array_append(coalesce(p_tags, '{}'), '')) AS t
+    ON CONFLICT (entity, sub_category_id, status_id, tag) DO UPDATE SET count = f.count + EXCLUDED.count;
+END
+$$ LANGUAGE plpgsql
+"""
+
+FACET_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION facet_counts_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND NOT OLD.deleted THEN
+        PERFORM facet_counts_apply(
+            TG_TABLE_NAME, OLD.sub_category_id, (to_jsonb(OLD) ->> TG_ARGV[0])::integer, OLD.tags, -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NOT NEW.deleted THEN
+        PERFORM facet_counts_apply(
+            TG_TABLE_NAME, NEW.sub_category_id, (to_jsonb(NEW) ->> TG_ARGV[0])::integer, NEW.tags, 1
+        );
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+FACET_COUNTS_TRIGGER = (
+    "CREATE TRIGGER %(table)s_facet_counts_trigger "
+    "AFTER INSERT OR UPDATE OF deleted, tags, sub_category_id, {status_column} OR DELETE ON %(table)s "
+    "FOR EACH ROW EXECUTE FUNCTION facet_counts_update('{status_column}')"
+)
+
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+event.listen(Base.metadata, "before_create", DDL(SEARCH_VECTOR_FUNCTION))
+event.listen(Base.metadata, "before_create", DDL(FACET_COUNTS_APPLY_FUNCTION))
+event.listen(Base.metadata, "before_create", DDL(FACET_COUNTS_FUNCTION))
+
+async def edit_returning(object, db: AsyncSession, condition, data: dict):
+    """
+    Updates the non-null `data` columns of the row matching `condition` with a single UPDATE ... RETURNING,
+    without committing. Returns the updated row, or None when there is no such row.
+    """
+    values = {key: value for key, value in data.items() if key in object.__table__.c and value is not None}
+    if not values:
+        result = await db.execute(select(object).where(condition))
+        return result.scalars().first()
+    result = await db.execute(update(object).where(condition).values(**values).returning(object))
+    return result.scalars().first()
+
 class User(Base):
     __tablename__ = "users"
+    # Keyset pages, see fetch_page
+    __table_args__ = (
+        Index("ix_users_creation", "creation_date", "user_id"),
+        Index("ix_users_role", "role_id", "creation_date", "user_id"),
+        Index("ix_users_wallet_type", "wallet_type_id", "creation_date", "user_id"),
+    )
 
     user_id = Column(Integer, primary_key=True, autoincrement=True)
     creation_date = Column(TIMESTAMP(timezone=True), nullable=False, default=datetime.now(timezone.utc))
@@ -92,14 +175,15 @@ class User(Base):
 
     ):
         try:
-            user = cls(
-                wallet_public_address=wallet_public_address,
-                wallet_type_id=wallet_type_id,
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    wallet_public_address=wallet_public_address,
+                    wallet_type_id=wallet_type_id,
+                )
+                .returning(cls)
             )
-            db.add(user)
-            await db.commit()
-            await db.refresh(user)
-            return user
+            return result.scalars().one()
 
         except IntegrityError as e:
             await db.rollback()
@@ -145,8 +229,7 @@ class User(Base):
                         setattr(user, key, value)
 
             user.edition_date = datetime.now(timezone.utc)
-            await db.commit()
-            await db.refresh(user)
+            await db.flush()
             return True
 
         except IntegrityError as e:
@@ -174,7 +257,6 @@ class User(Base):
             if new_users:
                 stmt = insert(cls).values(new_users)
                 await db.execute(stmt)
-                await db.commit()
 
             return True
 
@@ -227,7 +309,6 @@ class WalletTypes(Base):
             if new_types:
                 stmt = insert(cls).values(new_types)
                 await db.execute(stmt)
-                await db.commit()
 
             return True
 
@@ -258,13 +339,14 @@ class Skills(Base):
                      skill: str,
     ):
         try:
-            skill = cls(
-                skill=skill,
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    skill=skill,
+                )
+                .returning(cls)
             )
-            db.add(skill)
-            await db.commit()
-            await db.refresh(skill)
-            return skill
+            return result.scalars().one()
 
         except IntegrityError as e:
             await db.rollback()
@@ -278,20 +360,9 @@ class Skills(Base):
     @classmethod
     async def edit(cls, db: AsyncSession, skill_id: int, data: dict):
         try:
-            # Fetch the skill by ID
-            query = await db.execute(select(cls).where(cls.skill_id == skill_id))
-            skill = query.scalars().first()
-
+            skill = await edit_returning(object=cls, db=db, condition=cls.skill_id == skill_id, data=data)
             if not skill:
                 raise HTTPException(status_code=404, detail="Skill not found")
-
-            # Update fields dynamically
-            for key, value in data.items():
-                if hasattr(skill, key) and value is not None:
-                    setattr(skill, key, value)
-
-            await db.commit()
-            await db.refresh(skill)
             return skill
 
         except IntegrityError as e:
@@ -303,16 +374,11 @@ class Skills(Base):
             await db.rollback()
             raise HTTPException(status_code=500, detail=str(e))
     @classmethod
-    async def seed_skills(cls, session):
-        technology_skills_path = "api_file_utilities/technology_skills.xlsx"
-        knowledge_skills_path = "api_file_utilities/knowledge.xlsx"
-        technology_skills_content = await FileTransformer.get_file_content(technology_skills_path, columns=[2])
-        knowledge_skills_content = await FileTransformer.get_file_content(knowledge_skills_path, columns=[3])
-        all_unique_skills = list(set(technology_skills_content + knowledge_skills_content))
-        stmt = p_insert(Skills).values([{"skill": skill} for skill in all_unique_skills])
+    async def seed_skills(cls, session, skills: list[str]):
+        # Compiled from api_file_utilities/*.xlsx, see freelance_marketplace.db.sql.seed
+        stmt = p_insert(Skills).values([{"skill": skill} for skill in skills])
         stmt = stmt.on_conflict_do_nothing(index_elements=["skill"])
         await session.execute(stmt)
-        await session.commit()
 
 
 class Role(Base):
@@ -333,15 +399,17 @@ class Role(Base):
                      role_id: int = None
     ):
         try:
-            role = cls(
-                role_id=role_id,
-                role_name=role_name,
-                role_description=role_description,
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    role_name=role_name,
+                    role_description=role_description,
+                    # An explicit NULL would bypass the sequence
+                    **({"role_id": role_id} if role_id is not None else {}),
+                )
+                .returning(cls)
             )
-            db.add(role)
-            await db.commit()
-            await db.refresh(role)
-            return role
+            return result.scalars().one()
 
         except IntegrityError as e:
             await db.rollback()
@@ -355,20 +423,9 @@ class Role(Base):
     @classmethod
     async def edit(cls, db: AsyncSession, role_id: int, data: dict):
         try:
-            # Fetch the role by ID
-            query = await db.execute(select(cls).where(cls.role_id == role_id))
-            role = query.scalars().first()
-
+            role = await edit_returning(object=cls, db=db, condition=cls.role_id == role_id, data=data)
             if not role:
                 raise HTTPException(status_code=404, detail="Role not found")
-
-            # Update fields dynamically
-            for key, value in data.items():
-                if hasattr(role, key) and value is not None:
-                    setattr(role, key, value)
-
-            await db.commit()
-            await db.refresh(role)
             return role
 
         except IntegrityError as e:
@@ -397,7 +454,6 @@ class Role(Base):
             if new_roles:
                 stmt = insert(cls).values(new_roles)
                 await db.execute(stmt)
-                await db.commit()
 
             return True
 
@@ -440,16 +496,17 @@ class Profiles(Base):
 
     ):
         try:
-            profile = cls(
-                user_id=user_id,
-                first_name=first_name,
-                last_name=last_name,
-                bio=bio,
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    user_id=user_id,
+                    first_name=first_name,
+                    last_name=last_name,
+                    bio=bio,
+                )
+                .returning(cls)
             )
-            db.add(profile)
-            await db.commit()
-            await db.refresh(profile)
-            return profile
+            return result.scalars().one()
 
         except IntegrityError as e:
             await db.rollback()
@@ -468,20 +525,9 @@ class Profiles(Base):
             data: dict
     ):
         try:
-            # Fetch the profile by ID
-            query = await db.execute(select(cls).where(cls.profile_id == profile_id))
-            profile = query.scalars().first()
-
+            profile = await edit_returning(object=cls, db=db, condition=cls.profile_id == profile_id, data=data)
             if not profile:
                 raise HTTPException(status_code=404, detail="Profile not found")
-
-            # Update fields dynamically
-            for key, value in data.items():
-                if hasattr(profile, key) and value is not None:
-                    setattr(profile, key, value)
-
-            await db.commit()
-            await db.refresh(profile)
             return profile
 
         except IntegrityError as e:
@@ -496,6 +542,17 @@ class Profiles(Base):
 
 class Requests(Base):
     __tablename__ = "requests"
+    # Keyset pages of live rows, see fetch_page
+    __table_args__ = (
+        Index("ix_requests_live_creation", "creation_date", "request_id", postgresql_where=text("deleted = false")),
+        Index("ix_requests_live_price", "total_price", "request_id", postgresql_where=text("deleted = false")),
+        Index("ix_requests_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_requests_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_requests_tags", "tags", postgresql_using="gin"),
+        Index("ix_requests_live_client", "client_id", "creation_date", "request_id", postgresql_where=text("deleted = false")),
+        Index("ix_requests_live_sub_category", "sub_category_id", "creation_date", "request_id", postgresql_where=text("deleted = false")),
+        Index("ix_requests_live_status", "request_status_id", "creation_date", "request_id", postgresql_where=text("deleted = false")),
+    )
 
     request_id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(50), nullable=False)
@@ -505,6 +562,8 @@ class Requests(Base):
     tags = Column(ARRAY(String), nullable=False)
     deleted = Column(Boolean, nullable=False, default=False)
     client_id = Column(Integer, ForeignKey("users.user_id", ondelete="SET NULL"), nullable=False)
+    # Written by the search trigger, deferred so it is never loaded into responses
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
 
     creation_date = Column(TIMESTAMP, default=datetime.utcnow)
     edition_date = Column(TIMESTAMP(timezone=True), nullable=True, onupdate=datetime.now(timezone.utc))
@@ -528,18 +587,19 @@ class Requests(Base):
                      client_id: int,
      ):
         try:
-            request = cls(
-                title=title,
-                description=description,
-                sub_category_id=sub_category_id,
-                total_price=total_price,
-                tags=tags,
-                client_id=client_id,
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    title=title,
+                    description=description,
+                    sub_category_id=sub_category_id,
+                    total_price=total_price,
+                    tags=tags,
+                    client_id=client_id,
+                )
+                .returning(cls)
             )
-            db.add(request)
-            await db.commit()
-            await db.refresh(request)
-            return request
+            return result.scalars().one()
 
         except IntegrityError as e:
             await db.rollback()
@@ -553,20 +613,9 @@ class Requests(Base):
     @classmethod
     async def edit(cls, db: AsyncSession, request_id: int, data: dict):
         try:
-            # Fetch the request by ID
-            query = await db.execute(select(cls).where(cls.request_id == request_id))
-            request = query.scalars().first()
-
+            request = await edit_returning(object=cls, db=db, condition=cls.request_id == request_id, data=data)
             if not request:
                 raise HTTPException(status_code=404, detail="Request not found")
-
-            # Update fields dynamically
-            for key, value in data.items():
-                if hasattr(request, key) and value is not None:
-                    setattr(request, key, value)
-
-            await db.commit()
-            await db.refresh(request)
             return request
 
         except IntegrityError as e:
@@ -607,7 +656,6 @@ class RequestStatus(Base):
             if new_statuses:
                 stmt = insert(cls).values(new_statuses)
                 await db.execute(stmt)
-                await db.commit()
 
             return True
 
@@ -622,6 +670,17 @@ class RequestStatus(Base):
 
 class Services(Base):
     __tablename__ = "services"
+    # Keyset pages of live rows, see fetch_page
+    __table_args__ = (
+        Index("ix_services_live_creation", "creation_date", "service_id", postgresql_where=text("deleted = false")),
+        Index("ix_services_live_price", "total_price", "service_id", postgresql_where=text("deleted = false")),
+        Index("ix_services_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_services_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_services_tags", "tags", postgresql_using="gin"),
+        Index("ix_services_live_sub_category", "sub_category_id", "creation_date", "service_id", postgresql_where=text("deleted = false")),
+        Index("ix_services_live_freelancer", "freelancer_id", "creation_date", "service_id", postgresql_where=text("deleted = false")),
+        Index("ix_services_live_status", "service_status_id", "creation_date", "service_id", postgresql_where=text("deleted = false")),
+    )
 
     service_id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(50), nullable=False)
@@ -631,6 +690,8 @@ class Services(Base):
     tags = Column(ARRAY(String), nullable=False)
     deleted = Column(Boolean, nullable=False, default=False)
     freelancer_id = Column(Integer, ForeignKey("users.user_id", ondelete="SET NULL"), nullable=True)
+    # Written by the search trigger, deferred so it is never loaded into responses
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
     creation_date = Column(TIMESTAMP, default=datetime.utcnow)
     edition_date = Column(TIMESTAMP(timezone=True), nullable=True, onupdate=datetime.now(timezone.utc))
     service_status_id = Column(Integer, ForeignKey("service_status.service_status_id", ondelete="SET NULL"), default=ServiceStatusEnum.DRAFT.value,  nullable=True)
@@ -653,18 +714,19 @@ class Services(Base):
                      freelancer_id: int,
      ):
         try:
-            service = cls(
-                title=title,
-                description=description,
-                sub_category_id=sub_category_id,
-                total_price=total_price,
-                tags=tags,
-                freelancer_id=freelancer_id,
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    title=title,
+                    description=description,
+                    sub_category_id=sub_category_id,
+                    total_price=total_price,
+                    tags=tags,
+                    freelancer_id=freelancer_id,
+                )
+                .returning(cls)
             )
-            db.add(service)
-            await db.commit()
-            await db.refresh(service)
-            return service
+            return result.scalars().one()
 
         except IntegrityError as e:
             await db.rollback()
@@ -678,20 +740,9 @@ class Services(Base):
     @classmethod
     async def edit(cls, db: AsyncSession, service_id: int, data: dict):
         try:
-            # Fetch the service by ID
-            query = await db.execute(select(cls).where(cls.service_id == service_id))
-            service = query.scalars().first()
-
+            service = await edit_returning(object=cls, db=db, condition=cls.service_id == service_id, data=data)
             if not service:
                 raise HTTPException(status_code=404, detail="Service not found")
-
-            # Update fields dynamically
-            for key, value in data.items():
-                if hasattr(service, key) and value is not None:
-                    setattr(service, key, value)
-
-            await db.commit()
-            await db.refresh(service)
             return service
 
         except IntegrityError as e:
@@ -703,6 +754,15 @@ class Services(Base):
             await db.rollback()
             raise HTTPException(status_code=500, detail=str(e))
 
+for searchable_table in (Requests.__table__, Services.__table__):
+    event.listen(searchable_table, "after_create", DDL(SEARCH_VECTOR_TRIGGER))
+event.listen(
+    Requests.__table__, "after_create", DDL(FACET_COUNTS_TRIGGER.format(status_column="request_status_id"))
+)
+event.listen(
+    Services.__table__, "after_create", DDL(FACET_COUNTS_TRIGGER.format(status_column="service_status_id"))
+)
+
 class ServiceStatus(Base):
     __tablename__ = "service_status"
     service_status_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -731,7 +791,6 @@ class ServiceStatus(Base):
             if new_statuses:
                 stmt = insert(cls).values(new_statuses)
                 await db.execute(stmt)
-                await db.commit()
 
             return True
 
@@ -744,6 +803,15 @@ class ServiceStatus(Base):
             await db.rollback()
             raise HTTPException(status_code=500, detail=str(e))
 
+class FacetCount(Base):
+    __tablename__ = "facet_counts"
+
+    entity = Column(String(50), primary_key=True)  # "services" or "requests"
+    sub_category_id = Column(Integer, primary_key=True)
+    status_id = Column(Integer, primary_key=True)  # -1 when the row has no status
+    tag = Column(String(255), primary_key=True)  # '' for the row count of the group
+    count = Column(Integer, nullable=False, default=0)
+
 class Script(Base):
     __tablename__ = "scripts"
 
@@ -770,6 +838,7 @@ class PendingTransaction(Base):
     submission_date = Column(TIMESTAMP(timezone=True), default=datetime.now(timezone.utc))
     last_poll_date = Column(TIMESTAMP(timezone=True), nullable=True)
     confirmation_date = Column(TIMESTAMP(timezone=True), nullable=True)
+    confirmation_slot = Column(BigInteger, nullable=True)  # undone when the chain rolls back past it
     failure_reason = Column(Text, nullable=True)
 
     # Optional convenience fields
@@ -780,6 +849,11 @@ class PendingTransaction(Base):
 
 class Utxo(Base):
     __tablename__ = "utxos"
+    # One row per output, and the unspent output of a milestone, see ChainIndexer
+    __table_args__ = (
+        Index("ix_utxos_output", "tx_hash", "tx_index", unique=True),
+        Index("ix_utxos_unspent_milestone", "milestone_id", postgresql_where=text("spent = false")),
+    )
 
     utxo_id = Column(Integer, primary_key=True, autoincrement=True)
     script_id = Column(Integer, ForeignKey("scripts.script_id", ondelete="CASCADE"), nullable=False)
@@ -794,6 +868,9 @@ class Utxo(Base):
     creation_date = Column(TIMESTAMP(timezone=True), default=datetime.now(timezone.utc))
     spent = Column(Boolean, nullable=False, default=False)
     spent_date = Column(TIMESTAMP(timezone=True), nullable=True)
+    # Slots of the blocks creating / spending the output, None when found by a ChainIndexer sync
+    created_slot = Column(BigInteger, nullable=True)
+    spent_slot = Column(BigInteger, nullable=True)
     milestone_id = Column(Integer, ForeignKey("milestones.milestone_id", ondelete="SET NULL"), nullable=True)
 
     # Relationships
@@ -803,6 +880,14 @@ class Utxo(Base):
 
 class Milestones(Base):
     __tablename__ = "milestones"
+    # Keyset pages of live rows, see fetch_page
+    __table_args__ = (
+        Index("ix_milestones_live_creation", "creation_date", "milestone_id", postgresql_where=text("deleted = false")),
+        Index("ix_milestones_live_reward", "reward_amount", "milestone_id", postgresql_where=text("deleted = false")),
+        Index("ix_milestones_live_client", "client_id", "creation_date", "milestone_id", postgresql_where=text("deleted = false")),
+        Index("ix_milestones_live_freelancer", "freelancer_id", "creation_date", "milestone_id", postgresql_where=text("deleted = false")),
+        Index("ix_milestones_live_status", "milestone_status_id", "creation_date", "milestone_id", postgresql_where=text("deleted = false")),
+    )
 
     milestone_id = Column(Integer, primary_key=True, autoincrement=True)
     client_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
@@ -844,16 +929,19 @@ class Milestones(Base):
                      request_id: int = None,
                      ):
         try:
-            milestone = cls(
-                milestone_tx_hash=milestone_tx_hash,
-                client_id=client_id,
-                freelancer_id=freelancer_id,
-                milestone_text=milestone_text,
-                reward_amount=reward_amount,
-                milestone_status_id=milestone_status_id,
+            # milestone_tx_hash is not a milestones column
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    client_id=client_id,
+                    freelancer_id=freelancer_id,
+                    milestone_text=milestone_text,
+                    reward_amount=reward_amount,
+                    milestone_status_id=milestone_status_id,
+                )
+                .returning(cls)
             )
-            db.add(milestone)
-            await db.flush() ## USE FLUSH TO REFRESH MILESTONE WITH THE MILESTONE_ID PROPERTY BUT WITHOUT NEEDING TO COMMIT FIRST
+            milestone = result.scalars().one()
             if proposal_id:
                 await db.execute(proposal_milestone_association.insert().values(proposal_id=proposal_id, milestone_id=milestone.milestone_id))
             if order_id:
@@ -862,8 +950,6 @@ class Milestones(Base):
                 await db.execute(service_milestone_association.insert().values(service_id=service_id, milestone_id=milestone.milestone_id))
             if request_id:
                 await db.execute(request_milestone_association.insert().values(request_id=request_id, milestone_id=milestone.milestone_id))
-            await db.commit()
-            await db.refresh(milestone)
             return milestone
 
         except IntegrityError as e:
@@ -878,20 +964,9 @@ class Milestones(Base):
     @classmethod
     async def edit(cls, db: AsyncSession, milestone_id: int, data: dict):
         try:
-            # Fetch the milestone by ID
-            query = await db.execute(select(cls).where(cls.milestone_id == milestone_id))
-            milestone = query.scalars().first()
-
+            milestone = await edit_returning(object=cls, db=db, condition=cls.milestone_id == milestone_id, data=data)
             if not milestone:
                 raise HTTPException(status_code=404, detail="Milestone not found")
-
-            # Update fields dynamically
-            for key, value in data.items():
-                if hasattr(milestone, key) and value is not None:
-                    setattr(milestone, key, value)
-
-            await db.commit()
-            await db.refresh(milestone)
             return milestone
 
         except IntegrityError as e:
@@ -930,7 +1005,6 @@ class MilestoneStatus(Base):
             if new_statuses:
                 stmt = insert(cls).values(new_statuses)
                 await db.execute(stmt)
-                await db.commit()
 
             return True
 
@@ -947,6 +1021,13 @@ class MilestoneStatus(Base):
 
 class Proposal(Base):
     __tablename__ = "proposals"
+    # Keyset pages, see fetch_page
+    __table_args__ = (
+        Index("ix_proposals_live_creation", "creation_date", "proposal_id", postgresql_where=text("deleted = false")),
+        Index("ix_proposals_live_request", "request_id", "creation_date", "proposal_id", postgresql_where=text("deleted = false")),
+        Index("ix_proposals_live_freelancer", "freelancer_id", "creation_date", "proposal_id", postgresql_where=text("deleted = false")),
+        Index("ix_proposals_live_status", "proposal_status_id", "creation_date", "proposal_id", postgresql_where=text("deleted = false")),
+    )
 
     proposal_id = Column(Integer, primary_key=True, autoincrement=True)
     request_id = Column(Integer, ForeignKey("requests.request_id", ondelete="CASCADE"), nullable=False)
@@ -969,14 +1050,15 @@ class Proposal(Base):
                      freelancer_id: int,
                      ):
         try:
-            proposal = cls(
-                request_id=request_id,
-                freelancer_id=freelancer_id,
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    request_id=request_id,
+                    freelancer_id=freelancer_id,
+                )
+                .returning(cls)
             )
-            db.add(proposal)
-            await db.commit()
-            await db.refresh(proposal)
-            return proposal
+            return result.scalars().one()
 
         except IntegrityError as e:
             await db.rollback()
@@ -990,20 +1072,9 @@ class Proposal(Base):
     @classmethod
     async def edit(cls, db: AsyncSession, proposal_id: int, data: dict):
         try:
-            # Fetch the proposal by ID
-            query = await db.execute(select(cls).where(cls.proposal_id == proposal_id))
-            proposal = query.scalars().first()
-
+            proposal = await edit_returning(object=cls, db=db, condition=cls.proposal_id == proposal_id, data=data)
             if not proposal:
                 raise HTTPException(status_code=404, detail="Proposal not found")
-
-            # Update fields dynamically
-            for key, value in data.items():
-                if hasattr(proposal, key) and value is not None:
-                    setattr(proposal, key, value)
-
-            await db.commit()
-            await db.refresh(proposal)
             return proposal
 
         except IntegrityError as e:
@@ -1047,7 +1118,6 @@ class ProposalStatus(Base):
             if new_statuses:
                 stmt = insert(cls).values(new_statuses)
                 await db.execute(stmt)
-                await db.commit()
 
             return True
 
@@ -1062,6 +1132,13 @@ class ProposalStatus(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    # Keyset pages of live rows, see fetch_page
+    __table_args__ = (
+        Index("ix_orders_live_creation", "creation_date", "order_id", postgresql_where=text("deleted = false")),
+        Index("ix_orders_live_client", "client_id", "creation_date", "order_id", postgresql_where=text("deleted = false")),
+        Index("ix_orders_live_service", "service_id", "creation_date", "order_id", postgresql_where=text("deleted = false")),
+        Index("ix_orders_live_status", "order_status_id", "creation_date", "order_id", postgresql_where=text("deleted = false")),
+    )
 
     order_id = Column(Integer, primary_key=True, autoincrement=True)
     service_id = Column(Integer, ForeignKey("services.service_id", ondelete="CASCADE"), nullable=False)
@@ -1084,14 +1161,15 @@ class Order(Base):
                      client_id: int,
                      ):
         try:
-            order = cls(
-                service_id=service_id,
-                client_id=client_id,
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    service_id=service_id,
+                    client_id=client_id,
+                )
+                .returning(cls)
             )
-            db.add(order)
-            await db.commit()
-            await db.refresh(order)
-            return order
+            return result.scalars().one()
 
         except IntegrityError as e:
             await db.rollback()
@@ -1105,21 +1183,9 @@ class Order(Base):
     @classmethod
     async def edit(cls, db: AsyncSession, order_id: int, data: dict):
         try:
-            # Fetch the order by ID
-            query = await db.execute(select(cls).where(cls.order_id == order_id))
-            order = query.scalars().first()
-
+            order = await edit_returning(object=cls, db=db, condition=cls.order_id == order_id, data=data)
             if not order:
                 raise HTTPException(status_code=404, detail="Order not found")
-
-            # Update fields dynamically
-            for key, value in data.items():
-                if hasattr(order, key) and value is not None:
-                    setattr(order, key, value)
-
-            # Commit the changes and refresh
-            await db.commit()
-            await db.refresh(order)
             return order
 
         except IntegrityError as e:
@@ -1161,7 +1227,6 @@ class OrderStatus(Base):
             if new_statuses:
                 stmt = insert(cls).values(new_statuses)
                 await db.execute(stmt)
-                await db.commit()
 
             return True
 
@@ -1176,6 +1241,13 @@ class OrderStatus(Base):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    # Keyset pages, see fetch_page
+    __table_args__ = (
+        Index("ix_transactions_live_creation", "creation_date", "transaction_id", postgresql_where=text("deleted = false")),
+        Index("ix_transactions_live_milestone", "milestone_id", "creation_date", "transaction_id", postgresql_where=text("deleted = false")),
+        Index("ix_transactions_live_client", "client_id", "creation_date", "transaction_id", postgresql_where=text("deleted = false")),
+        Index("ix_transactions_live_freelancer", "freelancer_id", "creation_date", "transaction_id", postgresql_where=text("deleted = false")),
+    )
 
     transaction_id = Column(Integer, primary_key=True, autoincrement=True)
     milestone_id = Column(Integer, ForeignKey("milestones.milestone_id", ondelete="CASCADE"), nullable=False)
@@ -1203,18 +1275,19 @@ class Transaction(Base):
                      token_name: str = None,
                      receiver_address: str = None):
         try:
-            transaction = cls(
-                milestone_id=milestone_id,
-                amount=amount,
-                client_id=client_id,
-                freelancer_id=freelancer_id,
-                token_name=token_name,
-                receiver_address=receiver_address
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    milestone_id=milestone_id,
+                    amount=amount,
+                    client_id=client_id,
+                    freelancer_id=freelancer_id,
+                    token_name=token_name,
+                    receiver_address=receiver_address
+                )
+                .returning(cls)
             )
-            db.add(transaction)
-            await db.commit()
-            await db.refresh(transaction)
-            return transaction
+            return result.scalars().one()
 
         except IntegrityError as e:
             await db.rollback()
@@ -1228,21 +1301,9 @@ class Transaction(Base):
     @classmethod
     async def edit(cls, db: AsyncSession, transaction_id: int, data: dict):
         try:
-            # Fetch the transaction by ID
-            query = await db.execute(select(cls).where(cls.transaction_id == transaction_id))
-            transaction = query.scalars().first()
-
+            transaction = await edit_returning(object=cls, db=db, condition=cls.transaction_id == transaction_id, data=data)
             if not transaction:
                 raise HTTPException(status_code=404, detail="Transaction not found")
-
-            # Update fields dynamically
-            for key, value in data.items():
-                if hasattr(transaction, key) and value is not None:
-                    setattr(transaction, key, value)
-
-            # Commit the changes and refresh
-            await db.commit()
-            await db.refresh(transaction)
             return transaction
 
         except IntegrityError as e:
@@ -1272,14 +1333,15 @@ class Category(Base):
                      category_name: str,
                      category_description: str = None):
         try:
-            category = cls(
-                category_name=category_name,
-                category_description=category_description
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    category_name=category_name,
+                    category_description=category_description
+                )
+                .returning(cls)
             )
-            db.add(category)
-            await db.commit()
-            await db.refresh(category)
-            return category
+            return result.scalars().one()
 
         except IntegrityError as e:
             await db.rollback()
@@ -1293,21 +1355,9 @@ class Category(Base):
     @classmethod
     async def edit(cls, db: AsyncSession, category_id: int, data: dict):
         try:
-            # Fetch the category by ID
-            query = await db.execute(select(cls).where(cls.category_id == category_id))
-            category = query.scalars().first()
-
+            category = await edit_returning(object=cls, db=db, condition=cls.category_id == category_id, data=data)
             if not category:
                 raise HTTPException(status_code=404, detail="Category not found")
-
-            # Update fields dynamically
-            for key, value in data.items():
-                if hasattr(category, key) and value is not None:
-                    setattr(category, key, value)
-
-            # Commit the changes and refresh
-            await db.commit()
-            await db.refresh(category)
             return category
 
         except IntegrityError as e:
@@ -1341,7 +1391,6 @@ class Category(Base):
             if new_categories:
                 stmt = insert(cls).values(new_categories)
                 await db.execute(stmt)
-                await db.commit()
 
             return True
 
@@ -1356,6 +1405,10 @@ class Category(Base):
 
 class SubCategory(Base):
     __tablename__ = "sub_categories"
+    # Keyset pages, see fetch_page
+    __table_args__ = (
+        Index("ix_sub_categories_category", "category_id", "creation_date", "sub_category_id"),
+    )
 
     sub_category_id = Column(Integer, primary_key=True, autoincrement=True)
     sub_category_name = Column(String(50), nullable=False, unique=True)
@@ -1376,15 +1429,16 @@ class SubCategory(Base):
                      category_id: int,
                      sub_category_description: str = None):
         try:
-            sub_category = cls(
-                sub_category_name=sub_category_name,
-                sub_category_description=sub_category_description,
-                category_id=category_id
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    sub_category_name=sub_category_name,
+                    sub_category_description=sub_category_description,
+                    category_id=category_id
+                )
+                .returning(cls)
             )
-            db.add(sub_category)
-            await db.commit()
-            await db.refresh(sub_category)
-            return sub_category
+            return result.scalars().one()
 
 
         except IntegrityError as e:
@@ -1399,21 +1453,9 @@ class SubCategory(Base):
     @classmethod
     async def edit(cls, db: AsyncSession, sub_category_id: int, data: dict):
         try:
-            # Fetch the subcategory by ID
-            query = await db.execute(select(cls).where(cls.sub_category_id == sub_category_id))
-            sub_category = query.scalars().first()
-
+            sub_category = await edit_returning(object=cls, db=db, condition=cls.sub_category_id == sub_category_id, data=data)
             if not sub_category:
                 raise HTTPException(status_code=404, detail="SubCategory not found")
-
-            # Update fields dynamically
-            for key, value in data.items():
-                if hasattr(sub_category, key) and value is not None:
-                    setattr(sub_category, key, value)
-
-            # Commit changes and refresh
-            await db.commit()
-            await db.refresh(sub_category)
             return sub_category
 
         except IntegrityError as e:
@@ -1447,7 +1489,6 @@ class SubCategory(Base):
             if new_sub_categories:
                 stmt = insert(cls).values(new_sub_categories)
                 await db.execute(stmt)
-                await db.commit()
 
             return True
 
@@ -1463,6 +1504,12 @@ class SubCategory(Base):
 
 class Review(Base):
     __tablename__ = "reviews"
+    # Keyset pages of live rows, see fetch_page
+    __table_args__ = (
+        Index("ix_reviews_live_creation", "creation_date", "review_id", postgresql_where=text("deleted = false")),
+        Index("ix_reviews_live_reviewee", "reviewee_id", "creation_date", "review_id", postgresql_where=text("deleted = false")),
+        Index("ix_reviews_live_reviewer", "reviewer_id", "creation_date", "review_id", postgresql_where=text("deleted = false")),
+    )
 
     review_id = Column(Integer, primary_key=True, autoincrement=True)
     reviewee_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)  # Person being reviewed
@@ -1489,16 +1536,17 @@ class Review(Base):
             raise HTTPException(status_code=400, detail="Rating must be between 1.0 and 5.0")
 
         try:
-            review = cls(
-                reviewee_id=reviewee_id,
-                reviewer_id=reviewer_id,
-                rating=rating,
-                comment=comment
+            result = await db.execute(
+                insert(cls)
+                .values(
+                    reviewee_id=reviewee_id,
+                    reviewer_id=reviewer_id,
+                    rating=rating,
+                    comment=comment
+                )
+                .returning(cls)
             )
-            db.add(review)
-            await db.commit()
-            await db.refresh(review)
-            return review
+            return result.scalars().one()
         
         except IntegrityError as e:
             await db.rollback()
@@ -1512,21 +1560,9 @@ class Review(Base):
     @classmethod
     async def edit(cls, db: AsyncSession, review_id: int, data: dict):
         try:
-            # Fetch the review by ID
-            query = await db.execute(select(cls).where(cls.review_id == review_id))
-            review = query.scalars().first()
-
+            review = await edit_returning(object=cls, db=db, condition=cls.review_id == review_id, data=data)
             if not review:
                 raise HTTPException(status_code=404, detail="Review not found")
-
-            # Update fields dynamically
-            for key, value in data.items():
-                if hasattr(review, key) and value is not None:
-                    setattr(review, key, value)
-
-            # Commit changes and refresh
-            await db.commit()
-            await db.refresh(review)
             return review
 
         except IntegrityError as e:
@@ -1537,3 +1573,22 @@ class Review(Base):
         except Exception as e:
             await db.rollback()
             raise HTTPException(status_code=500, detail=str(e))
+
+
+class SeedVersion(Base):
+    # Seed snapshot applied to the database, see freelance_marketplace.db.sql.seed
+    __tablename__ = "seed_versions"
+
+    name = Column(String(50), primary_key=True)
+    snapshot_hash = Column(String(64), nullable=False)
+    applied_at = Column(TIMESTAMP(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+
+class ChainCheckpoint(Base):
+    # Recent points processed by a chain follower, it resumes from the newest one still on chain
+    __tablename__ = "chain_checkpoints"
+
+    name = Column(String(50), primary_key=True)
+    slot = Column(BigInteger, primary_key=True)
+    block_hash = Column(String(64), nullable=False)
+    creation_date = Column(TIMESTAMP(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
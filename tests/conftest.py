@@ -0,0 +1,97 @@
+"""
+The tests run against a throwaway PostgreSQL database and Redis server, never the ones of .env: the schema
+is recreated and the tables and keys are wiped between tests.
+
+    TEST_SQL_CONNECTION_STRING=postgresql+asyncpg://postgres@localhost/marketplace_test \
+    TEST_REDIS_HOST=localhost TEST_REDIS_PORT=6380 \
+    poetry run pytest tests
+
+Tests needing one of them are skipped when it is not configured.
+"""
+import asyncio
+import os
+
+import pytest
+
+# Before anything reads the settings
+TEST_SQL_CONNECTION_STRING = os.environ.get("TEST_SQL_CONNECTION_STRING", "")
+TEST_REDIS_HOST = os.environ.get("TEST_REDIS_HOST", "")
+os.environ["SQL_CONNECTION_STRING"] = TEST_SQL_CONNECTION_STRING or "postgresql+asyncpg://unconfigured/unconfigured"
+os.environ["SQL_REPLICA_CONNECTION_STRING"] = ""
+os.environ["SQL_SEED_ON_STARTUP"] = "false"
+os.environ["REDIS_HOST"] = TEST_REDIS_HOST or "unconfigured"
+os.environ["REDIS_PORT"] = os.environ.get("TEST_REDIS_PORT", "6379")
+os.environ["BLOCKCHAIN_NETWORK"] = "testnet"
+
+# Reference rows written by the seed, kept between tests (scripts ids are cached by ScriptRegistry)
+KEPT_TABLES = {
+    "roles", "wallet_types", "skills", "request_status", "service_status", "milestone_status",
+    "proposal_status", "order_status", "categories", "sub_categories", "seed_versions", "scripts",
+}
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def run(loop):
+    """
+    Runs a coroutine on the loop of the session, the one the engine and Redis connections are bound to.
+    """
+    return loop.run_until_complete
+
+
+@pytest.fixture(scope="session")
+def database(run):
+    if not TEST_SQL_CONNECTION_STRING:
+        pytest.skip("TEST_SQL_CONNECTION_STRING is not set")
+
+    from freelance_marketplace.db.sql.database import engine, Base
+    from freelance_marketplace.db.sql.seed import seed_database
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await seed_database(force=True)
+
+    run(setup())
+    yield engine
+    run(engine.dispose())
+
+
+@pytest.fixture
+def db(run, database):
+    """
+    A session on the test database, every table but the reference ones is emptied after the test.
+    """
+    from sqlalchemy import text
+    from freelance_marketplace.db.sql.database import AsyncSessionLocal, Base
+
+    session = AsyncSessionLocal()
+    yield session
+
+    async def teardown():
+        await session.close()
+        tables = ", ".join(table.name for table in Base.metadata.sorted_tables if table.name not in KEPT_TABLES)
+        async with database.begin() as conn:
+            await conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+    run(teardown())
+
+
+@pytest.fixture
+def redis(run):
+    if not TEST_REDIS_HOST:
+        pytest.skip("TEST_REDIS_HOST is not set")
+
+    from freelance_marketplace.api.services.redis import redis_client
+    from freelance_marketplace.api.services.local_cache import local_cache
+
+    run(redis_client.flushdb())
+    local_cache.clear()
+    yield redis_client
+    run(redis_client.flushdb())
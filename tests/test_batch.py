@@ -0,0 +1,104 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from freelance_marketplace.api.routes.services.servicesLogic import ServicesLogic
+from freelance_marketplace.core.config import settings
+from freelance_marketplace.models.sql.request_model.BatchRequest import BatchRequest
+from freelance_marketplace.models.sql.sql_tables import User, Services
+
+
+def service(title: str, **fields) -> dict:
+    return {"title": title, "description": "A service", "sub_category_id": 1, "total_price": 10, "tags": ["logo"], **fields}
+
+
+async def create_freelancer(db) -> int:
+    freelancer = User(wallet_public_address="addr_freelancer")
+    db.add(freelancer)
+    await db.commit()
+    return freelancer.user_id
+
+
+async def get_services(db) -> dict[int, Services]:
+    result = await db.execute(select(Services).execution_options(populate_existing=True))
+    return {row.service_id: row for row in result.scalars()}
+
+
+def test_batch_update_only_writes_the_fields_of_each_item(run, db, redis):
+    async def scenario():
+        freelancer_id = await create_freelancer(db)
+        report = await ServicesLogic.batch(db=db, freelancer_id=freelancer_id, batch=BatchRequest(create=[service("Logo"), service("Banner")]))
+        logo, banner = report["created"]
+
+        report = await ServicesLogic.batch(
+            db=db,
+            freelancer_id=freelancer_id,
+            batch=BatchRequest(update=[
+                {"service_id": logo, "total_price": 20},
+                {"service_id": banner, "title": "Large banner", "tags": ["Banner"]},
+            ])
+        )
+        assert report["updated"] == [logo, banner] and report["errors"] == []
+
+        services = await get_services(db)
+        assert (services[logo].title, services[logo].total_price, services[logo].tags) == ("Logo", 20, ["logo"])
+        assert (services[banner].title, services[banner].total_price, services[banner].tags) == ("Large banner", 10, ["banner"])
+
+    run(scenario())
+
+
+def test_batch_reports_the_failed_items_and_applies_the_others(run, db, redis):
+    async def scenario():
+        freelancer_id = await create_freelancer(db)
+        report = await ServicesLogic.batch(db=db, freelancer_id=freelancer_id, batch=BatchRequest(create=[service("Logo")]))
+        (logo,) = report["created"]
+
+        report = await ServicesLogic.batch(
+            db=db,
+            freelancer_id=freelancer_id,
+            batch=BatchRequest(
+                create=[service("Banner"), {"title": "No price"}, service("Unknown", sub_category_id=999_999)],
+                update=[
+                    {"service_id": logo, "total_price": 30},
+                    {"service_id": 999_999, "total_price": 30},
+                    {"service_id": logo, "title": "Twice"},
+                    {"service_id": logo},
+                    {"service_id": logo, "title": None},
+                ],
+                delete=[999_999]
+            )
+        )
+        assert len(report["created"]) == 1 and report["updated"] == [logo] and report["deleted"] == []
+        assert [(error["operation"], error["index"]) for error in report["errors"]] == [
+            ("create", 1), ("create", 2), ("delete", 0), ("update", 1), ("update", 2), ("update", 3), ("update", 4)
+        ]
+
+        services = await get_services(db)
+        assert {row.title for row in services.values()} == {"Logo", "Banner"}
+        assert services[logo].total_price == 30
+
+    run(scenario())
+
+
+def test_batch_is_limited_to_max_batch_size_items(run, db, redis, monkeypatch):
+    monkeypatch.setattr(settings.sql, "max_batch_size", 3)
+
+    async def scenario():
+        freelancer_id = await create_freelancer(db)
+        with pytest.raises(HTTPException) as error:
+            await ServicesLogic.batch(
+                db=db,
+                freelancer_id=freelancer_id,
+                batch=BatchRequest(create=[service("Logo"), service("Banner")], update=[{"service_id": 1, "title": "A"}], delete=[1])
+            )
+        assert error.value.status_code == 400
+        assert await get_services(db) == {}
+
+        report = await ServicesLogic.batch(
+            db=db,
+            freelancer_id=freelancer_id,
+            batch=BatchRequest(create=[service("Logo"), service("Banner"), service("Card")])
+        )
+        assert len(report["created"]) == 3 and report["errors"] == []
+
+    run(scenario())
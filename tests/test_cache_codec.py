@@ -0,0 +1,130 @@
+import datetime
+import decimal
+import json
+import uuid
+
+import pytest
+
+from freelance_marketplace.api.utils import cache_codec
+from freelance_marketplace.api.utils.cache_codec import CacheCodec, FORMAT_VERSION
+from freelance_marketplace.core.config import settings
+from freelance_marketplace.models.enums.serviceStatus import ServiceStatus
+
+CODECS = {"json": cache_codec.CODEC_JSON, "orjson": cache_codec.CODEC_ORJSON, "msgpack": cache_codec.CODEC_MSGPACK}
+COMPRESSIONS = {"none": cache_codec.COMPRESSION_NONE, "zstd": cache_codec.COMPRESSION_ZSTD, "lz4": cache_codec.COMPRESSION_LZ4}
+LIBRARIES = {"orjson": "orjson", "msgpack": "msgpack", "zstd": "zstandard", "lz4": "lz4.frame"}
+
+PAGE = {
+    "items": [
+        {
+            "service_id": index,
+            "title": f"Logo {index}",
+            "total_price": decimal.Decimal("10.50"),
+            "creation_date": datetime.datetime(2026, 1, 1, 12, 30, tzinfo=datetime.timezone.utc),
+            "service_status_id": ServiceStatus.AVAILABLE,
+            "reference": uuid.UUID(int=index),
+            "tags": ("logo", "design"),
+            "deleted": False,
+            "edition_date": None,
+        }
+        for index in range(50)
+    ],
+    "next_cursor": None,
+}
+# What the entry reads back as, the jsonable_encoder rendering of PAGE
+EXPECTED = {
+    "items": [
+        {
+            "service_id": index,
+            "title": f"Logo {index}",
+            "total_price": 10.5,
+            "creation_date": "2026-01-01T12:30:00+00:00",
+            "service_status_id": ServiceStatus.AVAILABLE.value,
+            "reference": str(uuid.UUID(int=index)),
+            "tags": ["logo", "design"],
+            "deleted": False,
+            "edition_date": None,
+        }
+        for index in range(50)
+    ],
+    "next_cursor": None,
+}
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+@pytest.mark.parametrize("codec", CODECS)
+def test_round_trip(monkeypatch, codec, compression):
+    for name in (codec, compression):
+        if name in LIBRARIES:
+            pytest.importorskip(LIBRARIES[name])
+    monkeypatch.setattr(settings.redis, "cache_codec", codec)
+    monkeypatch.setattr(settings.redis, "cache_compression", compression)
+    monkeypatch.setattr(settings.redis, "cache_compression_threshold", 0)
+
+    entry = CacheCodec.encode(PAGE)
+
+    assert entry[:3] == bytes((FORMAT_VERSION, CODECS[codec], COMPRESSIONS[compression]))
+    assert CacheCodec.decode(entry) == EXPECTED
+    assert json.loads(CacheCodec.to_json(entry)) == EXPECTED
+
+
+def test_small_entries_are_not_compressed(monkeypatch):
+    monkeypatch.setattr(settings.redis, "cache_compression", "zstd")
+    monkeypatch.setattr(settings.redis, "cache_compression_threshold", 1 << 20)
+
+    assert CacheCodec.encode(PAGE)[2] == cache_codec.COMPRESSION_NONE
+
+
+@pytest.mark.parametrize("legacy", [
+    json.dumps(EXPECTED),
+    json.dumps(EXPECTED).encode(),
+    json.dumps(EXPECTED, indent=2).encode(),
+    b" \n" + json.dumps(EXPECTED).encode(),
+    json.dumps([EXPECTED]).encode(),
+    b'"a string"',
+    b"1",
+    b"true",
+    b"null",
+])
+def test_legacy_json_entries_still_decode(legacy):
+    # JSON text never starts with the FORMAT_VERSION byte
+    assert (legacy[0] if isinstance(legacy, bytes) else ord(legacy[0])) != FORMAT_VERSION
+    assert CacheCodec.decode(legacy) == json.loads(legacy)
+    if isinstance(legacy, bytes):
+        assert CacheCodec.to_json(legacy) == legacy
+
+
+def test_missing_libraries_fall_back_to_json_without_compression(monkeypatch):
+    monkeypatch.setattr(cache_codec, "orjson", None)
+    monkeypatch.setattr(cache_codec, "zstandard", None)
+    monkeypatch.setattr(settings.redis, "cache_codec", "orjson")
+    monkeypatch.setattr(settings.redis, "cache_compression", "zstd")
+    monkeypatch.setattr(settings.redis, "cache_compression_threshold", 0)
+
+    entry = CacheCodec.encode(PAGE)
+
+    assert entry[:3] == bytes((FORMAT_VERSION, cache_codec.CODEC_JSON, cache_codec.COMPRESSION_NONE))
+    assert CacheCodec.decode(entry) == EXPECTED
+
+
+def test_entries_of_a_host_with_more_libraries(monkeypatch):
+    pytest.importorskip("orjson")
+    pytest.importorskip("zstandard")
+    monkeypatch.setattr(settings.redis, "cache_codec", "orjson")
+    monkeypatch.setattr(settings.redis, "cache_compression_threshold", 0)
+    monkeypatch.setattr(settings.redis, "cache_compression", "none")
+    plain = CacheCodec.encode(PAGE)
+    monkeypatch.setattr(settings.redis, "cache_compression", "zstd")
+    compressed = CacheCodec.encode(PAGE)
+
+    monkeypatch.setattr(cache_codec, "orjson", None)
+    monkeypatch.setattr(cache_codec, "zstandard", None)
+
+    # orjson entries are JSON documents
+    assert CacheCodec.is_readable(plain)
+    assert CacheCodec.decode(plain) == EXPECTED
+    assert not CacheCodec.is_readable(compressed)
+    with pytest.raises(ValueError):
+        CacheCodec.decode(compressed)
+    with pytest.raises(ValueError):
+        CacheCodec.to_json(compressed)
@@ -0,0 +1,82 @@
+from freelance_marketplace.api.routes.requests.requestsLogic import RequestsLogic
+from freelance_marketplace.api.routes.services.servicesLogic import ServicesLogic
+from freelance_marketplace.models.sql.request_model.BatchRequest import BatchRequest
+from freelance_marketplace.models.sql.request_model.RequestRequest import RequestRequest
+from freelance_marketplace.models.sql.request_model.ServiceRequest import ServiceRequest
+from freelance_marketplace.models.sql.sql_tables import User, Services, Requests
+
+
+async def create_user(db) -> int:
+    user = User(wallet_public_address="addr_user")
+    db.add(user)
+    await db.commit()
+    return user.user_id
+
+
+def facet_tags(facets: dict) -> dict:
+    return {facet["tag"]: facet["count"] for facet in facets["tags"]}
+
+
+def test_update_moving_a_service_evicts_the_facets_of_its_previous_sub_category(run, db, redis):
+    async def scenario():
+        freelancer_id = await create_user(db)
+        data = {"title": "Logo", "description": "A logo", "sub_category_id": 1, "total_price": 10, "tags": ["logo"]}
+        service = await Services.create(db=db, freelancer_id=freelancer_id, **data)
+        await db.commit()
+
+        assert facet_tags(await ServicesLogic.get_facets(db=db, query_params={"sub_category_id": 1})) == {"logo": 1}
+        assert facet_tags(await ServicesLogic.get_facets(db=db, query_params={"sub_category_id": 2})) == {}
+
+        await ServicesLogic.update(db=db, service_id=service.service_id, service_data=ServiceRequest(**{**data, "sub_category_id": 2}))
+
+        assert facet_tags(await ServicesLogic.get_facets(db=db, query_params={"sub_category_id": 1})) == {}
+        assert facet_tags(await ServicesLogic.get_facets(db=db, query_params={"sub_category_id": 2})) == {"logo": 1}
+
+    run(scenario())
+
+
+def test_batch_moving_a_request_evicts_the_facets_of_its_previous_sub_category(run, db, redis):
+    async def scenario():
+        client_id = await create_user(db)
+        data = {"title": "Logo", "description": "A logo", "sub_category_id": 1, "total_price": 10, "tags": ["logo"]}
+        request = await Requests.create(db=db, client_id=client_id, **RequestRequest(**data).model_dump())
+        await db.commit()
+
+        assert facet_tags(await RequestsLogic.get_facets(db=db, query_params={"sub_category_id": 1})) == {"logo": 1}
+
+        report = await RequestsLogic.batch(
+            db=db,
+            client_id=client_id,
+            batch=BatchRequest(update=[{**data, "request_id": request.request_id, "sub_category_id": 2}])
+        )
+        assert report["updated"] == [request.request_id]
+
+        assert facet_tags(await RequestsLogic.get_facets(db=db, query_params={"sub_category_id": 1})) == {}
+        assert facet_tags(await RequestsLogic.get_facets(db=db, query_params={"sub_category_id": 2})) == {"logo": 1}
+
+    run(scenario())
+
+
+def test_facets_of_a_sub_category_stay_exact_after_writes_to_another_one(run, db, redis):
+    async def scenario():
+        freelancer_id = await create_user(db)
+        data = {"title": "Logo", "description": "A logo", "total_price": 10, "tags": ["logo"]}
+        await ServicesLogic.create(db=db, freelancer_id=freelancer_id, service_data=ServiceRequest(**data, sub_category_id=1))
+        await ServicesLogic.create(db=db, freelancer_id=freelancer_id, service_data=ServiceRequest(**data, sub_category_id=2))
+
+        # Summary table and row aggregation count the same rows
+        summary = await ServicesLogic.get_facets(db=db, query_params={"sub_category_id": 1})
+        rows = await ServicesLogic.get_facets(db=db, query_params={"sub_category_id": 1, "tags": ["logo"]})
+        assert summary["sub_categories"] == rows["sub_categories"] == [{"sub_category_id": 1, "count": 1}]
+        everything = await ServicesLogic.get_facets(db=db, query_params={"sub_category_id": None})
+        assert {facet["sub_category_id"]: facet["count"] for facet in everything["sub_categories"]} == {1: 1, 2: 1}
+
+        # Evicts sub_category_id=2 and the unscoped entries only
+        await ServicesLogic.create(db=db, freelancer_id=freelancer_id, service_data=ServiceRequest(**data, sub_category_id=2))
+
+        summary = await ServicesLogic.get_facets(db=db, query_params={"sub_category_id": 1})
+        assert summary["sub_categories"] == [{"sub_category_id": 1, "count": 1}]
+        everything = await ServicesLogic.get_facets(db=db, query_params={"sub_category_id": None})
+        assert {facet["sub_category_id"]: facet["count"] for facet in everything["sub_categories"]} == {1: 1, 2: 2}
+
+    run(scenario())
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from freelance_marketplace.api.services.chain_executor import ChainExecutor
+
+
+def test_timeout_counts_from_when_the_call_got_a_thread(run):
+    executor = ChainExecutor(max_workers=1, timeout=0.3)
+
+    async def scenario():
+        # The second call waits 0.2 s for the thread, then runs 0.2 s: 0.4 s in total, within its timeout
+        return await asyncio.gather(executor.run(time.sleep, 0.2), executor.run(time.sleep, 0.2))
+
+    run(scenario())
+    assert executor.timeouts == 0 and executor.queue_timeouts == 0
+
+
+def test_abort_reaches_only_the_thread_of_the_call_that_timed_out(run):
+    executor = ChainExecutor(max_workers=2, timeout=0.1)
+    release = threading.Event()
+    threads = {}
+    aborted = []
+
+    def call(name: str, duration: float):
+        threads[name] = threading.get_ident()
+        release.wait(duration)
+        return name
+
+    def abort(thread_id: int):
+        aborted.append(thread_id)
+        release.set()
+
+    async def scenario():
+        fast = asyncio.ensure_future(executor.run(call, "fast", 0.05, abort=abort))
+        with pytest.raises(HTTPException) as error:
+            await executor.run(call, "slow", 5, abort=abort)
+        assert error.value.status_code == 504
+        assert await fast == "fast"
+
+    run(scenario())
+    assert aborted == [threads["slow"]]
+    assert executor.aborts == 1
+
+
+def test_call_without_abort_runs_to_completion(run):
+    executor = ChainExecutor(max_workers=1, timeout=0.05)
+    completed = threading.Event()
+
+    def submit():
+        time.sleep(0.1)
+        completed.set()
+
+    async def scenario():
+        with pytest.raises(HTTPException):
+            await executor.run(submit)
+
+    run(scenario())
+    assert completed.wait(1)
+    assert executor.aborts == 0
+
+
+def test_call_timing_out_in_the_queue_never_runs(run):
+    executor = ChainExecutor(max_workers=1, timeout=0.1)
+    ran = []
+
+    async def scenario():
+        busy = asyncio.ensure_future(executor.run(time.sleep, 0.15))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as error:
+            await executor.run(ran.append, "queued")
+        assert error.value.detail == "Chain executor busy"
+        with pytest.raises(HTTPException):
+            await busy
+
+    run(scenario())
+    time.sleep(0.2)
+    assert ran == []
+    assert executor.queue_timeouts == 1
@@ -0,0 +1,172 @@
+"""
+Replays a recorded block stream through the chain follower. chain_follower_blocks.jsonl holds, at the test
+network address of the job_agreement script:
+
+    slot 1000  TX_A creates the output of milestone 1, TX_X an untracked output, TX_F (milestone 2) fails
+               phase-2 validation and only consumes its collateral
+    slot 1020  TX_B spends the output of TX_A and locks milestone 1 again
+    slot 1040  TX_C spends the output of TX_X
+    rollback   to slot 1000, undoing the blocks at 1020 and 1040
+    slot 1060  an empty block
+"""
+from pathlib import Path
+from typing import Optional
+
+from pycardano import UTxO, TransactionInput, TransactionOutput, TransactionId
+from sqlalchemy import select
+
+from freelance_marketplace.api.services.chain_follower import ChainFollower, FixtureChainSync, FOLLOWER_NAME
+from freelance_marketplace.api.services.chain_indexer import ChainIndexer
+from freelance_marketplace.api.services.script_registry import ScriptRegistry
+from freelance_marketplace.models.sql.sql_tables import User, Milestones, PendingTransaction, Utxo, ChainCheckpoint
+
+BLOCKS = Path(__file__).parent / "fixtures" / "chain_follower_blocks.jsonl"
+
+TX_A = "cbc9ba205005b3c4801668402be63a9cf861473e6619db0c97ba185a65eb1456"
+TX_X = "3466c9715cced98e6e037a058f0db7e384455ae4e4e31922aa51288f66449af7"
+TX_F = "14bca3c6889f314d61b4302960d9d1da8ece7e2b0bd051fa59cbd1c252bdd814"
+TX_B = "9268b995f2034032820a0a8c5dba0c2bdbd301f5130f1d7f8cbe28305e32088a"
+
+
+class RecordingSlice(FixtureChainSync):
+    """
+    The responses [start, stop) of the recording.
+    """
+
+    def __init__(self, path: Path, start: int = 0, stop: Optional[int] = None):
+        super().__init__(path)
+        self.start = start
+        self.stop = stop
+
+    async def follow(self, points: list[dict]):
+        index = 0
+        async for result in super().follow(points):
+            if index >= self.start and (self.stop is None or index < self.stop):
+                yield result
+            index += 1
+
+
+async def create_milestones(db, count: int) -> list[int]:
+    client, freelancer = User(wallet_public_address="addr_client"), User(wallet_public_address="addr_freelancer")
+    db.add_all([client, freelancer])
+    await db.flush()
+    milestones = [
+        Milestones(client_id=client.user_id, freelancer_id=freelancer.user_id, milestone_text=f"Milestone {index}", reward_amount=5)
+        for index in range(count)
+    ]
+    db.add_all(milestones)
+    await db.flush()
+    return [milestone.milestone_id for milestone in milestones]
+
+
+async def submit(db, milestone_id: int, tx_hash: str, action: str):
+    await ChainIndexer.record_submission(
+        db,
+        tx_hash=tx_hash,
+        milestone_id=milestone_id,
+        action=action,
+        script_address=ScriptRegistry.get().address()
+    )
+
+
+async def get_transactions(db) -> dict[str, PendingTransaction]:
+    result = await db.execute(select(PendingTransaction).execution_options(populate_existing=True))
+    return {row.tx_hash: row for row in result.scalars()}
+
+
+async def get_utxos(db) -> dict[tuple[str, int], Utxo]:
+    result = await db.execute(select(Utxo).execution_options(populate_existing=True))
+    return {(row.tx_hash, row.tx_index): row for row in result.scalars()}
+
+
+async def get_checkpoints(db) -> list[int]:
+    result = await db.execute(select(ChainCheckpoint.slot).where(ChainCheckpoint.name == FOLLOWER_NAME).order_by(ChainCheckpoint.slot))
+    return list(result.scalars())
+
+
+def test_replay_confirms_fails_spends_and_rolls_back(run, db):
+    async def scenario():
+        first, second = await create_milestones(db, 2)
+        await submit(db, first, TX_A, "create_milestone")
+        await submit(db, second, TX_F, "create_milestone")
+        await submit(db, first, TX_B, "approve_milestone")
+        await db.commit()
+
+        await ChainFollower(RecordingSlice(BLOCKS, stop=3)).run()
+
+        transactions = await get_transactions(db)
+        assert transactions[TX_A].status == "confirmed" and transactions[TX_A].confirmation_slot == 1000
+        assert transactions[TX_B].status == "confirmed" and transactions[TX_B].confirmation_slot == 1020
+        assert transactions[TX_F].status == "failed" and transactions[TX_F].confirmation_slot == 1000
+
+        utxos = await get_utxos(db)
+        # Only the outputs at the script address, the failed transaction created none
+        assert set(utxos) == {(TX_A, 0), (TX_X, 0), (TX_B, 0)}
+        assert utxos[(TX_A, 0)].spent and utxos[(TX_A, 0)].spent_slot == 1020
+        assert utxos[(TX_X, 0)].spent and utxos[(TX_X, 0)].spent_slot == 1040
+        assert not utxos[(TX_B, 0)].spent and utxos[(TX_B, 0)].milestone_id == first
+        assert utxos[(TX_X, 0)].milestone_id is None
+        assert await get_checkpoints(db) == [1000, 1020, 1040]
+
+        await ChainFollower(RecordingSlice(BLOCKS, start=3)).run()
+
+        transactions = await get_transactions(db)
+        assert transactions[TX_A].status == "confirmed"
+        assert transactions[TX_B].status == "pending" and transactions[TX_B].confirmation_slot is None
+        assert transactions[TX_F].status == "failed"
+
+        utxos = await get_utxos(db)
+        assert set(utxos) == {(TX_A, 0), (TX_X, 0)}
+        assert not utxos[(TX_A, 0)].spent and utxos[(TX_A, 0)].spent_slot is None
+        assert not utxos[(TX_X, 0)].spent
+        assert utxos[(TX_A, 0)].milestone_id == first
+        assert await get_checkpoints(db) == [1000, 1060]
+
+    run(scenario())
+
+
+class TipSource:
+    """
+    A node at slot 2000 with no block after it.
+    """
+
+    async def tip(self):
+        return {"slot": 2000, "id": "ab" * 32}
+
+    async def follow(self, points: list[dict]):
+        assert points == [await self.tip()]
+        return
+        yield
+
+
+class UTxOSnapshot:
+    def __init__(self, utxos: list[UTxO]):
+        self.__utxos = utxos
+
+    async def call(self, function, *args, **kwargs):
+        return function(*args, **kwargs)
+
+    def utxos(self, address):
+        return self.__utxos
+
+
+def test_first_run_backfills_the_script_outputs(run, db):
+    async def scenario():
+        (milestone_id,) = await create_milestones(db, 1)
+        await submit(db, milestone_id, TX_A, "create_milestone")
+        await db.commit()
+
+        output = UTxO(
+            TransactionInput(TransactionId(bytes.fromhex(TX_A)), 0),
+            TransactionOutput(ScriptRegistry.get().address(), 5_000_000)
+        )
+        await ChainFollower(TipSource(), context=UTxOSnapshot([output])).run()
+
+        utxos = await get_utxos(db)
+        assert set(utxos) == {(TX_A, 0)}
+        assert utxos[(TX_A, 0)].milestone_id == milestone_id and not utxos[(TX_A, 0)].spent
+        transactions = await get_transactions(db)
+        assert transactions[TX_A].status == "confirmed" and transactions[TX_A].confirmation_slot == 2000
+        assert await get_checkpoints(db) == [2000]
+
+    run(scenario())
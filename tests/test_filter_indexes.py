@@ -0,0 +1,24 @@
+import importlib
+
+import pytest
+
+# The *Logic modules exposing the filter DSL
+FILTER_MODULES = [
+    "freelance_marketplace.api.routes.milestones.milestonesLogic",
+    "freelance_marketplace.api.routes.orders.ordersLogic",
+    "freelance_marketplace.api.routes.proposals.proposalsLogic",
+    "freelance_marketplace.api.routes.requests.requestsLogic",
+    "freelance_marketplace.api.routes.reviews.reviewsLogic",
+    "freelance_marketplace.api.routes.services.servicesLogic",
+    "freelance_marketplace.api.routes.sub_categories.subCategoriesLogic",
+    "freelance_marketplace.api.routes.transactions.transactionsLogic",
+    "freelance_marketplace.api.routes.users.users_logic",
+]
+
+
+@pytest.mark.parametrize("module", FILTER_MODULES)
+def test_every_filter_column_leads_an_index(module):
+    filter_columns = importlib.import_module(module).FILTER_COLUMNS
+    for column in filter_columns:
+        leading = {next(iter(index.columns)).key for index in column.table.indexes}
+        assert column.key in leading, f"{column.table.name}.{column.key} is filterable but leads no index"
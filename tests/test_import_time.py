@@ -0,0 +1,40 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Imported on first use only, never by the app import of these profiles (see benchmarks/import_time.py)
+DEFERRED = {
+    "api": ("pycardano", "pandas", "openpyxl", "boto3", "PIL"),
+    "chain": ("pandas", "openpyxl", "boto3", "PIL"),
+    "all": ("pandas", "openpyxl", "boto3", "PIL"),
+}
+
+IMPORT_APP = """
+import json, sys
+import freelance_marketplace.main
+print(json.dumps(sorted({name.split(".")[0] for name in sys.modules})))
+"""
+
+
+@pytest.mark.parametrize("profile", sorted(DEFERRED))
+def test_app_import_leaves_the_heavy_dependencies_unimported(profile):
+    # A fresh interpreter: the modules imported by the other tests are in sys.modules already
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_APP],
+        env={
+            **os.environ,
+            "WORKER_ROUTER_PROFILE": profile,
+            "MONGO_CONNECTION_STRING": "mongodb://unconfigured",
+            "MONGO_DATABASE_NAME": "unconfigured",
+        },
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    imported = set(json.loads(result.stdout.splitlines()[-1]))
+    assert "freelance_marketplace" in imported
+    assert imported.isdisjoint(DEFERRED[profile])
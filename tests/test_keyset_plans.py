@@ -0,0 +1,92 @@
+"""
+The keyset list queries must be answered from an index: each query of fetch_page is captured and run again
+under EXPLAIN (FORMAT JSON) with sequential scans disabled. A Seq Scan left in the plan means no index
+matches the filter and order of the page, and an equality filter must be a condition of the index scan.
+"""
+import importlib
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, text
+
+from freelance_marketplace.api.utils.sql_util import fetch_page, parse_filters, encode_cursor, RANGE_OPERATORS
+from freelance_marketplace.db.sql.database import engine
+from test_filter_indexes import FILTER_MODULES
+
+# The profile each list endpoint renders its pages with
+PROFILES = {
+    "services": "service_card",
+    "requests": "request_card",
+    "milestones": "milestone_card",
+    "orders": "order_card",
+    "proposals": "proposal_card",
+    "reviews": "review_card",
+}
+VALUES = {int: "1", float: "1", datetime: "2026-01-01T00:00:00"}
+
+
+def get_pages() -> list:
+    """
+    (module, object, query_params) of the first page of every list endpoint, of the page after a cursor,
+    of each sort and of each filter.
+    """
+    pages = []
+    for module_name in FILTER_MODULES:
+        module = importlib.import_module(module_name)
+        object = next(iter(module.FILTER_COLUMNS)).class_
+        name = module_name.rsplit(".", 1)[-1]
+        pages.append((name, object, {}))
+        for column in module.SORT_COLUMNS:
+            pages.append((name, object, {"sort": f"-{column.key}"}))
+        for column, operators in module.FILTER_COLUMNS.items():
+            operator = "gte" if operators is RANGE_OPERATORS else "eq"
+            pages.append((name, object, {"filter": [f"{column.key}:{operator}:{VALUES[column.type.python_type]}"]}))
+    return pages
+
+
+def get_scans(plan: dict) -> list[dict]:
+    scans = [plan]
+    for child in plan.get("Plans", ()):
+        scans.extend(get_scans(child))
+    return scans
+
+
+@pytest.mark.parametrize("name, object, query_params", get_pages(), ids=lambda value: str(value) if isinstance(value, dict) else None)
+@pytest.mark.parametrize("page", ["first", "next"])
+def test_keyset_page_is_read_from_an_index(run, db, name, object, query_params, page):
+    module = importlib.import_module(next(module for module in FILTER_MODULES if module.endswith(name)))
+    query_params = parse_filters(query_params=query_params, filter_columns=module.FILTER_COLUMNS, sort_columns=module.SORT_COLUMNS)
+    query_params["deleted"] = False
+    if page == "next":
+        sort = [key for key, _ in query_params.get("sort") or ()] or ["creation_date"]
+        values = [VALUES[getattr(object, key).type.python_type] for key in sort]
+        query_params["cursor"] = encode_cursor(values=[*values, 1])
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    async def explain() -> list:
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            await fetch_page(object=object, query_params=query_params, db=db, profile=PROFILES.get(object.__tablename__))
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        (statement, parameters), = statements
+        await db.execute(text("SET LOCAL enable_seqscan = off"))
+        connection = await db.connection()
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        plan = result.scalar()
+        await db.rollback()
+        return get_scans((json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"])
+
+    scans = run(explain())
+    assert not [scan["Relation Name"] for scan in scans if scan["Node Type"] == "Seq Scan"], scans
+    # An equality filter is a condition of the index scan, not a filter of the rows read in sort order
+    indexes = {index.name for index in object.__table__.indexes}
+    conditions = " ".join(scan.get("Index Cond", "") for scan in scans if scan.get("Index Name") in indexes)
+    for key, operator, _ in query_params.get("filter") or ():
+        if operator == "eq":
+            assert f"{key} =" in conditions, scans
@@ -0,0 +1,129 @@
+import json
+from contextlib import contextmanager
+
+from sqlalchemy import event, select
+
+from freelance_marketplace.api.routes.milestones.milestonesLogic import MilestonesLogic
+from freelance_marketplace.api.routes.services.servicesLogic import ServicesLogic
+from freelance_marketplace.api.routes.users.users_logic import UsersLogic
+from freelance_marketplace.api.utils.loading_profiles import get_loading_options
+from freelance_marketplace.api.utils.sql_util import fetch_page
+from freelance_marketplace.db.sql.database import engine
+from freelance_marketplace.models.sql.request_model.UserRequest import UserRequest
+from freelance_marketplace.models.sql.sql_tables import User, Services, Milestones, Requests
+
+
+@contextmanager
+def count_statements():
+    """
+    Counts the statements sent to the database inside the block.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def create_services(db, count: int) -> list[Services]:
+    freelancers = [User(wallet_public_address=f"addr_freelancer_{index}") for index in range(count)]
+    db.add_all(freelancers)
+    await db.flush()
+    services = [
+        Services(
+            freelancer_id=freelancer.user_id,
+            sub_category_id=1 + index % 2,
+            title=f"Service {index}",
+            description="A service",
+            total_price=10,
+            tags=[]
+        )
+        for index, freelancer in enumerate(freelancers)
+    ]
+    db.add_all(services)
+    await db.commit()
+    return services
+
+
+def test_service_cards_load_in_one_statement_whatever_the_page_size(run, db):
+    async def load(limit: int) -> tuple[list, list]:
+        db.expunge_all()
+        with count_statements() as statements:
+            page = await fetch_page(object=Services, query_params={"limit": limit}, db=db, profile="service_card")
+            # Rendering the cards touches every embedded relationship
+            cards = [(service.freelancer.user_id, service.sub_category.sub_category_id, service.status) for service in page["items"]]
+        return cards, statements
+
+    async def scenario():
+        await create_services(db, 10)
+        one, one_statements = await load(limit=1)
+        ten, ten_statements = await load(limit=10)
+        assert len(one) == 1 and len(ten) == 10
+        assert len(one_statements) == len(ten_statements) == 1
+
+    run(scenario())
+
+
+def test_milestone_detail_loads_its_collections_with_one_statement_each(run, db):
+    async def scenario():
+        (service,) = await create_services(db, 1)
+        client = User(wallet_public_address="addr_client")
+        db.add(client)
+        await db.flush()
+        milestone = Milestones(client_id=client.user_id, freelancer_id=service.freelancer_id, milestone_text="Milestone", reward_amount=5)
+        milestone.services = [service]
+        milestone.requests = [
+            Requests(client_id=client.user_id, sub_category_id=1, title=f"Request {index}", description="A request", total_price=10, tags=[])
+            for index in range(3)
+        ]
+        db.add(milestone)
+        await db.commit()
+        db.expunge_all()
+
+        with count_statements() as statements:
+            result = await db.execute(
+                select(Milestones)
+                .where(Milestones.milestone_id == milestone.milestone_id)
+                .options(*get_loading_options("milestone_detail"))
+            )
+            loaded = result.scalars().one()
+            assert len(loaded.requests) == 3 and len(loaded.services) == 1
+            assert loaded.client.user_id == client.user_id and loaded.freelancer.user_id == service.freelancer_id
+        # The milestone with its status and users, then requests, services, orders and proposals
+        assert len(statements) == 5
+
+    run(scenario())
+
+
+def test_user_update_evicts_the_cached_cards_and_details_embedding_the_user(run, db, redis):
+    async def scenario():
+        (service,) = await create_services(db, 1)
+        client = User(wallet_public_address="addr_client")
+        db.add(client)
+        await db.flush()
+        milestone = Milestones(client_id=client.user_id, freelancer_id=service.freelancer_id, milestone_text="Milestone", reward_amount=5)
+        db.add(milestone)
+        await db.commit()
+        freelancer_id, milestone_id = service.freelancer_id, milestone.milestone_id
+
+        page = json.loads(await ServicesLogic.get_services(db=db, query_params={}))
+        assert page["items"][0]["freelancer"]["wallet_public_address"] == "addr_freelancer_0"
+        await MilestonesLogic.get(db=db, milestone_id=milestone_id)
+        # Served from the cache from now on
+        assert isinstance(await MilestonesLogic.get(db=db, milestone_id=milestone_id), dict)
+
+        await UsersLogic.update(db=db, user_id=freelancer_id, user=UserRequest(wallet_public_address="addr_renamed"))
+        await UsersLogic.update(db=db, user_id=client.user_id, user=UserRequest(wallet_public_address="addr_client_renamed"))
+        db.expunge_all()
+
+        page = json.loads(await ServicesLogic.get_services(db=db, query_params={}))
+        assert page["items"][0]["freelancer"]["wallet_public_address"] == "addr_renamed"
+        detail = await MilestonesLogic.get(db=db, milestone_id=milestone_id)
+        assert isinstance(detail, Milestones) and detail.client.wallet_public_address == "addr_client_renamed"
+
+    run(scenario())
@@ -0,0 +1,171 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from freelance_marketplace.api.services.redis import Redis
+from freelance_marketplace.db.sql.database import AsyncSessionLocal
+from freelance_marketplace.models.sql.sql_tables import Role
+
+
+def test_coalesced_load_survives_the_cancelled_request_that_started_it(run, database, redis):
+    release = asyncio.Event()
+    sessions = []
+
+    async def load_roles(session):
+        sessions.append(session)
+        await release.wait()
+        result = await session.execute(select(Role.role_name).order_by(Role.role_id))
+        return list(result.scalars())
+
+    async def scenario():
+        first_db, second_db = AsyncSessionLocal(), AsyncSessionLocal()
+        first = asyncio.ensure_future(Redis.get_or_load(loader=load_roles, db=first_db, match="roles:coalesced"))
+        await asyncio.sleep(0.05)
+        second = asyncio.ensure_future(Redis.get_or_load(loader=load_roles, db=second_db, match="roles:coalesced"))
+        await asyncio.sleep(0.05)
+
+        # The request that started the load goes away with its session
+        first.cancel()
+        await first_db.close()
+        release.set()
+
+        roles = await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await second_db.close()
+        return roles, (first_db, second_db)
+
+    roles, request_sessions = run(scenario())
+    assert roles and "User" in roles
+    # A single load, on a session of its own
+    assert len(sessions) == 1
+    assert sessions[0] not in request_sessions
+
+
+def test_replica_loads_are_not_cached_while_a_write_may_not_have_reached_them(run, database, redis, monkeypatch):
+    from freelance_marketplace.api.services import redis as redis_module
+    from freelance_marketplace.core.config import settings
+    from freelance_marketplace.db.sql.database import ReplicaSessionLocal
+
+    monkeypatch.setattr(settings.sql, "replica_connection_string", "postgresql+asyncpg://replica/marketplace")
+    monkeypatch.setattr(settings.sql, "read_your_writes_seconds", 1)
+    monkeypatch.setattr(redis_module, "get_session_factory", lambda db: ReplicaSessionLocal)
+    loads = []
+
+    def loader(value):
+        async def load(session):
+            loads.append(value)
+            return {"items": [value]}
+        return load
+
+    async def get(sub_category_id: int, value: str):
+        return await Redis.get_or_load(
+            loader=loader(value),
+            db=None,
+            prefix="services",
+            query_params={"sub_category_id": sub_category_id},
+            tags=lambda _: Redis.generate_tags(prefix="services", dimensions={"sub_category_id": sub_category_id})
+        )
+
+    async def scenario():
+        await Redis.invalidate_tags(prefix="services", dimensions={"sub_category_id": 3})
+
+        # Written dimension: the replica may still return the old rows, served but not cached
+        assert await get(3, "lagging") == {"items": ["lagging"]}
+        assert await get(3, "caught up") == {"items": ["caught up"]}
+        # Untouched dimension: cached as usual
+        assert await get(4, "other") == {"items": ["other"]}
+        assert await get(4, "reloaded") == {"items": ["other"]}
+
+        await asyncio.sleep(1.1)
+        assert await get(3, "after the window") == {"items": ["after the window"]}
+        assert await get(3, "reloaded") == {"items": ["after the window"]}
+
+    run(scenario())
+    assert loads == ["lagging", "caught up", "other", "after the window"]
+
+
+def test_load_running_across_an_eviction_of_its_tags_is_not_cached(run, database, redis):
+    release = asyncio.Event()
+    loads = []
+
+    def loader(value, wait=False):
+        async def load(session):
+            loads.append(value)
+            if wait:
+                await release.wait()
+            return {"items": [value]}
+        return load
+
+    async def get(value: str, wait: bool = False):
+        return await Redis.get_or_load(
+            loader=loader(value, wait),
+            db=AsyncSessionLocal(),
+            prefix="services",
+            query_params={"sub_category_id": 3},
+            tags=lambda _: Redis.generate_tags(prefix="services", dimensions={"sub_category_id": 3})
+        )
+
+    async def scenario():
+        # Read the rows before the write committed, returns after its invalidation
+        load = asyncio.ensure_future(get("before the write", wait=True))
+        await asyncio.sleep(0.05)
+        await Redis.invalidate_tags(prefix="services", dimensions={"sub_category_id": 3})
+        release.set()
+        assert await load == {"items": ["before the write"]}
+
+        assert await get("after the write") == {"items": ["after the write"]}
+        assert await get("reloaded") == {"items": ["after the write"]}
+
+        # Evicting other dimensions does not keep the entries of this one out of the cache
+        await Redis.invalidate_tags(prefix="services", dimensions={"sub_category_id": 4})
+        assert await get("reloaded") == {"items": ["after the write"]}
+
+    run(scenario())
+    assert loads == ["before the write", "after the write"]
+
+
+def test_set_redis_data_skips_data_read_before_an_eviction(run, redis):
+    async def scenario():
+        tags = Redis.generate_entity_tags(prefix="orders", ids=[1])
+        _, cache_key = await Redis.get_redis_data(match="orders:1")
+        since = await Redis.get_eviction_sequence()
+        await Redis.invalidate_tags(prefix="orders", ids=[1])
+        assert not await Redis.set_redis_data(cache_key, {"order_id": 1}, tags=tags, since=since)
+        assert (await Redis.get_redis_data(match="orders:1"))[0] is None
+
+        since = await Redis.get_eviction_sequence()
+        assert await Redis.set_redis_data(cache_key, {"order_id": 1}, tags=tags, since=since)
+        assert (await Redis.get_redis_data(match="orders:1"))[0] == {"order_id": 1}
+
+    run(scenario())
+
+
+def test_entry_encoded_with_a_library_missing_here_is_a_miss(run, database, redis, monkeypatch):
+    pytest.importorskip("zstandard")
+    from freelance_marketplace.api.utils import cache_codec
+    from freelance_marketplace.core.config import settings
+
+    monkeypatch.setattr(settings.redis, "cache_compression", "zstd")
+    monkeypatch.setattr(settings.redis, "cache_compression_threshold", 0)
+    loads = []
+
+    async def load(session):
+        loads.append(len(loads))
+        return {"items": [len(loads)]}
+
+    async def get():
+        return await Redis.get_or_load(loader=load, db=AsyncSessionLocal(), match="roles:mixed_hosts")
+
+    async def scenario():
+        # Written by a host with zstandard, read by one without
+        assert await get() == {"items": [1]}
+        monkeypatch.setattr(cache_codec, "zstandard", None)
+        assert (await Redis.get_redis_data(match="roles:mixed_hosts"))[0] is None
+        assert await get() == {"items": [2]}
+        # Rewritten uncompressed, readable by both
+        assert await get() == {"items": [2]}
+
+    run(scenario())
+    assert loads == [0, 1]
@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+
+import pytest
+from nacl.signing import VerifyKey
+from pycardano import PaymentSigningKey, PaymentVerificationKey, PaymentExtendedSigningKey
+from pycardano.crypto.bip32 import HDWallet
+
+from freelance_marketplace.api.services import signer as signer_module
+from freelance_marketplace.api.services.signer import Signer, RemoteSigner, start_server
+
+
+def message(index: int) -> bytes:
+    return hashlib.blake2b(str(index).encode(), digest_size=32).digest()
+
+
+class SlowSigner:
+    """
+    Takes `delay` seconds to answer the first request, signs by repeating the hash.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def sign(self, message: bytes) -> bytes:
+        delay, self.delay = self.delay, 0
+        await asyncio.sleep(delay)
+        return message * 2
+
+
+def test_cancelled_signature_does_not_answer_the_next_one(run, tmp_path):
+    async def scenario():
+        server = await start_server(SlowSigner(delay=0.2), str(tmp_path / "signer.sock"))
+        remote = RemoteSigner(str(tmp_path / "signer.sock"))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(remote.sign(message(1)), 0.05)
+        signature = await remote.sign(message(2))
+        remote.close()
+        # Lets the handlers (the first one still signing) see the disconnects before the server goes away
+        await asyncio.sleep(0.25)
+        server.close()
+        await server.wait_closed()
+        return signature
+
+    assert run(scenario()) == message(2) * 2
+
+
+def test_signer_signs_like_pycardano(run, monkeypatch):
+    signing_key = PaymentSigningKey.generate()
+
+    async def get_skey():
+        return signing_key
+
+    monkeypatch.setattr(signer_module, "get_skey", get_skey)
+    signer = Signer(ttl=0)
+    signature = run(signer.sign(message(1)))
+    signer.wipe()
+    assert signature == signing_key.sign(message(1))
+    VerifyKey(PaymentVerificationKey.from_signing_key(signing_key).payload).verify(message(1), signature)
+
+
+def test_signer_rejects_extended_keys(run, monkeypatch):
+    async def get_skey():
+        return PaymentExtendedSigningKey.from_hdwallet(HDWallet.from_seed("00" * 32))
+
+    monkeypatch.setattr(signer_module, "get_skey", get_skey)
+    with pytest.raises(ValueError):
+        run(Signer(ttl=0).sign(message(1)))
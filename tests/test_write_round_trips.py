@@ -0,0 +1,74 @@
+from test_loading_profiles import count_statements
+
+from freelance_marketplace.models.sql.sql_tables import User, Category, Services, Requests, Milestones, Review
+
+
+def is_returning(statement: str, verb: str) -> bool:
+    return statement.lstrip().upper().startswith(verb) and " RETURNING " in statement.upper()
+
+
+async def create_users(db, count: int) -> list[User]:
+    users = [User(wallet_public_address=f"addr_user_{index}") for index in range(count)]
+    db.add_all(users)
+    await db.flush()
+    return users
+
+
+def test_create_is_a_single_insert_returning_the_server_defaults(run, db):
+    async def scenario():
+        client, freelancer = await create_users(db, 2)
+        await db.commit()
+        creates = [
+            lambda: User.create(db=db, wallet_public_address="addr_created"),
+            lambda: Category.create(db=db, category_name="Created"),
+            lambda: Services.create(db=db, title="Service", description="A service", sub_category_id=1, total_price=10, tags=["python"], freelancer_id=freelancer.user_id),
+            lambda: Requests.create(db=db, title="Request", description="A request", sub_category_id=1, total_price=10, tags=["python"], client_id=client.user_id),
+            lambda: Review.create(db=db, reviewee_id=freelancer.user_id, reviewer_id=client.user_id, rating=4.0),
+        ]
+        for create in creates:
+            with count_statements() as statements:
+                created = await create()
+                await db.commit()
+            assert len(statements) == 1 and is_returning(statements[0], "INSERT"), statements
+            # Primary key and column defaults come back with the INSERT, no refresh
+            assert created.creation_date is not None
+
+    run(scenario())
+
+
+def test_milestone_create_adds_only_its_association_row(run, db):
+    async def scenario():
+        client, freelancer = await create_users(db, 2)
+        service = await Services.create(db=db, title="Service", description="A service", sub_category_id=1, total_price=10, tags=[], freelancer_id=freelancer.user_id)
+        await db.commit()
+        with count_statements() as statements:
+            milestone = await Milestones.create(db=db, milestone_tx_hash="", client_id=client.user_id, freelancer_id=freelancer.user_id, milestone_text="Milestone", reward_amount=5, service_id=service.service_id)
+            await db.commit()
+        assert len(statements) == 2
+        assert is_returning(statements[0], "INSERT")
+        assert statements[1].lstrip().upper().startswith("INSERT INTO SERVICE_MILESTONE")
+        assert milestone.milestone_id is not None
+
+    run(scenario())
+
+
+def test_edit_is_a_single_update_returning_the_row(run, db):
+    async def scenario():
+        client, freelancer = await create_users(db, 2)
+        category = await Category.create(db=db, category_name="Category")
+        service = await Services.create(db=db, title="Service", description="A service", sub_category_id=1, total_price=10, tags=[], freelancer_id=freelancer.user_id)
+        milestone = await Milestones.create(db=db, milestone_tx_hash="", client_id=client.user_id, freelancer_id=freelancer.user_id, milestone_text="Milestone", reward_amount=5)
+        await db.commit()
+        edits = [
+            (lambda: Category.edit(db=db, category_id=category.category_id, data={"category_description": "Edited"}), "category_description"),
+            (lambda: Services.edit(db=db, service_id=service.service_id, data={"title": "Edited", "description": None}), "title"),
+            (lambda: Milestones.edit(db=db, milestone_id=milestone.milestone_id, data={"milestone_text": "Edited"}), "milestone_text"),
+        ]
+        for edit, column in edits:
+            with count_statements() as statements:
+                edited = await edit()
+                await db.commit()
+            assert len(statements) == 1 and is_returning(statements[0], "UPDATE"), statements
+            assert getattr(edited, column) == "Edited"
+
+    run(scenario())